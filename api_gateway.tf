@@ -80,7 +80,7 @@ resource "aws_api_gateway_integration_response" "jobs_options_integration_respon
   status_code = aws_api_gateway_method_response.jobs_options_response.status_code
   
   response_parameters = {
-    "method.response.header.Access-Control-Allow-Headers" = "'Content-Type,X-Amz-Date,Authorization,X-Api-Key'"
+    "method.response.header.Access-Control-Allow-Headers" = "'Content-Type,X-Amz-Date,Authorization,X-Api-Key,If-None-Match'"
     "method.response.header.Access-Control-Allow-Methods" = "'GET,OPTIONS'"
     "method.response.header.Access-Control-Allow-Origin"  = "'*'"
   }
@@ -280,6 +280,174 @@ resource "aws_api_gateway_method_response" "post_application_response" {
   }
 }
 
+#------------------------------------------------------------
+# Resume Upload Resource
+#------------------------------------------------------------
+# Uploads Resource
+resource "aws_api_gateway_resource" "application_uploads_resource" {
+  rest_api_id = aws_api_gateway_rest_api.resume_screener_api.id
+  parent_id   = aws_api_gateway_resource.applications_resource.id
+  path_part   = "uploads"
+}
+
+# POST /applications/uploads Method
+resource "aws_api_gateway_method" "post_application_upload" {
+  rest_api_id   = aws_api_gateway_rest_api.resume_screener_api.id
+  resource_id   = aws_api_gateway_resource.application_uploads_resource.id
+  http_method   = "POST"
+  authorization = "NONE"
+}
+
+# CORS for /applications/uploads
+resource "aws_api_gateway_method" "application_uploads_options" {
+  rest_api_id   = aws_api_gateway_rest_api.resume_screener_api.id
+  resource_id   = aws_api_gateway_resource.application_uploads_resource.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_integration" "application_uploads_options_integration" {
+  rest_api_id = aws_api_gateway_rest_api.resume_screener_api.id
+  resource_id = aws_api_gateway_resource.application_uploads_resource.id
+  http_method = aws_api_gateway_method.application_uploads_options.http_method
+  type        = "MOCK"
+  request_templates = {
+    "application/json" = "{\"statusCode\": 200}"
+  }
+}
+
+resource "aws_api_gateway_method_response" "application_uploads_options_response" {
+  rest_api_id = aws_api_gateway_rest_api.resume_screener_api.id
+  resource_id = aws_api_gateway_resource.application_uploads_resource.id
+  http_method = aws_api_gateway_method.application_uploads_options.http_method
+  status_code = "200"
+  
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = true
+    "method.response.header.Access-Control-Allow-Methods" = true
+    "method.response.header.Access-Control-Allow-Origin"  = true
+  }
+}
+
+resource "aws_api_gateway_integration_response" "application_uploads_options_integration_response" {
+  rest_api_id = aws_api_gateway_rest_api.resume_screener_api.id
+  resource_id = aws_api_gateway_resource.application_uploads_resource.id
+  http_method = aws_api_gateway_method.application_uploads_options.http_method
+  status_code = aws_api_gateway_method_response.application_uploads_options_response.status_code
+  
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = "'Content-Type,X-Amz-Date,Authorization,X-Api-Key'"
+    "method.response.header.Access-Control-Allow-Methods" = "'POST,OPTIONS'"
+    "method.response.header.Access-Control-Allow-Origin"  = "'*'"
+  }
+}
+
+# Integration for POST /applications/uploads
+resource "aws_api_gateway_integration" "post_application_upload_integration" {
+  rest_api_id             = aws_api_gateway_rest_api.resume_screener_api.id
+  resource_id             = aws_api_gateway_resource.application_uploads_resource.id
+  http_method             = aws_api_gateway_method.post_application_upload.http_method
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.applications_api_lambda.invoke_arn
+}
+
+# Response for POST /applications/uploads
+resource "aws_api_gateway_method_response" "post_application_upload_response" {
+  rest_api_id = aws_api_gateway_rest_api.resume_screener_api.id
+  resource_id = aws_api_gateway_resource.application_uploads_resource.id
+  http_method = aws_api_gateway_method.post_application_upload.http_method
+  status_code = "201"
+  
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Origin" = true
+  }
+}
+
+#------------------------------------------------------------
+# Batch Application Status Resource
+#------------------------------------------------------------
+# Statuses Resource
+resource "aws_api_gateway_resource" "application_statuses_resource" {
+  rest_api_id = aws_api_gateway_rest_api.resume_screener_api.id
+  parent_id   = aws_api_gateway_resource.applications_resource.id
+  path_part   = "statuses"
+}
+
+# POST /applications/statuses Method
+resource "aws_api_gateway_method" "post_application_statuses" {
+  rest_api_id   = aws_api_gateway_rest_api.resume_screener_api.id
+  resource_id   = aws_api_gateway_resource.application_statuses_resource.id
+  http_method   = "POST"
+  authorization = "NONE"
+}
+
+# CORS for /applications/statuses
+resource "aws_api_gateway_method" "application_statuses_options" {
+  rest_api_id   = aws_api_gateway_rest_api.resume_screener_api.id
+  resource_id   = aws_api_gateway_resource.application_statuses_resource.id
+  http_method   = "OPTIONS"
+  authorization = "NONE"
+}
+
+resource "aws_api_gateway_integration" "application_statuses_options_integration" {
+  rest_api_id = aws_api_gateway_rest_api.resume_screener_api.id
+  resource_id = aws_api_gateway_resource.application_statuses_resource.id
+  http_method = aws_api_gateway_method.application_statuses_options.http_method
+  type        = "MOCK"
+  request_templates = {
+    "application/json" = "{\"statusCode\": 200}"
+  }
+}
+
+resource "aws_api_gateway_method_response" "application_statuses_options_response" {
+  rest_api_id = aws_api_gateway_rest_api.resume_screener_api.id
+  resource_id = aws_api_gateway_resource.application_statuses_resource.id
+  http_method = aws_api_gateway_method.application_statuses_options.http_method
+  status_code = "200"
+  
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = true
+    "method.response.header.Access-Control-Allow-Methods" = true
+    "method.response.header.Access-Control-Allow-Origin"  = true
+  }
+}
+
+resource "aws_api_gateway_integration_response" "application_statuses_options_integration_response" {
+  rest_api_id = aws_api_gateway_rest_api.resume_screener_api.id
+  resource_id = aws_api_gateway_resource.application_statuses_resource.id
+  http_method = aws_api_gateway_method.application_statuses_options.http_method
+  status_code = aws_api_gateway_method_response.application_statuses_options_response.status_code
+  
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Headers" = "'Content-Type,X-Amz-Date,Authorization,X-Api-Key'"
+    "method.response.header.Access-Control-Allow-Methods" = "'POST,OPTIONS'"
+    "method.response.header.Access-Control-Allow-Origin"  = "'*'"
+  }
+}
+
+# Integration for POST /applications/statuses
+resource "aws_api_gateway_integration" "post_application_statuses_integration" {
+  rest_api_id             = aws_api_gateway_rest_api.resume_screener_api.id
+  resource_id             = aws_api_gateway_resource.application_statuses_resource.id
+  http_method             = aws_api_gateway_method.post_application_statuses.http_method
+  integration_http_method = "POST"
+  type                    = "AWS_PROXY"
+  uri                     = aws_lambda_function.applications_api_lambda.invoke_arn
+}
+
+# Response for POST /applications/statuses
+resource "aws_api_gateway_method_response" "post_application_statuses_response" {
+  rest_api_id = aws_api_gateway_rest_api.resume_screener_api.id
+  resource_id = aws_api_gateway_resource.application_statuses_resource.id
+  http_method = aws_api_gateway_method.post_application_statuses.http_method
+  status_code = "200"
+  
+  response_parameters = {
+    "method.response.header.Access-Control-Allow-Origin" = true
+  }
+}
+
 #------------------------------------------------------------
 # Application Status Resource
 #------------------------------------------------------------
@@ -379,10 +547,14 @@ resource "aws_api_gateway_deployment" "resume_screener_deployment" {
     aws_api_gateway_integration.get_jobs_integration,
     aws_api_gateway_integration.get_job_integration,
     aws_api_gateway_integration.post_application_integration,
+    aws_api_gateway_integration.post_application_upload_integration,
+    aws_api_gateway_integration.post_application_statuses_integration,
     aws_api_gateway_integration.get_application_integration,
     aws_api_gateway_integration.jobs_options_integration,
     aws_api_gateway_integration.job_options_integration,
     aws_api_gateway_integration.applications_options_integration,
+    aws_api_gateway_integration.application_uploads_options_integration,
+    aws_api_gateway_integration.application_statuses_options_integration,
     aws_api_gateway_integration.application_options_integration
   ]
 }
@@ -403,7 +575,9 @@ resource "aws_lambda_function" "jobs_api_lambda" {
 
   environment {
     variables = {
-      JOB_TABLE_NAME = aws_dynamodb_table.job_table.name
+      JOB_TABLE_NAME = aws_dynamodb_table.job_table.name,
+      JOB_PAGE_SIZE = "20",
+      JOB_LIST_CACHE_TTL_SECONDS = "30"
     }
   }
 
@@ -422,12 +596,14 @@ resource "aws_lambda_function" "applications_api_lambda" {
   runtime       = "python3.9"
   timeout       = 30
   memory_size   = 256
+  layers        = [aws_lambda_layer_version.common_layer.arn]
 
   environment {
     variables = {
-      APPLICATION_TABLE_NAME = aws_dynamodb_table.application_table.name,
+      DYNAMODB_TABLE = aws_dynamodb_table.candidate_table.name,
       RESUME_BUCKET_NAME = aws_s3_bucket.resume_bucket.bucket,
-      STEP_FUNCTION_ARN = aws_sfn_state_machine.resume_screening_workflow.arn
+      STEP_FUNCTION_ARN = aws_sfn_state_machine.resume_screening_workflow.arn,
+      UPLOAD_URL_EXPIRY_SECONDS = "300"
     }
   }
 
@@ -437,6 +613,138 @@ resource "aws_lambda_function" "applications_api_lambda" {
   ]
 }
 
+#------------------------------------------------------------
+# WebSocket API for Application Status Updates
+#------------------------------------------------------------
+
+# Status pages subscribe to one application and receive its status transitions
+resource "aws_apigatewayv2_api" "status_socket_api" {
+  name                       = "ApplicationStatusSocket"
+  protocol_type              = "WEBSOCKET"
+  route_selection_expression = "$request.body.action"
+}
+
+resource "aws_apigatewayv2_stage" "status_socket_stage" {
+  api_id      = aws_apigatewayv2_api.status_socket_api.id
+  name        = "prod"
+  auto_deploy = true
+}
+
+resource "aws_apigatewayv2_integration" "status_socket_integration" {
+  api_id           = aws_apigatewayv2_api.status_socket_api.id
+  integration_type = "AWS_PROXY"
+  integration_uri  = aws_lambda_function.status_socket_lambda.invoke_arn
+}
+
+resource "aws_apigatewayv2_route" "status_socket_connect" {
+  api_id    = aws_apigatewayv2_api.status_socket_api.id
+  route_key = "$connect"
+  target    = "integrations/${aws_apigatewayv2_integration.status_socket_integration.id}"
+}
+
+resource "aws_apigatewayv2_route" "status_socket_disconnect" {
+  api_id    = aws_apigatewayv2_api.status_socket_api.id
+  route_key = "$disconnect"
+  target    = "integrations/${aws_apigatewayv2_integration.status_socket_integration.id}"
+}
+
+# Lambda function handling socket connections and pushing status transitions
+resource "aws_lambda_function" "status_socket_lambda" {
+  filename      = data.archive_file.status_socket_lambda_package.output_path
+  function_name = "ApplicationStatusSocket"
+  role          = aws_iam_role.lambda_execution_role.arn
+  handler       = "status_socket.lambda_handler"
+  runtime       = "python3.9"
+  timeout       = 30
+  memory_size   = 128
+
+  environment {
+    variables = {
+      DYNAMODB_TABLE = aws_dynamodb_table.candidate_table.name,
+      SUBSCRIPTION_TABLE_NAME = aws_dynamodb_table.status_subscription_table.name,
+      STATUS_SOCKET_ENDPOINT = replace(aws_apigatewayv2_stage.status_socket_stage.invoke_url, "wss://", "https://")
+    }
+  }
+
+  depends_on = [
+    aws_iam_role_policy_attachment.lambda_basic_execution,
+    aws_iam_role_policy_attachment.lambda_custom_policy_attachment
+  ]
+}
+
+# No batching window, so subscribers see transitions within about a second
+resource "aws_lambda_event_source_mapping" "candidate_table_status_socket" {
+  event_source_arn       = aws_dynamodb_table.candidate_table.stream_arn
+  function_name          = aws_lambda_function.status_socket_lambda.arn
+  starting_position      = "LATEST"
+  batch_size             = 100
+  maximum_retry_attempts = 3
+
+  filter_criteria {
+    filter {
+      pattern = jsonencode({
+        eventName = ["INSERT", "MODIFY"]
+      })
+    }
+  }
+}
+
+resource "aws_lambda_permission" "status_socket_lambda" {
+  statement_id  = "AllowExecutionFromStatusSocket"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.status_socket_lambda.function_name
+  principal     = "apigateway.amazonaws.com"
+
+  source_arn = "${aws_apigatewayv2_api.status_socket_api.execution_arn}/*/*"
+}
+
+resource "aws_iam_role_policy" "status_socket_policy" {
+  name = "ApplicationStatusSocketPolicy"
+  role = aws_iam_role.lambda_execution_role.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Action = [
+          "dynamodb:DescribeStream",
+          "dynamodb:GetRecords",
+          "dynamodb:GetShardIterator",
+          "dynamodb:ListStreams"
+        ]
+        Resource = aws_dynamodb_table.candidate_table.stream_arn
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "dynamodb:PutItem",
+          "dynamodb:DeleteItem",
+          "dynamodb:Query"
+        ]
+        Resource = [
+          aws_dynamodb_table.status_subscription_table.arn,
+          "${aws_dynamodb_table.status_subscription_table.arn}/index/*"
+        ]
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "execute-api:ManageConnections"
+        ]
+        Resource = "${aws_apigatewayv2_api.status_socket_api.execution_arn}/*"
+      }
+    ]
+  })
+}
+
+# Lambda package for the status socket
+data "archive_file" "status_socket_lambda_package" {
+  type        = "zip"
+  source_file = "${path.module}/backend/lambda/status_socket/status_socket.py"
+  output_path = "${path.module}/backend/lambda/status_socket/status_socket.zip"
+}
+
 # Lambda package for Jobs API
 data "archive_file" "jobs_api_lambda_package" {
   type        = "zip"
@@ -485,6 +793,10 @@ resource "aws_dynamodb_table" "job_table" {
   billing_mode   = "PAY_PER_REQUEST"
   hash_key       = "id"
   
+  # Changes trigger a republish of the job catalog snapshots
+  stream_enabled   = true
+  stream_view_type = "KEYS_ONLY"
+  
   attribute {
     name = "id"
     type = "S"
@@ -495,9 +807,28 @@ resource "aws_dynamodb_table" "job_table" {
     type = "S"
   }
   
+  attribute {
+    name = "status"
+    type = "S"
+  }
+  
+  attribute {
+    name = "posted_date"
+    type = "S"
+  }
+  
+  # Job listings are read newest first from these indexes instead of scanning
   global_secondary_index {
     name               = "CategoryIndex"
     hash_key           = "category"
+    range_key          = "posted_date"
+    projection_type    = "ALL"
+  }
+  
+  global_secondary_index {
+    name               = "StatusPostedDateIndex"
+    hash_key           = "status"
+    range_key          = "posted_date"
     projection_type    = "ALL"
   }
   
@@ -506,7 +837,42 @@ resource "aws_dynamodb_table" "job_table" {
   }
 }
 
-# DynamoDB Table for Applications
+# DynamoDB Table for status socket subscriptions, one item per open connection
+resource "aws_dynamodb_table" "status_subscription_table" {
+  name           = "ApplicationStatusSubscriptions"
+  billing_mode   = "PAY_PER_REQUEST"
+  hash_key       = "connectionId"
+  
+  attribute {
+    name = "connectionId"
+    type = "S"
+  }
+  
+  attribute {
+    name = "applicationId"
+    type = "S"
+  }
+  
+  global_secondary_index {
+    name               = "ApplicationIndex"
+    hash_key           = "applicationId"
+    projection_type    = "KEYS_ONLY"
+  }
+  
+  # Connections that closed without a $disconnect expire on their own
+  ttl {
+    attribute_name = "expiresAt"
+    enabled        = true
+  }
+  
+  tags = {
+    Name = "ApplicationStatusSubscriptionsTable"
+  }
+}
+
+# Retired DynamoDB Table for Applications; applications now live on the
+# candidate record. Kept until migrate_applications.py has copied its items
+# into the candidate table, then removed in a follow-up apply.
 resource "aws_dynamodb_table" "application_table" {
   name           = "Applications"
   billing_mode   = "PAY_PER_REQUEST"
@@ -528,6 +894,10 @@ resource "aws_dynamodb_table" "application_table" {
     projection_type    = "ALL"
   }
   
+  lifecycle {
+    prevent_destroy = true
+  }
+  
   tags = {
     Name = "ApplicationsTable"
   }
@@ -550,4 +920,9 @@ output "jobs_api_url" {
 output "applications_api_url" {
   description = "URL of the Applications API"
   value       = "${aws_api_gateway_deployment.resume_screener_deployment.invoke_url}/applications"
-}
\ No newline at end of file
+}
+
+output "status_socket_url" {
+  description = "WebSocket URL for application status updates"
+  value       = aws_apigatewayv2_stage.status_socket_stage.invoke_url
+}
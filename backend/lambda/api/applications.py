@@ -1,10 +1,11 @@
 import json
+import time
 import boto3
 import os
 import uuid
-import base64
 import logging
-from datetime import datetime
+from botocore.exceptions import ClientError
+from candidate_records import DYNAMODB_TABLE, STATUS_ATTRIBUTES, create_application, get_record, get_status
 
 # Configure logging
 logger = logging.getLogger()
@@ -16,15 +17,132 @@ dynamodb = boto3.resource('dynamodb')
 sfn_client = boto3.client('stepfunctions')
 
 # Get environment variables
-APPLICATION_TABLE_NAME = os.environ['APPLICATION_TABLE_NAME']
 RESUME_BUCKET_NAME = os.environ['RESUME_BUCKET_NAME']
 STEP_FUNCTION_ARN = os.environ['STEP_FUNCTION_ARN']
+UPLOAD_URL_EXPIRY_SECONDS = int(os.environ.get('UPLOAD_URL_EXPIRY_SECONDS', '300'))
+MAX_RESUME_BYTES = int(os.environ.get('MAX_RESUME_BYTES', str(5 * 1024 * 1024)))
 
-application_table = dynamodb.Table(APPLICATION_TABLE_NAME)
+# Long-polling status requests wait for the status version to change. They are
+# the fallback for clients without the status socket, so they re-read every second
+MAX_STATUS_WAIT_SECONDS = int(os.environ.get('MAX_STATUS_WAIT_SECONDS', '20'))
+STATUS_POLL_INTERVAL_SECONDS = float(os.environ.get('STATUS_POLL_INTERVAL_SECONDS', '1'))
+
+# Batch status lookups
+MAX_STATUS_BATCH_IDS = int(os.environ.get('MAX_STATUS_BATCH_IDS', '500'))
+BATCH_GET_CHUNK_SIZE = 100
+BATCH_GET_MAX_RETRIES = 5
+
+# Resume content types accepted for upload and the object key extension used for each;
+# legacy .doc is rejected because neither Textract nor the local parsers read it
+RESUME_CONTENT_TYPES = {
+    'application/pdf': 'pdf',
+    'application/vnd.openxmlformats-officedocument.wordprocessingml.document': 'docx'
+}
+
+def create_resume_upload(event, context):
+    """
+    Issue a short-lived presigned POST target so the client uploads the resume directly to S3
+    """
+    try:
+        # Parse request body
+        if 'body' not in event or not event['body']:
+            return {
+                'statusCode': 400,
+                'headers': {
+                    'Content-Type': 'application/json',
+                    'Access-Control-Allow-Origin': '*'
+                },
+                'body': json.dumps({'error': 'Missing request body'})
+            }
+        
+        body = json.loads(event['body'])
+        
+        if 'jobId' not in body:
+            return {
+                'statusCode': 400,
+                'headers': {
+                    'Content-Type': 'application/json',
+                    'Access-Control-Allow-Origin': '*'
+                },
+                'body': json.dumps({'error': 'Missing required field: jobId'})
+            }
+        
+        content_type = body.get('contentType', 'application/pdf')
+        if content_type not in RESUME_CONTENT_TYPES:
+            return {
+                'statusCode': 400,
+                'headers': {
+                    'Content-Type': 'application/json',
+                    'Access-Control-Allow-Origin': '*'
+                },
+                'body': json.dumps({'error': f'Unsupported resume type: {content_type}'})
+            }
+        
+        content_length = body.get('contentLength')
+        if content_length is not None and int(content_length) > MAX_RESUME_BYTES:
+            return {
+                'statusCode': 400,
+                'headers': {
+                    'Content-Type': 'application/json',
+                    'Access-Control-Allow-Origin': '*'
+                },
+                'body': json.dumps({'error': f'Resume exceeds the maximum size of {MAX_RESUME_BYTES} bytes'})
+            }
+        
+        # The application ID is reserved now and registered by the finalize call
+        application_id = str(uuid.uuid4())
+        resume_key = f"resumes/{body['jobId']}/{application_id}.{RESUME_CONTENT_TYPES[content_type]}"
+        
+        # S3 enforces the content type and size limit on the upload itself
+        upload = s3_client.generate_presigned_post(
+            Bucket=RESUME_BUCKET_NAME,
+            Key=resume_key,
+            Fields={'Content-Type': content_type},
+            Conditions=[
+                {'Content-Type': content_type},
+                ['content-length-range', 1, MAX_RESUME_BYTES]
+            ],
+            ExpiresIn=UPLOAD_URL_EXPIRY_SECONDS
+        )
+        
+        return {
+            'statusCode': 201,
+            'headers': {
+                'Content-Type': 'application/json',
+                'Access-Control-Allow-Origin': '*',
+                'Access-Control-Allow-Methods': 'POST',
+                'Access-Control-Allow-Headers': 'Content-Type'
+            },
+            'body': json.dumps({
+                'applicationId': application_id,
+                'resumeKey': resume_key,
+                'uploadUrl': upload['url'],
+                'uploadFields': upload['fields'],
+                'expiresIn': UPLOAD_URL_EXPIRY_SECONDS
+            })
+        }
+    
+    except Exception as e:
+        logger.error(f"Error creating resume upload: {str(e)}")
+        return {
+            'statusCode': 500,
+            'headers': {
+                'Content-Type': 'application/json',
+                'Access-Control-Allow-Origin': '*'
+            },
+            'body': json.dumps({'error': str(e)})
+        }
+
+def is_valid_resume_key(resume_key, job_id, application_id):
+    """
+    Check that a resume key is the one issued for this job and application
+    """
+    prefix = f"resumes/{job_id}/{application_id}."
+    return resume_key.startswith(prefix) and resume_key[len(prefix):] in RESUME_CONTENT_TYPES.values()
 
 def submit_application(event, context):
     """
-    Handle job application submission with resume upload
+    Register a job application whose resume was already uploaded through a presigned upload
     """
     try:
         # Parse request body
@@ -42,7 +160,7 @@ def submit_application(event, context):
         body = json.loads(event['body'])
         
         # Validate required fields
-        required_fields = ['jobId', 'fullName', 'email', 'phone', 'resume']
+        required_fields = ['applicationId', 'jobId', 'fullName', 'email', 'phone', 'resumeKey']
         for field in required_fields:
             if field not in body:
                 return {
@@ -54,69 +172,68 @@ def submit_application(event, context):
                     'body': json.dumps({'error': f'Missing required field: {field}'})
                 }
         
-        # Generate a unique ID for the application
-        application_id = str(uuid.uuid4())
+        application_id = body['applicationId']
         job_id = body['jobId']
+        resume_key = body['resumeKey']
         
-        # Extract resume data - we expect base64 encoded file
-        resume_data = body['resume']
-        if ';base64,' in resume_data:
-            # Extract the actual base64 content after the data URI scheme
-            _, resume_base64 = resume_data.split(';base64,')
-        else:
-            resume_base64 = resume_data
-            
-        try:
-            resume_binary = base64.b64decode(resume_base64)
-        except Exception as e:
-            logger.error(f"Error decoding resume: {str(e)}")
+        if not is_valid_resume_key(resume_key, job_id, application_id):
             return {
                 'statusCode': 400,
                 'headers': {
                     'Content-Type': 'application/json',
                     'Access-Control-Allow-Origin': '*'
                 },
-                'body': json.dumps({'error': 'Invalid resume data format'})
+                'body': json.dumps({'error': 'Invalid resume key'})
             }
         
-        # Upload the resume to S3
-        resume_key = f"resumes/{job_id}/{application_id}.pdf"
-        s3_client.put_object(
-            Bucket=RESUME_BUCKET_NAME,
-            Key=resume_key,
-            Body=resume_binary,
-            ContentType='application/pdf'
-        )
+        # Confirm the upload completed without reading the file
+        try:
+            s3_client.head_object(Bucket=RESUME_BUCKET_NAME, Key=resume_key)
+        except ClientError as e:
+            logger.error(f"Resume {resume_key} not found: {str(e)}")
+            return {
+                'statusCode': 400,
+                'headers': {
+                    'Content-Type': 'application/json',
+                    'Access-Control-Allow-Origin': '*'
+                },
+                'body': json.dumps({'error': 'Resume has not been uploaded'})
+            }
         
-        # Save application details to DynamoDB
-        timestamp = datetime.now().isoformat()
+        # Save application details to the candidate record the pipeline continues
         application_item = {
             'id': application_id,
             'jobId': job_id,
             'fullName': body['fullName'],
             'email': body['email'],
             'phone': body['phone'],
-            'resumeKey': resume_key,
-            'status': 'SUBMITTED',
-            'submissionDate': timestamp,
-            'updatedDate': timestamp
+            'resumeKey': resume_key
         }
         
         # Add optional fields if present
-        optional_fields = ['coverLetter', 'linkedIn', 'portfolio', 'additionalInfo']
+        optional_fields = ['coverLetter', 'linkedIn', 'portfolio', 'additionalInfo', 'timeZone']
         for field in optional_fields:
             if field in body and body[field]:
                 application_item[field] = body[field]
         
-        # Save to DynamoDB
-        application_table.put_item(Item=application_item)
+        # Save to DynamoDB; a repeated finalize call must not start a second workflow
+        if not create_application(application_item):
+            return {
+                'statusCode': 409,
+                'headers': {
+                    'Content-Type': 'application/json',
+                    'Access-Control-Allow-Origin': '*'
+                },
+                'body': json.dumps({'error': 'Application already submitted'})
+            }
         
         # Start the Step Function workflow for resume screening
         sfn_client.start_execution(
             stateMachineArn=STEP_FUNCTION_ARN,
             input=json.dumps({
                 'candidateId': application_id,
-                'jobId': job_id
+                'jobId': job_id,
+                'resumePath': resume_key
             })
         )
         
@@ -147,23 +264,59 @@ def submit_application(event, context):
             'body': json.dumps({'error': str(e)})
         }
 
+def wait_for_status_change(application_id, since_version, wait_seconds):
+    """
+    Wait until the application's status version moves past since_version or the wait expires
+    
+    Only the version is read while waiting. Returns the latest version seen,
+    or None if the application does not exist.
+    """
+    deadline = time.monotonic() + wait_seconds
+    
+    while True:
+        record = get_record(application_id, ['statusVersion'], consistent=True)
+        if record is None:
+            return None
+        
+        version = int(record.get('statusVersion', 0))
+        if version > since_version or time.monotonic() + STATUS_POLL_INTERVAL_SECONDS > deadline:
+            return version
+        
+        time.sleep(STATUS_POLL_INTERVAL_SECONDS)
+
 def get_application_status(event, context):
     """
     Check the status of a job application
+    
+    With sinceVersion the request long-polls: it returns as soon as the status
+    version is newer than sinceVersion, or with the unchanged status once
+    waitSeconds (at most MAX_STATUS_WAIT_SECONDS) have passed.
     """
     try:
         # Extract application ID from path parameters
         application_id = event['pathParameters']['applicationId']
+        query_params = event.get('queryStringParameters') or {}
         
-        # Get the application from DynamoDB
-        response = application_table.get_item(
-            Key={
-                'id': application_id
-            }
-        )
+        if 'sinceVersion' in query_params:
+            try:
+                since_version = int(query_params['sinceVersion'])
+                wait_seconds = max(0, min(MAX_STATUS_WAIT_SECONDS, int(query_params.get('waitSeconds', MAX_STATUS_WAIT_SECONDS))))
+            except ValueError:
+                return {
+                    'statusCode': 400,
+                    'headers': {
+                        'Content-Type': 'application/json',
+                        'Access-Control-Allow-Origin': '*'
+                    },
+                    'body': json.dumps({'error': 'Invalid sinceVersion or waitSeconds'})
+                }
+            wait_for_status_change(application_id, since_version, wait_seconds)
+        
+        # Get the application's status attributes from its candidate record
+        application = get_status(application_id)
         
         # Check if the application exists
-        if 'Item' not in response:
+        if application is None:
             return {
                 'statusCode': 404,
                 'headers': {
@@ -174,7 +327,6 @@ def get_application_status(event, context):
             }
         
         # Return the application status
-        application = response['Item']
         return {
             'statusCode': 200,
             'headers': {
@@ -187,8 +339,9 @@ def get_application_status(event, context):
                 'applicationId': application['id'],
                 'jobId': application['jobId'],
                 'status': application['status'],
-                'submissionDate': application['submissionDate'],
-                'updatedDate': application['updatedDate']
+                'statusVersion': int(application.get('statusVersion', 0)),
+                'submissionDate': application.get('submissionDate'),
+                'updatedDate': application.get('updatedDate')
             })
         }
     except Exception as e:
@@ -202,6 +355,105 @@ def get_application_status(event, context):
             'body': json.dumps({'error': str(e)})
         }
 
+def batch_get_application_statuses(application_ids):
+    """
+    Read the status fields of many applications with chunked BatchGetItem calls,
+    retrying unprocessed keys with exponential backoff
+    """
+    items = []
+    for start in range(0, len(application_ids), BATCH_GET_CHUNK_SIZE):
+        request = {
+            DYNAMODB_TABLE: {
+                'Keys': [{'id': application_id} for application_id in application_ids[start:start + BATCH_GET_CHUNK_SIZE]],
+                'ProjectionExpression': ', '.join('#status' if attribute == 'status' else attribute for attribute in STATUS_ATTRIBUTES),
+                'ExpressionAttributeNames': {'#status': 'status'}
+            }
+        }
+        
+        for attempt in range(BATCH_GET_MAX_RETRIES + 1):
+            response = dynamodb.batch_get_item(RequestItems=request)
+            items.extend(response.get('Responses', {}).get(DYNAMODB_TABLE, []))
+            request = response.get('UnprocessedKeys') or {}
+            if not request:
+                break
+            time.sleep(min(2, 0.05 * (2 ** attempt)))
+        
+        if request:
+            raise RuntimeError(f"Unprocessed keys remained after {BATCH_GET_MAX_RETRIES} retries")
+    
+    return items
+
+def get_application_statuses(event, context):
+    """
+    Check the status of many job applications in one request
+    """
+    try:
+        # Parse request body
+        body = json.loads(event['body']) if event.get('body') else {}
+        application_ids = body.get('applicationIds')
+        
+        if not isinstance(application_ids, list) or not application_ids:
+            return {
+                'statusCode': 400,
+                'headers': {
+                    'Content-Type': 'application/json',
+                    'Access-Control-Allow-Origin': '*'
+                },
+                'body': json.dumps({'error': 'applicationIds must be a non-empty list'})
+            }
+        
+        # Duplicate keys are rejected by BatchGetItem
+        application_ids = list(dict.fromkeys(str(application_id) for application_id in application_ids))
+        if len(application_ids) > MAX_STATUS_BATCH_IDS:
+            return {
+                'statusCode': 400,
+                'headers': {
+                    'Content-Type': 'application/json',
+                    'Access-Control-Allow-Origin': '*'
+                },
+                'body': json.dumps({'error': f'At most {MAX_STATUS_BATCH_IDS} applicationIds per request'})
+            }
+        
+        items = {item['id']: item for item in batch_get_application_statuses(application_ids)}
+        
+        # Return statuses in request order
+        applications = [
+            {
+                'applicationId': application_id,
+                'jobId': items[application_id].get('jobId'),
+                'status': items[application_id].get('status'),
+                'statusVersion': int(items[application_id].get('statusVersion', 0)),
+                'submissionDate': items[application_id].get('submissionDate'),
+                'updatedDate': items[application_id].get('updatedDate')
+            }
+            for application_id in application_ids
+            if application_id in items
+        ]
+        
+        return {
+            'statusCode': 200,
+            'headers': {
+                'Content-Type': 'application/json',
+                'Access-Control-Allow-Origin': '*',
+                'Access-Control-Allow-Methods': 'POST',
+                'Access-Control-Allow-Headers': 'Content-Type'
+            },
+            'body': json.dumps({
+                'applications': applications,
+                'notFound': [application_id for application_id in application_ids if application_id not in items]
+            })
+        }
+    except Exception as e:
+        logger.error(f"Error getting application statuses: {str(e)}")
+        return {
+            'statusCode': 500,
+            'headers': {
+                'Content-Type': 'application/json',
+                'Access-Control-Allow-Origin': '*'
+            },
+            'body': json.dumps({'error': str(e)})
+        }
+
 def lambda_handler(event, context):
     """
     Route the request to the appropriate handler based on HTTP method and path
@@ -227,8 +479,12 @@ def lambda_handler(event, context):
         }
     
     # Route to the appropriate handler
-    if http_method == 'POST' and path == '/applications':
+    if http_method == 'POST' and path == '/applications/uploads':
+        return create_resume_upload(event, context)
+    elif http_method == 'POST' and path == '/applications':
         return submit_application(event, context)
+    elif http_method == 'POST' and path == '/applications/statuses':
+        return get_application_statuses(event, context)
     elif http_method == 'GET' and path.startswith('/applications/') and 'applicationId' in event.get('pathParameters', {}):
         return get_application_status(event, context)
     
@@ -1,9 +1,16 @@
 import json
 import boto3
 import os
+import time
+import base64
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
 from decimal import Decimal
-from boto3.dynamodb.conditions import Key
+from email.utils import format_datetime
+from boto3.dynamodb.conditions import Attr, Key
 
 # Configure logging
 logger = logging.getLogger()
@@ -13,6 +20,17 @@ logger.setLevel(logging.INFO)
 dynamodb = boto3.resource('dynamodb')
 job_table = dynamodb.Table(os.environ['JOB_TABLE_NAME'])
 
+# Listing configuration
+DEFAULT_PAGE_SIZE = int(os.environ.get('JOB_PAGE_SIZE', '20'))
+MAX_PAGE_SIZE = 100
+DEFAULT_LISTING_STATUS = 'OPEN'
+JOB_LIST_CACHE_TTL_SECONDS = int(os.environ.get('JOB_LIST_CACHE_TTL_SECONDS', '30'))
+JOB_LIST_CACHE_MAX_ENTRIES = int(os.environ.get('JOB_LIST_CACHE_MAX_ENTRIES', '128'))
+
+# Serialized listing pages kept for the lifetime of the container
+_listing_cache = OrderedDict()
+_listing_cache_lock = threading.Lock()
+
 # Helper class for DynamoDB Decimal serialization
 class DecimalEncoder(json.JSONEncoder):
     def default(self, obj):
@@ -20,40 +38,188 @@ class DecimalEncoder(json.JSONEncoder):
             return float(obj)
         return super(DecimalEncoder, self).default(obj)
 
+def encode_cursor(last_evaluated_key):
+    """
+    Encode a DynamoDB LastEvaluatedKey as an opaque URL-safe cursor
+    """
+    if not last_evaluated_key:
+        return None
+    raw = json.dumps(last_evaluated_key, cls=DecimalEncoder, sort_keys=True).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor produced by encode_cursor back into an ExclusiveStartKey
+    """
+    padded = cursor + '=' * (-len(cursor) % 4)
+    key = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    if not isinstance(key, dict) or 'id' not in key:
+        raise ValueError("Invalid cursor")
+    return key
+
+def page_last_modified(jobs):
+    """
+    Most recent update or posting time of the jobs on a page as an HTTP date
+    """
+    latest = None
+    for job in jobs:
+        value = job.get('updated_date') or job.get('posted_date')
+        if not value:
+            continue
+        try:
+            timestamp = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+        except ValueError:
+            continue
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        if latest is None or timestamp > latest:
+            latest = timestamp
+    
+    return format_datetime(latest or datetime.now(timezone.utc), usegmt=True)
+
+def query_job_page(category, status, limit, cursor):
+    """
+    Read one page of jobs with the given status, newest first, from the
+    date-ordered indexes
+    
+    Both indexes are sparse: a job is only listed if it has status and
+    posted_date, and category to appear in its category's listing. Category
+    listings filter on status, and keep reading until the page is full, so
+    both listings show the same jobs.
+    """
+    params = {
+        'ScanIndexForward': False
+    }
+    
+    if category:
+        params['IndexName'] = 'CategoryIndex'
+        params['KeyConditionExpression'] = Key('category').eq(category)
+        params['FilterExpression'] = Attr('status').eq(status)
+    else:
+        params['IndexName'] = 'StatusPostedDateIndex'
+        params['KeyConditionExpression'] = Key('status').eq(status)
+    
+    if cursor:
+        params['ExclusiveStartKey'] = decode_cursor(cursor)
+    
+    items = []
+    while True:
+        params['Limit'] = limit - len(items)
+        response = job_table.query(**params)
+        items.extend(response.get('Items', []))
+        last_evaluated_key = response.get('LastEvaluatedKey')
+        if len(items) >= limit or not last_evaluated_key:
+            return items, encode_cursor(last_evaluated_key)
+        params['ExclusiveStartKey'] = last_evaluated_key
+
+def get_cached_listing(cache_key):
+    """
+    Return a cached serialized listing page if it is still fresh
+    """
+    with _listing_cache_lock:
+        entry = _listing_cache.get(cache_key)
+        if entry is None:
+            return None
+        if entry['expires_at'] <= time.monotonic():
+            del _listing_cache[cache_key]
+            return None
+        _listing_cache.move_to_end(cache_key)
+        return entry
+
+def build_listing(cache_key, category, status, limit, cursor):
+    """
+    Query, serialize and cache one listing page with its validators
+    """
+    jobs, next_cursor = query_job_page(category, status, limit, cursor)
+    body = json.dumps({'jobs': jobs, 'nextCursor': next_cursor}, cls=DecimalEncoder)
+    entry = {
+        'body': body,
+        'etag': '"' + hashlib.sha256(body.encode('utf-8')).hexdigest()[:32] + '"',
+        'last_modified': page_last_modified(jobs),
+        'expires_at': time.monotonic() + JOB_LIST_CACHE_TTL_SECONDS
+    }
+    
+    with _listing_cache_lock:
+        _listing_cache[cache_key] = entry
+        _listing_cache.move_to_end(cache_key)
+        while len(_listing_cache) > JOB_LIST_CACHE_MAX_ENTRIES:
+            _listing_cache.popitem(last=False)
+    
+    return entry
+
+def get_request_header(event, name):
+    """
+    Case-insensitive request header lookup
+    """
+    headers = event.get('headers') or {}
+    for key, value in headers.items():
+        if key.lower() == name.lower():
+            return value
+    return None
+
+def etag_matches(if_none_match, etag):
+    """
+    Check an If-None-Match header value against an ETag
+    """
+    if not if_none_match:
+        return False
+    candidates = [value.strip() for value in if_none_match.split(',')]
+    return '*' in candidates or etag in candidates or f"W/{etag}" in candidates
+
 def list_jobs(event, context):
     """
-    List all jobs from DynamoDB or filter by category
+    List jobs newest first, one page at a time, optionally filtered by category
+    
+    Pages are served from an index ordered by posting date and cached in the
+    container for a short TTL. Responses carry ETag and Last-Modified headers,
+    and a matching If-None-Match gets a 304 without a body.
     """
     try:
         # Check for query parameters
-        query_params = event.get('queryStringParameters', {})
+        query_params = event.get('queryStringParameters') or {}
+        category = query_params.get('category')
+        status = query_params.get('status', DEFAULT_LISTING_STATUS)
+        cursor = query_params.get('cursor')
         
-        if query_params and 'category' in query_params:
-            # Filter by category if provided
-            category = query_params.get('category')
-            response = job_table.query(
-                IndexName='CategoryIndex',
-                KeyConditionExpression=Key('category').eq(category)
-            )
-        else:
-            # Get all jobs
-            response = job_table.scan()
-            
-        jobs = response.get('Items', [])
+        try:
+            limit = max(1, min(MAX_PAGE_SIZE, int(query_params.get('limit', DEFAULT_PAGE_SIZE))))
+            if cursor:
+                decode_cursor(cursor)
+        except (TypeError, ValueError):
+            return {
+                'statusCode': 400,
+                'headers': {
+                    'Content-Type': 'application/json',
+                    'Access-Control-Allow-Origin': '*'
+                },
+                'body': json.dumps({'error': 'Invalid limit or cursor'})
+            }
+        
+        cache_key = (category, status, limit, cursor)
+        entry = get_cached_listing(cache_key) or build_listing(cache_key, category, status, limit, cursor)
         
-        # Sort by date (newest first) if we have jobs
-        if jobs:
-            jobs.sort(key=lambda x: x.get('posted_date', ''), reverse=True)
+        headers = {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*',
+            'Access-Control-Allow-Methods': 'GET',
+            'Access-Control-Allow-Headers': 'Content-Type,If-None-Match',
+            'Access-Control-Expose-Headers': 'ETag,Last-Modified',
+            'Cache-Control': f'public, max-age={JOB_LIST_CACHE_TTL_SECONDS}',
+            'ETag': entry['etag'],
+            'Last-Modified': entry['last_modified']
+        }
+        
+        if etag_matches(get_request_header(event, 'If-None-Match'), entry['etag']):
+            return {
+                'statusCode': 304,
+                'headers': headers,
+                'body': ''
+            }
         
         return {
             'statusCode': 200,
-            'headers': {
-                'Content-Type': 'application/json',
-                'Access-Control-Allow-Origin': '*',
-                'Access-Control-Allow-Methods': 'GET',
-                'Access-Control-Allow-Headers': 'Content-Type'
-            },
-            'body': json.dumps({'jobs': jobs}, cls=DecimalEncoder)
+            'headers': headers,
+            'body': entry['body']
         }
     except Exception as e:
         logger.error(f"Error listing jobs: {str(e)}")
@@ -0,0 +1,163 @@
+import json
+import time
+import boto3
+import os
+import logging
+from decimal import Decimal
+from botocore.exceptions import ClientError
+
+# Configure logging
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Initialize AWS clients
+dynamodb = boto3.resource('dynamodb')
+
+# Get environment variables
+DYNAMODB_TABLE = os.environ['DYNAMODB_TABLE']
+SUBSCRIPTION_TABLE_NAME = os.environ['SUBSCRIPTION_TABLE_NAME']
+STATUS_SOCKET_ENDPOINT = os.environ['STATUS_SOCKET_ENDPOINT']
+candidate_table = dynamodb.Table(DYNAMODB_TABLE)
+subscription_table = dynamodb.Table(SUBSCRIPTION_TABLE_NAME)
+
+# API Gateway closes WebSocket connections after two hours; expire leftovers after that
+SUBSCRIPTION_TTL_SECONDS = int(os.environ.get('SUBSCRIPTION_TTL_SECONDS', str(3 * 3600)))
+
+# Status attributes pushed to subscribers, mirroring GET /applications/{id}
+STATUS_FIELDS = ['jobId', 'status', 'statusVersion', 'submissionDate', 'updatedDate']
+
+management_client = boto3.client('apigatewaymanagementapi', endpoint_url=STATUS_SOCKET_ENDPOINT)
+
+def connect(event):
+    """
+    Subscribe a new connection to one application's status transitions
+    """
+    connection_id = event['requestContext']['connectionId']
+    application_id = (event.get('queryStringParameters') or {}).get('applicationId')
+    
+    if not application_id:
+        return {'statusCode': 400, 'body': 'Missing applicationId'}
+    
+    # Reject subscriptions to applications that do not exist
+    response = candidate_table.get_item(Key={'id': application_id}, ProjectionExpression='id')
+    if 'Item' not in response:
+        return {'statusCode': 404, 'body': 'Application not found'}
+    
+    subscription_table.put_item(Item={
+        'connectionId': connection_id,
+        'applicationId': application_id,
+        'expiresAt': int(time.time()) + SUBSCRIPTION_TTL_SECONDS
+    })
+    return {'statusCode': 200, 'body': 'Connected'}
+
+def disconnect(event):
+    """
+    Drop a closed connection's subscription
+    """
+    subscription_table.delete_item(Key={'connectionId': event['requestContext']['connectionId']})
+    return {'statusCode': 200, 'body': 'Disconnected'}
+
+def stream_value(attribute):
+    """
+    Convert a DynamoDB stream attribute value to a JSON-friendly value
+    """
+    if 'S' in attribute:
+        return attribute['S']
+    if 'N' in attribute:
+        number = Decimal(attribute['N'])
+        return int(number) if number == number.to_integral_value() else float(number)
+    return None
+
+def status_transition(record):
+    """
+    Return the new status fields of a stream record that bumps a candidate's
+    status version, or None for any other change
+    """
+    if record.get('eventName') not in ('INSERT', 'MODIFY'):
+        return None
+    
+    change = record.get('dynamodb', {})
+    new_image = change.get('NewImage', {})
+    old_image = change.get('OldImage', {})
+    if 'status' not in new_image or new_image.get('statusVersion') == old_image.get('statusVersion'):
+        return None
+    
+    transition = {'applicationId': change['Keys']['id']['S']}
+    for field in STATUS_FIELDS:
+        if field in new_image:
+            transition[field] = stream_value(new_image[field])
+    return transition
+
+def subscribers(application_id):
+    """
+    Connection IDs subscribed to an application
+    """
+    params = {
+        'IndexName': 'ApplicationIndex',
+        'KeyConditionExpression': 'applicationId = :applicationId',
+        'ExpressionAttributeValues': {':applicationId': application_id},
+        'ProjectionExpression': 'connectionId'
+    }
+    connection_ids = []
+    while True:
+        response = subscription_table.query(**params)
+        connection_ids.extend(item['connectionId'] for item in response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            return connection_ids
+        params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def push_status(connection_id, transition):
+    """
+    Send a status transition to one connection, dropping it if it has gone away
+    """
+    try:
+        management_client.post_to_connection(
+            ConnectionId=connection_id,
+            Data=json.dumps(transition).encode('utf-8')
+        )
+        return True
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') == 'GoneException':
+            subscription_table.delete_item(Key={'connectionId': connection_id})
+            return False
+        raise
+
+def publish_transitions(records):
+    """
+    Push candidate status transitions from the table stream to their subscribers
+    """
+    # Only the latest transition per candidate in a batch matters
+    transitions = {}
+    for record in records:
+        transition = status_transition(record)
+        if transition:
+            transitions[transition['applicationId']] = transition
+    
+    pushed = 0
+    for application_id, transition in transitions.items():
+        for connection_id in subscribers(application_id):
+            if push_status(connection_id, transition):
+                pushed += 1
+    
+    logger.info(f"Pushed {pushed} status updates for {len(transitions)} transitions from {len(records)} stream records")
+    return {'statusCode': 200, 'pushed': pushed}
+
+def lambda_handler(event, context):
+    """
+    Handle status socket connects and disconnects, and fan candidate status
+    transitions from the table stream out to connected clients
+    """
+    if 'Records' in event:
+        return publish_transitions(event['Records'])
+    
+    route_key = event.get('requestContext', {}).get('routeKey')
+    try:
+        if route_key == '$connect':
+            return connect(event)
+        elif route_key == '$disconnect':
+            return disconnect(event)
+    except Exception as e:
+        logger.error(f"Error handling {route_key}: {str(e)}")
+        return {'statusCode': 500, 'body': 'Internal error'}
+    
+    return {'statusCode': 400, 'body': 'Unsupported route'}
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Measure ScreenResume batch throughput offline
+
+Runs the screening Lambda's evaluate_batch against a stub model client that
+sleeps for a fixed latency instead of calling Bedrock, so the worker pool size
+can be tuned without AWS access. Nothing is read from or written to the
+candidate table.
+
+Usage:
+    python benchmark_screening.py
+    python benchmark_screening.py --candidates 500 --latency 1.0 --workers 16
+"""
+import io
+import os
+import sys
+import json
+import time
+import random
+import argparse
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [
+    os.path.join(ROOT, 'lambda', 'screen_resume'),
+    os.path.join(ROOT, 'lambda', 'common', 'python')
+]
+
+# The Lambda module reads its configuration at import time
+os.environ.setdefault('AWS_DEFAULT_REGION', 'ap-southeast-2')
+os.environ.setdefault('BEDROCK_MODEL_ID', 'benchmark-model')
+os.environ.setdefault('DYNAMODB_TABLE', 'benchmark-candidates')
+os.environ.setdefault('RESUME_BUCKET', 'benchmark-resumes')
+
+from job_descriptions import seed_job_description
+from screen_resume import SCREENING_CONCURRENCY, evaluate_batch
+
+class StubBedrockClient:
+    """
+    Offline stand-in for the bedrock-runtime client
+    """
+    def __init__(self, latency_seconds=1.0):
+        self.latency_seconds = latency_seconds
+
+    def invoke_model(self, modelId, body):
+        time.sleep(self.latency_seconds)
+        content = json.loads(body)['messages'][0]['content']
+        prompt = ''.join(block['text'] for block in content)
+        evaluation = {
+            "score": random.Random(prompt).randint(0, 100),
+            "assessment": "Stub evaluation",
+            "matching_skills": [],
+            "missing_skills": [],
+            "recommendation": "PROCEED"
+        }
+        payload = json.dumps({
+            'content': [{'text': json.dumps(evaluation)}],
+            'usage': {'input_tokens': len(prompt) // 4, 'output_tokens': 50}
+        }).encode('utf-8')
+        return {'body': io.BytesIO(payload)}
+
+def benchmark_batch_screening(num_candidates=200, latency_seconds=1.0, max_workers=SCREENING_CONCURRENCY):
+    """
+    Measure batch screening throughput offline against the stub model
+    """
+    candidates = [
+        {'id': f"benchmark-{i}", 'resumeText': f"Benchmark resume {i}"}
+        for i in range(num_candidates)
+    ]
+
+    seed_job_description('benchmark-job', 'Benchmark Position')
+
+    started = time.monotonic()
+    evaluations, errors = evaluate_batch(
+        candidates, 'benchmark-job', StubBedrockClient(latency_seconds), max_workers
+    )
+    elapsed = time.monotonic() - started
+
+    return {
+        'candidates': num_candidates,
+        'workers': max_workers,
+        'seconds': round(elapsed, 2),
+        'throughputPerSecond': round(len(evaluations) / elapsed, 1),
+        'errors': len(errors)
+    }
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark batch resume screening against a stub model')
+    parser.add_argument('--candidates', type=int, default=200, help='Candidates to screen')
+    parser.add_argument('--latency', type=float, default=0.2, help='Stub model latency in seconds')
+    parser.add_argument('--workers', type=int, default=SCREENING_CONCURRENCY, help='Concurrent model calls')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    print(json.dumps(benchmark_batch_screening(args.candidates, args.latency, args.workers)))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -15,6 +15,7 @@ fi
 FRONTEND_BUCKET_NAME=$(cat "$TERRAFORM_OUTPUT_FILE" | jq -r '.frontend_bucket_name.value')
 CLOUDFRONT_DISTRIBUTION_ID=$(cat "$TERRAFORM_OUTPUT_FILE" | jq -r '.frontend_cloudfront_dist_id.value')
 API_URL=$(cat "$TERRAFORM_OUTPUT_FILE" | jq -r '.api_gateway_url.value')
+STATUS_SOCKET_URL=$(cat "$TERRAFORM_OUTPUT_FILE" | jq -r '.status_socket_url.value // empty')
 
 if [ -z "$FRONTEND_BUCKET_NAME" ] || [ "$FRONTEND_BUCKET_NAME" == "null" ]; then
   echo "Error: Frontend bucket name not found in Terraform output"
@@ -37,6 +38,7 @@ echo "API Gateway URL: $API_URL"
 echo "Creating .env.production file with API URL: $API_URL"
 cat > frontend/.env.production << EOL
 NEXT_PUBLIC_API_URL=$API_URL
+NEXT_PUBLIC_STATUS_SOCKET_URL=$STATUS_SOCKET_URL
 EOL
 
 # Build the Next.js app
@@ -47,7 +49,8 @@ npm run build
 
 # Deploy to S3
 echo "Deploying to S3 bucket: $FRONTEND_BUCKET_NAME"
-aws s3 sync out/ "s3://$FRONTEND_BUCKET_NAME" --delete
+# catalog/ holds the job catalog snapshots written by the PublishJobCatalog Lambda
+aws s3 sync out/ "s3://$FRONTEND_BUCKET_NAME" --delete --exclude "catalog/*"
 
 # Invalidate CloudFront cache
 echo "Invalidating CloudFront cache: $CLOUDFRONT_DISTRIBUTION_ID"
@@ -4,7 +4,7 @@ import { useForm, Controller } from 'react-hook-form'
 import { TextField, Button, Grid, Typography, Box, Alert, CircularProgress, InputAdornment } from '@mui/material'
 import { DescriptionOutlined as FileIcon, Person as PersonIcon, Email as EmailIcon, Phone as PhoneIcon, LinkedIn as LinkedInIcon } from '@mui/icons-material'
 import { useDropzone } from 'react-dropzone'
-import { submitApplication } from '@/services/api'
+import { createResumeUpload, uploadResume, submitApplication } from '@/services/api'
 
 interface ApplicationFormProps {
   jobId: string
@@ -42,7 +42,6 @@ export function ApplicationForm({ jobId }: ApplicationFormProps) {
   const { getRootProps, getInputProps, isDragActive } = useDropzone({
     accept: {
       'application/pdf': ['.pdf'],
-      'application/msword': ['.doc'],
       'application/vnd.openxmlformats-officedocument.wordprocessingml.document': ['.docx']
     },
     maxFiles: 1,
@@ -59,7 +58,7 @@ export function ApplicationForm({ jobId }: ApplicationFormProps) {
         if (errors.some(e => e.code === 'file-too-large')) {
           setError('File is too large. Maximum size is 5MB.')
         } else if (errors.some(e => e.code === 'file-invalid-type')) {
-          setError('Invalid file type. Please upload a PDF, DOC, or DOCX file.')
+          setError('Invalid file type. Please upload a PDF or DOCX file.')
         } else {
           setError('Error uploading file. Please try again.')
         }
@@ -77,14 +76,18 @@ export function ApplicationForm({ jobId }: ApplicationFormProps) {
     setError('')
     
     try {
-      // Convert resume file to base64
-      const resumeBase64 = await convertFileToBase64(resumeFile)
+      // Upload the resume straight to storage
+      const uploadTarget = await createResumeUpload(jobId, resumeFile)
+      await uploadResume(uploadTarget, resumeFile)
       
-      // Submit the application
+      // Register the application
       const applicationData = {
         ...data,
         jobId,
-        resume: resumeBase64
+        applicationId: uploadTarget.applicationId,
+        resumeKey: uploadTarget.resumeKey,
+        // Phone screens are only placed within calling hours in the candidate's time zone
+        timeZone: Intl.DateTimeFormat().resolvedOptions().timeZone
       }
       
       const response = await submitApplication(applicationData)
@@ -102,15 +105,6 @@ export function ApplicationForm({ jobId }: ApplicationFormProps) {
     }
   }
   
-  const convertFileToBase64 = (file: File): Promise<string> => {
-    return new Promise((resolve, reject) => {
-      const reader = new FileReader()
-      reader.readAsDataURL(file)
-      reader.onload = () => resolve(reader.result as string)
-      reader.onerror = error => reject(error)
-    })
-  }
-  
   if (success) {
     return (
       <Box className="py-8 text-center">
@@ -293,7 +287,7 @@ export function ApplicationForm({ jobId }: ApplicationFormProps) {
                   Drag & drop your resume here, or click to select file
                 </Typography>
                 <Typography variant="body2" color="textSecondary">
-                  Supported formats: PDF, DOC, DOCX (Max 5MB)
+                  Supported formats: PDF, DOCX (Max 5MB)
                 </Typography>
               </>
             )}
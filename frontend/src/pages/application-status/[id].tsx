@@ -3,11 +3,17 @@ import { useRouter } from 'next/router'
 import Head from 'next/head'
 import { Typography, Container, Paper, Box, Stepper, Step, StepLabel, CircularProgress, Button } from '@mui/material'
 import { ArrowBack as ArrowBackIcon } from '@mui/icons-material'
-import { getApplicationStatus } from '@/services/api'
+import { getApplicationStatus, isStatusSocketAvailable, subscribeToApplicationStatus } from '@/services/api'
 import { ApplicationStatus } from '@/types'
 
 const steps = ['Application Submitted', 'Resume Screening', 'Phone Interview', 'Interview Scheduled']
 
+// Statuses after which nothing changes, so watching stops
+const TERMINAL_STATUSES = ['INTERVIEW_SCHEDULED']
+
+// Pause before reconnecting after a failed request or a dropped status socket
+const RETRY_DELAY_MS = 5000
+
 export default function ApplicationStatusPage() {
   const router = useRouter()
   const { id } = router.query
@@ -20,49 +26,114 @@ export default function ApplicationStatusPage() {
   useEffect(() => {
     if (!id) return
 
-    const fetchStatus = async () => {
-      try {
-        setLoading(true)
-        const data = await getApplicationStatus(id as string)
-        setApplicationStatus(data)
-        setError('')
-        
-        // Set the active step based on the status
-        switch (data.status) {
-          case 'SUBMITTED':
-            setActiveStep(0)
-            break
-          case 'EXTRACTED':
-          case 'SCREENED':
-          case 'RANKED':
-            setActiveStep(1)
-            break
-          case 'PHONE_INTERVIEW_INITIATED':
-          case 'PHONE_INTERVIEW_COMPLETED':
-            setActiveStep(2)
-            break
-          case 'INTERVIEW_SCHEDULED':
-            setActiveStep(3)
-            break
-          default:
-            setActiveStep(0)
+    let cancelled = false
+    let done = false
+    let version: number | null = null
+    let unsubscribe: (() => void) | null = null
+
+    const applyStatus = (data: ApplicationStatus) => {
+      // Pushed and fetched statuses can arrive out of order; keep the newest
+      if (version !== null && data.statusVersion < version) return
+      version = data.statusVersion
+      done = TERMINAL_STATUSES.includes(data.status)
+      
+      setApplicationStatus(data)
+      setError('')
+      setLoading(false)
+      
+      // Set the active step based on the status
+      switch (data.status) {
+        case 'SUBMITTED':
+          setActiveStep(0)
+          break
+        case 'EXTRACTED':
+        case 'SCREENED':
+        case 'RANKED':
+          setActiveStep(1)
+          break
+        case 'PHONE_INTERVIEW_INITIATED':
+        case 'PHONE_INTERVIEW_COMPLETED':
+          setActiveStep(2)
+          break
+        case 'INTERVIEW_SCHEDULED':
+          setActiveStep(3)
+          break
+        default:
+          setActiveStep(0)
+      }
+    }
+
+    const showError = (err: unknown) => {
+      console.error('Error fetching application status:', err)
+      setError('Failed to load application status. Please try again later.')
+      setLoading(false)
+    }
+
+    // Fallback without the status socket: each request waits server-side for
+    // the status version to move, and the next one starts as soon as it returns
+    const longPoll = async () => {
+      while (!cancelled && !done) {
+        try {
+          const data = await getApplicationStatus(id as string, version)
+          if (cancelled) return
+          applyStatus(data)
+        } catch (err) {
+          if (cancelled) return
+          showError(err)
+          await new Promise((resolve) => setTimeout(resolve, RETRY_DELAY_MS))
         }
-      } catch (err) {
-        console.error('Error fetching application status:', err)
-        setError('Failed to load application status. Please try again later.')
-      } finally {
-        setLoading(false)
       }
     }
 
-    fetchStatus()
-    
-    // Poll for status updates every 30 seconds
-    const intervalId = setInterval(() => {
-      fetchStatus()
-    }, 30000)
+    // Status transitions are pushed over the socket; the current status is
+    // read once the subscription is live so no transition is missed
+    const watchSocket = () => {
+      let opened = false
+      unsubscribe = subscribeToApplicationStatus(
+        id as string,
+        (data) => {
+          if (cancelled) return
+          applyStatus(data)
+          if (done && unsubscribe) unsubscribe()
+        },
+        async () => {
+          opened = true
+          try {
+            const data = await getApplicationStatus(id as string)
+            if (cancelled) return
+            applyStatus(data)
+            if (done && unsubscribe) unsubscribe()
+          } catch (err) {
+            if (!cancelled) showError(err)
+          }
+        },
+        () => {
+          unsubscribe = null
+          if (cancelled || done) return
+          if (!opened) {
+            // The socket could not be opened; long-poll instead
+            longPoll()
+            return
+          }
+          // Idle timeouts and the two-hour connection limit close the socket
+          setTimeout(() => {
+            if (!cancelled) watchSocket()
+          }, RETRY_DELAY_MS)
+        }
+      )
+    }
+
+    setLoading(true)
+    if (isStatusSocketAvailable()) {
+      watchSocket()
+    } else {
+      longPoll()
+    }
     
-    return () => clearInterval(intervalId)
+    return () => {
+      cancelled = true
+      if (unsubscribe) unsubscribe()
+    }
   }, [id])
 
   const handleBack = () => {
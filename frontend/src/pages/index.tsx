@@ -1,15 +1,17 @@
 import { useState, useEffect } from 'react'
 import Head from 'next/head'
-import { Typography, Container, Grid, CircularProgress, Box } from '@mui/material'
+import { Typography, Container, Grid, CircularProgress, Box, Button } from '@mui/material'
 import { JobCard } from '@/components/JobCard'
 import { JobFilter } from '@/components/JobFilter'
-import { getJobs } from '@/services/api'
+import { getJobsPage } from '@/services/api'
 import { Job } from '@/types'
 
 export default function Home() {
   const [jobs, setJobs] = useState<Job[]>([])
   const [filteredJobs, setFilteredJobs] = useState<Job[]>([])
   const [loading, setLoading] = useState(true)
+  const [loadingMore, setLoadingMore] = useState(false)
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
   const [error, setError] = useState('')
   const [selectedCategory, setSelectedCategory] = useState<string | null>(null)
 
@@ -17,9 +19,10 @@ export default function Home() {
     const fetchJobs = async () => {
       try {
         setLoading(true)
-        const data = await getJobs(selectedCategory)
-        setJobs(data)
-        setFilteredJobs(data)
+        const page = await getJobsPage(selectedCategory)
+        setJobs(page.jobs)
+        setFilteredJobs(page.jobs)
+        setNextCursor(page.nextCursor)
         setError('')
       } catch (err) {
         console.error('Error fetching jobs:', err)
@@ -32,6 +35,24 @@ export default function Home() {
     fetchJobs()
   }, [selectedCategory])
 
+  const handleLoadMore = async () => {
+    if (!nextCursor) return
+    
+    try {
+      setLoadingMore(true)
+      const page = await getJobsPage(selectedCategory, nextCursor)
+      const allJobs = [...jobs, ...page.jobs]
+      setJobs(allJobs)
+      setFilteredJobs(allJobs)
+      setNextCursor(page.nextCursor)
+    } catch (err) {
+      console.error('Error fetching more jobs:', err)
+      setError('Failed to load more jobs. Please try again later.')
+    } finally {
+      setLoadingMore(false)
+    }
+  }
+
   const handleFilterChange = (category: string | null) => {
     setSelectedCategory(category)
   }
@@ -68,13 +89,22 @@ export default function Home() {
               No jobs found. Please try a different filter or check back later.
             </Typography>
           ) : (
-            <Grid container spacing={3} className="mt-2">
-              {filteredJobs.map((job) => (
-                <Grid item xs={12} sm={6} md={4} key={job.id}>
-                  <JobCard job={job} />
-                </Grid>
-              ))}
-            </Grid>
+            <>
+              <Grid container spacing={3} className="mt-2">
+                {filteredJobs.map((job) => (
+                  <Grid item xs={12} sm={6} md={4} key={job.id}>
+                    <JobCard job={job} />
+                  </Grid>
+                ))}
+              </Grid>
+              {nextCursor && (
+                <Box display="flex" justifyContent="center" my={4}>
+                  <Button variant="outlined" onClick={handleLoadMore} disabled={loadingMore}>
+                    {loadingMore ? <CircularProgress size={24} /> : 'Load more jobs'}
+                  </Button>
+                </Box>
+              )}
+            </>
           )}
         </Container>
       </main>
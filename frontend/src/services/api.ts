@@ -1,9 +1,15 @@
 import axios from 'axios'
-import { Job, ApplicationStatus } from '@/types'
+import { Job, JobPage, ApplicationStatus, ApplicationStatusBatch, ApplicationFormData, ResumeUploadTarget } from '@/types'
 
 // Get API URL from environment variables
 const API_URL = process.env.NEXT_PUBLIC_API_URL || 'https://your-api-gateway-url.execute-api.ap-southeast-2.amazonaws.com/prod'
 
+// WebSocket endpoint pushing application status transitions; without it the status page long-polls
+const STATUS_SOCKET_URL = process.env.NEXT_PUBLIC_STATUS_SOCKET_URL || ''
+
+// Job catalog snapshots published to the frontend bucket (same origin by default)
+const CATALOG_URL = process.env.NEXT_PUBLIC_CATALOG_URL || '/catalog'
+
 // Create axios instance
 const api = axios.create({
   baseURL: API_URL,
@@ -13,21 +19,70 @@ const api = axios.create({
 })
 
 /**
- * Get all jobs, optionally filtered by category
+ * Object key segment for a category; must match category_slug in the catalog publisher
  */
-export const getJobs = async (category: string | null = null): Promise<Job[]> => {
+const categorySlug = (category: string): string =>
+  category.toLowerCase().replace(/[^a-z0-9]+/g, '-').replace(/^-+|-+$/g, '') || 'uncategorized'
+
+/**
+ * Read a precompressed job catalog snapshot, or null if none is available
+ */
+const getCatalogSnapshot = async (category: string | null = null): Promise<Job[] | null> => {
+  const name = category ? `categories/${categorySlug(category)}` : 'jobs'
+  
+  // The browser decodes the stored Content-Encoding; Brotli is smaller, gzip is the fallback
+  for (const suffix of ['br', 'gz']) {
+    try {
+      const response = await axios.get(`${CATALOG_URL}/${name}.json.${suffix}`)
+      // Missing objects are answered with index.html by the CDN
+      if (Array.isArray(response.data?.jobs)) {
+        return response.data.jobs
+      }
+    } catch (error) {
+      // Try the next variant, then the API
+    }
+  }
+  return null
+}
+
+/**
+ * Get one page of jobs, newest first, optionally filtered by category
+ * The first page comes from the catalog snapshot when one is published
+ */
+export const getJobsPage = async (category: string | null = null, cursor: string | null = null): Promise<JobPage> => {
+  if (!cursor) {
+    const snapshot = await getCatalogSnapshot(category)
+    if (snapshot) {
+      return { jobs: snapshot, nextCursor: null }
+    }
+  }
+  
   try {
-    const params = category ? { category } : {}
+    const params: Record<string, string> = {}
+    if (category) params.category = category
+    if (cursor) params.cursor = cursor
     const response = await api.get('/jobs', { params })
-    return response.data.jobs || []
+    return {
+      jobs: response.data.jobs || [],
+      nextCursor: response.data.nextCursor || null,
+    }
   } catch (error) {
     console.error('Error fetching jobs:', error)
     throw error
   }
 }
 
+/**
+ * Get jobs, optionally filtered by category: the whole catalog snapshot, or the first API page
+ */
+export const getJobs = async (category: string | null = null): Promise<Job[]> => {
+  const page = await getJobsPage(category)
+  return page.jobs
+}
+
 /**
  * Get a specific job by ID
+ * Read from the API: the catalog snapshots are only worth downloading for listings
  */
 export const getJob = async (jobId: string): Promise<Job> => {
   try {
@@ -40,9 +95,42 @@ export const getJob = async (jobId: string): Promise<Job> => {
 }
 
 /**
- * Submit a job application
+ * Request a short-lived presigned upload target for a resume
+ */
+export const createResumeUpload = async (jobId: string, file: File): Promise<ResumeUploadTarget> => {
+  try {
+    const response = await api.post('/applications/uploads', {
+      jobId,
+      contentType: file.type || 'application/pdf',
+      contentLength: file.size,
+    })
+    return response.data
+  } catch (error) {
+    console.error('Error creating resume upload:', error)
+    throw error
+  }
+}
+
+/**
+ * Upload the resume file directly to storage using a presigned upload target
  */
-export const submitApplication = async (applicationData: any): Promise<{ applicationId: string; status: string }> => {
+export const uploadResume = async (target: ResumeUploadTarget, file: File): Promise<void> => {
+  try {
+    const formData = new FormData()
+    Object.entries(target.uploadFields).forEach(([key, value]) => formData.append(key, value))
+    // The file must be the last field of a presigned POST
+    formData.append('file', file)
+    await axios.post(target.uploadUrl, formData)
+  } catch (error) {
+    console.error('Error uploading resume:', error)
+    throw error
+  }
+}
+
+/**
+ * Register a job application once its resume has been uploaded
+ */
+export const submitApplication = async (applicationData: ApplicationFormData): Promise<{ applicationId: string; status: string }> => {
   try {
     const response = await api.post('/applications', applicationData)
     return response.data
@@ -54,13 +142,63 @@ export const submitApplication = async (applicationData: any): Promise<{ applica
 
 /**
  * Get application status
+ * With sinceVersion the request waits (up to waitSeconds) for a newer status before returning
  */
-export const getApplicationStatus = async (applicationId: string): Promise<ApplicationStatus> => {
+export const getApplicationStatus = async (
+  applicationId: string,
+  sinceVersion: number | null = null,
+  waitSeconds: number = 20
+): Promise<ApplicationStatus> => {
   try {
-    const response = await api.get(`/applications/${applicationId}`)
+    const params = sinceVersion !== null ? { sinceVersion, waitSeconds } : {}
+    const response = await api.get(`/applications/${applicationId}`, { params })
     return response.data
   } catch (error) {
     console.error(`Error fetching application status ${applicationId}:`, error)
     throw error
   }
 }
+
+/**
+ * Whether status transitions can be pushed over the status socket
+ */
+export const isStatusSocketAvailable = (): boolean => Boolean(STATUS_SOCKET_URL) && typeof WebSocket !== 'undefined'
+
+/**
+ * Subscribe to an application's status transitions over the status socket
+ * onOpen runs once the subscription is live; onClose runs when the socket closes for any reason
+ */
+export const subscribeToApplicationStatus = (
+  applicationId: string,
+  onStatus: (status: ApplicationStatus) => void,
+  onOpen: () => void,
+  onClose: () => void
+): (() => void) => {
+  const socket = new WebSocket(`${STATUS_SOCKET_URL}?applicationId=${encodeURIComponent(applicationId)}`)
+  socket.onopen = onOpen
+  socket.onmessage = (event) => {
+    try {
+      onStatus(JSON.parse(event.data))
+    } catch (error) {
+      console.error(`Invalid status update for application ${applicationId}:`, error)
+    }
+  }
+  socket.onclose = onClose
+  return () => {
+    socket.onclose = null
+    socket.close()
+  }
+}
+
+/**
+ * Get the status of many applications in one request
+ */
+export const getApplicationStatuses = async (applicationIds: string[]): Promise<ApplicationStatusBatch> => {
+  try {
+    const response = await api.post('/applications/statuses', { applicationIds })
+    return response.data
+  } catch (error) {
+    console.error('Error fetching application statuses:', error)
+    throw error
+  }
+}
@@ -16,22 +16,43 @@ export interface Job {
   status?: string
 }
 
+export interface JobPage {
+  jobs: Job[]
+  nextCursor: string | null
+}
+
 export interface ApplicationStatus {
   applicationId: string
   jobId: string
   status: string
+  statusVersion: number
   submissionDate: string
   updatedDate: string
 }
 
+export interface ResumeUploadTarget {
+  applicationId: string
+  resumeKey: string
+  uploadUrl: string
+  uploadFields: Record<string, string>
+  expiresIn: number
+}
+
+export interface ApplicationStatusBatch {
+  applications: ApplicationStatus[]
+  notFound: string[]
+}
+
 export interface ApplicationFormData {
+  applicationId: string
   jobId: string
   fullName: string
   email: string
   phone: string
-  resume: string
+  resumeKey: string
   linkedIn?: string
   portfolio?: string
   coverLetter?: string
   additionalInfo?: string
+  timeZone?: string
 }
@@ -177,6 +177,88 @@ resource "aws_cloudfront_origin_request_policy" "frontend_origin_request_policy"
   }
 }
 
+#------------------------------------------------------------
+# Job Catalog Snapshot Publisher
+#------------------------------------------------------------
+# Regenerates precompressed job catalog snapshots under catalog/ in the
+# frontend bucket whenever the jobs table changes
+resource "aws_lambda_function" "publish_job_catalog_lambda" {
+  filename      = data.archive_file.publish_job_catalog_lambda_package.output_path
+  function_name = "PublishJobCatalog"
+  role          = aws_iam_role.lambda_execution_role.arn
+  handler       = "publish_job_catalog.lambda_handler"
+  runtime       = "python3.11"
+  timeout       = 120
+  memory_size   = 512
+
+  environment {
+    variables = {
+      JOB_TABLE_NAME = aws_dynamodb_table.job_table.name,
+      FRONTEND_BUCKET = aws_s3_bucket.frontend_bucket.bucket,
+      SNAPSHOT_MAX_AGE_SECONDS = "60"
+    }
+  }
+
+  depends_on = [
+    aws_iam_role_policy_attachment.lambda_basic_execution,
+    aws_iam_role_policy_attachment.lambda_custom_policy_attachment
+  ]
+}
+
+data "archive_file" "publish_job_catalog_lambda_package" {
+  type        = "zip"
+  source_dir  = "${path.module}/lambda/publish_job_catalog"
+  output_path = "${path.module}/lambda/publish_job_catalog.zip"
+}
+
+# Edits arriving within the batching window produce a single publish
+resource "aws_lambda_event_source_mapping" "job_table_stream_publisher" {
+  event_source_arn                   = aws_dynamodb_table.job_table.stream_arn
+  function_name                      = aws_lambda_function.publish_job_catalog_lambda.arn
+  starting_position                  = "LATEST"
+  batch_size                         = 1000
+  maximum_batching_window_in_seconds = 30
+  maximum_retry_attempts             = 3
+}
+
+resource "aws_iam_role_policy" "publish_job_catalog_policy" {
+  name = "PublishJobCatalogPolicy"
+  role = aws_iam_role.lambda_execution_role.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect = "Allow"
+        Action = [
+          "s3:PutObject",
+          "s3:DeleteObject",
+          "s3:ListBucket"
+        ]
+        Resource = [
+          aws_s3_bucket.frontend_bucket.arn,
+          "${aws_s3_bucket.frontend_bucket.arn}/catalog/*"
+        ]
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "dynamodb:DescribeStream",
+          "dynamodb:GetRecords",
+          "dynamodb:GetShardIterator",
+          "dynamodb:ListStreams"
+        ]
+        Resource = aws_dynamodb_table.job_table.stream_arn
+      }
+    ]
+  })
+}
+
+resource "aws_cloudwatch_log_group" "publish_job_catalog_logs" {
+  name              = "/aws/lambda/${aws_lambda_function.publish_job_catalog_lambda.function_name}"
+  retention_in_days = 30
+}
+
 #------------------------------------------------------------
 # Output: CloudFront Distribution Domain Name
 #------------------------------------------------------------
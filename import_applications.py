@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+"""
+Bulk import applications from a job-board drop
+
+A drop is a JSONL manifest with one application per line plus the resume files
+it references. It can be a local directory or S3 prefix containing
+manifest.jsonl, a manifest file or object itself, or a .tar/.tar.gz/.tgz/.zip
+archive (local or on S3) containing manifest.jsonl at its root. Resume paths
+in the manifest are relative to the manifest.
+
+Manifest lines look like:
+
+    {"jobId": "software-engineer-001", "fullName": "...", "email": "...",
+     "phone": "...", "resume": "resumes/12345.pdf", "externalId": "12345"}
+
+with the same optional fields as the applications API (coverLetter, linkedIn,
+portfolio, additionalInfo, timeZone).
+
+The manifest is read one batch at a time. For each batch the importer uploads
+resumes concurrently, writes the candidate records with BatchWriteItem and
+starts the screening workflows through a rate limiter, then checkpoints the
+last manifest line it finished. Re-running the same command resumes after the
+checkpoint. Application IDs are derived from the job and the candidate's
+external ID (or email), so a line is never imported twice, and workflows are
+started with the application ID as execution name, so they are never started
+twice either.
+
+Usage:
+    python import_applications.py s3://job-board-drops/2025-05-01/
+    python import_applications.py ./drop-2025-05-01.tar.gz --start-rate 20
+"""
+import os
+import sys
+import json
+import time
+import uuid
+import shutil
+import tarfile
+import zipfile
+import argparse
+import tempfile
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'lambda', 'common', 'python'))
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+logger = logging.getLogger('import_applications')
+
+TERRAFORM_OUTPUT_FILE = 'terraform_output.json'
+MANIFEST_NAME = 'manifest.jsonl'
+ARCHIVE_SUFFIXES = ('.tar', '.tar.gz', '.tgz', '.zip')
+
+# Imported resumes are stored outside the resumes/ prefix so the bucket
+# notification does not start a second, unthrottled extraction for them
+IMPORT_RESUME_PREFIX = 'imports'
+
+# Application IDs are stable across runs for the same job and candidate
+IMPORT_NAMESPACE = uuid.UUID('4c7f2d4e-9a51-4f0e-8a53-2f4f0a7c3b61')
+
+REQUIRED_FIELDS = ['jobId', 'fullName', 'email', 'phone', 'resume']
+OPTIONAL_FIELDS = ['coverLetter', 'linkedIn', 'portfolio', 'additionalInfo', 'timeZone']
+
+# Resume file extensions accepted by the pipeline and their content types;
+# legacy .doc is left out because neither Textract nor the local parsers read it
+RESUME_CONTENT_TYPES = {
+    'pdf': 'application/pdf',
+    'docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+}
+
+BATCH_GET_CHUNK_SIZE = 100
+BATCH_GET_MAX_RETRIES = 5
+
+class RateLimiter:
+    """
+    Token bucket shared by the workflow starter threads
+    """
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+def split_s3_url(url):
+    bucket, _, key = url[len('s3://'):].partition('/')
+    return bucket, key
+
+def load_terraform_outputs():
+    """
+    Resource names from the saved Terraform outputs, if present
+    """
+    if not os.path.exists(TERRAFORM_OUTPUT_FILE):
+        return {}
+    with open(TERRAFORM_OUTPUT_FILE) as f:
+        return {name: output['value'] for name, output in json.load(f).items()}
+
+class DropSource:
+    """
+    Manifest lines and resume files of a drop, from local disk or S3
+    """
+    def __init__(self, source, s3_client, workdir):
+        self.s3_client = s3_client
+
+        if source.lower().endswith(ARCHIVE_SUFFIXES):
+            source = self.unpack_archive(source, workdir)
+
+        if source.startswith('s3://'):
+            bucket, key = split_s3_url(source)
+            if not key.endswith('.jsonl'):
+                key = key.rstrip('/') + '/' + MANIFEST_NAME if key else MANIFEST_NAME
+            self.bucket = bucket
+            self.manifest = key
+            self.base = key.rsplit('/', 1)[0] + '/' if '/' in key else ''
+        else:
+            manifest = os.path.join(source, MANIFEST_NAME) if os.path.isdir(source) else source
+            self.bucket = None
+            self.manifest = manifest
+            self.base = os.path.dirname(os.path.abspath(manifest))
+
+    def unpack_archive(self, source, workdir):
+        """
+        Extract an archive to disk (downloading it first if it is on S3) and return the extracted directory
+        """
+        if source.startswith('s3://'):
+            bucket, key = split_s3_url(source)
+            local_path = os.path.join(workdir, os.path.basename(key))
+            logger.info(f"Downloading {source}")
+            self.s3_client.download_file(bucket, key, local_path)
+            source = local_path
+
+        target = os.path.join(workdir, 'drop')
+        logger.info(f"Extracting {source}")
+        if source.lower().endswith('.zip'):
+            with zipfile.ZipFile(source) as archive:
+                archive.extractall(target)
+        else:
+            # Streamed extraction; members are written to disk as they are read
+            with tarfile.open(source, mode='r|*') as archive:
+                if hasattr(tarfile, 'data_filter'):
+                    archive.extractall(target, filter='data')
+                else:
+                    archive.extractall(target)
+        return target
+
+    def lines(self):
+        """
+        Yield (line number, raw line) pairs of the manifest without loading it whole
+        """
+        if self.bucket:
+            body = self.s3_client.get_object(Bucket=self.bucket, Key=self.manifest)['Body']
+            for line_number, line in enumerate(body.iter_lines(), start=1):
+                yield line_number, line.decode('utf-8')
+        else:
+            with open(self.manifest, encoding='utf-8') as f:
+                for line_number, line in enumerate(f, start=1):
+                    yield line_number, line
+
+    def upload_resume(self, path, bucket, key, content_type):
+        """
+        Copy one resume into the resume bucket (server-side when the drop is on S3)
+        """
+        extra_args = {'ContentType': content_type}
+        if self.bucket:
+            self.s3_client.copy({'Bucket': self.bucket, 'Key': self.base + path}, bucket, key, ExtraArgs=extra_args)
+            return self.s3_client.head_object(Bucket=bucket, Key=key)['ContentLength']
+
+        local_path = os.path.normpath(os.path.join(self.base, path))
+        if not local_path.startswith(self.base + os.sep):
+            raise ValueError(f"Resume path {path} is outside the drop")
+        self.s3_client.upload_file(local_path, bucket, key, ExtraArgs=extra_args)
+        return os.path.getsize(local_path)
+
+def parse_application(line_number, line):
+    """
+    Validate one manifest line and derive its application ID and resume key
+
+    Returns (application, resume path, content type) or raises ValueError.
+    """
+    record = json.loads(line)
+    if not isinstance(record, dict):
+        raise ValueError("Manifest line is not an object")
+
+    missing = [field for field in REQUIRED_FIELDS if not record.get(field)]
+    if missing:
+        raise ValueError(f"Missing required fields: {', '.join(missing)}")
+
+    extension = record['resume'].rsplit('.', 1)[-1].lower()
+    if extension not in RESUME_CONTENT_TYPES:
+        raise ValueError(f"Unsupported resume type: {record['resume']}")
+
+    job_id = record['jobId']
+    natural_key = record.get('externalId') or record['email'].strip().lower()
+    application_id = record.get('applicationId') or str(uuid.uuid5(IMPORT_NAMESPACE, f"{job_id}:{natural_key}"))
+
+    application = {
+        'id': application_id,
+        'jobId': job_id,
+        'fullName': record['fullName'],
+        'email': record['email'],
+        'phone': record['phone'],
+        'resumeKey': f"{IMPORT_RESUME_PREFIX}/{job_id}/{application_id}.{extension}"
+    }
+    for field in OPTIONAL_FIELDS:
+        if record.get(field):
+            application[field] = record[field]
+    if record.get('externalId'):
+        application['externalId'] = str(record['externalId'])
+
+    return application, record['resume'], RESUME_CONTENT_TYPES[extension]
+
+class Importer:
+    def __init__(self, args, outputs):
+        config = Config(
+            max_pool_connections=max(args.upload_concurrency, args.start_concurrency) + 2,
+            retries={'max_attempts': 10, 'mode': 'adaptive'}
+        )
+        self.s3_client = boto3.client('s3', config=config)
+        self.sfn_client = boto3.client('stepfunctions', config=config)
+        self.dynamodb = boto3.resource('dynamodb', config=config)
+
+        self.resume_bucket = args.resume_bucket or outputs.get('resume_bucket_name')
+        self.table_name = args.table or outputs.get('dynamodb_table_name')
+        self.state_machine_arn = args.state_machine_arn or outputs.get('step_functions_state_machine_arn')
+        if not (self.resume_bucket and self.table_name and self.state_machine_arn):
+            raise SystemExit("Resume bucket, table and state machine ARN are required (flags or terraform_output.json)")
+        self.table = self.dynamodb.Table(self.table_name)
+
+        # The shared records module reads its table name from the environment
+        os.environ['DYNAMODB_TABLE'] = self.table_name
+        from candidate_records import new_application
+        self.new_application = new_application
+
+        self.args = args
+        self.limiter = RateLimiter(args.start_rate)
+        self.counts = {'imported': 0, 'resumed': 0, 'skipped': 0, 'failed': 0}
+        self.bytes_uploaded = 0
+        self.started_at = time.monotonic()
+        self.processed_before = 0
+
+    def load_checkpoint(self):
+        if not os.path.exists(self.args.checkpoint):
+            return 0
+        with open(self.args.checkpoint) as f:
+            checkpoint = json.load(f)
+        if checkpoint['source'] != self.args.source:
+            raise SystemExit(f"Checkpoint {self.args.checkpoint} belongs to {checkpoint['source']}")
+        self.counts.update(checkpoint['counts'])
+        self.processed_before = sum(self.counts.values())
+        logger.info(f"Resuming after manifest line {checkpoint['line']} ({checkpoint['counts']})")
+        return checkpoint['line']
+
+    def save_checkpoint(self, line_number):
+        temporary = self.args.checkpoint + '.tmp'
+        with open(temporary, 'w') as f:
+            json.dump({'source': self.args.source, 'line': line_number, 'counts': self.counts}, f)
+        os.replace(temporary, self.args.checkpoint)
+
+    def record_failure(self, line_number, error):
+        self.counts['failed'] += 1
+        logger.warning(f"Line {line_number}: {error}")
+        with open(self.args.checkpoint + '.failures.jsonl', 'a') as f:
+            f.write(json.dumps({'line': line_number, 'error': str(error)}) + '\n')
+
+    def existing_statuses(self, application_ids):
+        """
+        Current status of the applications that already have candidate records
+        """
+        statuses = {}
+        for start in range(0, len(application_ids), BATCH_GET_CHUNK_SIZE):
+            request = {
+                self.table_name: {
+                    'Keys': [{'id': application_id} for application_id in application_ids[start:start + BATCH_GET_CHUNK_SIZE]],
+                    'ProjectionExpression': 'id, #status',
+                    'ExpressionAttributeNames': {'#status': 'status'}
+                }
+            }
+
+            for attempt in range(BATCH_GET_MAX_RETRIES + 1):
+                response = self.dynamodb.batch_get_item(RequestItems=request)
+                for item in response.get('Responses', {}).get(self.table_name, []):
+                    statuses[item['id']] = item.get('status')
+                request = response.get('UnprocessedKeys') or {}
+                if not request:
+                    break
+                time.sleep(min(2, 0.05 * (2 ** attempt)))
+
+            if request:
+                raise RuntimeError(f"Unprocessed keys remained after {BATCH_GET_MAX_RETRIES} retries")
+
+        return statuses
+
+    def start_workflow(self, application):
+        """
+        Start the screening workflow for one application, named by its ID so a retry cannot start it twice
+        """
+        self.limiter.acquire()
+        try:
+            self.sfn_client.start_execution(
+                stateMachineArn=self.state_machine_arn,
+                name=application['id'],
+                input=json.dumps({
+                    'candidateId': application['id'],
+                    'jobId': application['jobId'],
+                    'resumePath': application['resumeKey']
+                })
+            )
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') != 'ExecutionAlreadyExists':
+                raise
+
+    def process_batch(self, batch, source, upload_pool, start_pool):
+        """
+        Import one batch of (line number, raw line) manifest entries
+        """
+        parsed = []
+        for line_number, line in batch:
+            try:
+                parsed.append((line_number,) + parse_application(line_number, line))
+            except ValueError as e:
+                self.record_failure(line_number, e)
+
+        # Lines already imported by an earlier run are skipped; those whose
+        # workflow may not have started yet are started again by name
+        statuses = self.existing_statuses(list({application['id'] for _, application, _, _ in parsed}))
+        to_write = []
+        to_start = []
+        for line_number, application, resume_path, content_type in parsed:
+            status = statuses.get(application['id'])
+            if application['id'] in statuses:
+                if status == 'SUBMITTED':
+                    to_start.append((line_number, application))
+                    self.counts['resumed'] += 1
+                else:
+                    self.counts['skipped'] += 1
+                continue
+            # Duplicate lines within one batch resolve to the first
+            statuses[application['id']] = None
+            to_write.append((line_number, application, resume_path, content_type))
+
+        uploads = [
+            (line_number, application, upload_pool.submit(
+                source.upload_resume, resume_path, self.resume_bucket, application['resumeKey'], content_type
+            ))
+            for line_number, application, resume_path, content_type in to_write
+        ]
+        uploaded = []
+        for line_number, application, future in uploads:
+            try:
+                self.bytes_uploaded += future.result()
+                uploaded.append((line_number, application))
+            except Exception as e:
+                self.record_failure(line_number, e)
+
+        # batch_writer sends BatchWriteItem requests of 25 and retries unprocessed items
+        with self.table.batch_writer(overwrite_by_pkeys=['id']) as writer:
+            for _, application in uploaded:
+                writer.put_item(Item=self.new_application(application))
+        self.counts['imported'] += len(uploaded)
+        to_start.extend(uploaded)
+
+        starts = [(line_number, start_pool.submit(self.start_workflow, application)) for line_number, application in to_start]
+        for line_number, future in starts:
+            try:
+                future.result()
+            except Exception as e:
+                self.record_failure(line_number, e)
+
+    def report(self, line_number):
+        elapsed = max(time.monotonic() - self.started_at, 1e-6)
+        processed = sum(self.counts.values()) - self.processed_before
+        logger.info(
+            f"Line {line_number}: {self.counts['imported']} imported, {self.counts['resumed']} resumed, "
+            f"{self.counts['skipped']} skipped, {self.counts['failed']} failed "
+            f"({processed / elapsed:.1f} lines/s, {self.bytes_uploaded / elapsed / (1024 * 1024):.2f} MB/s uploaded)"
+        )
+
+    def run(self):
+        start_line = self.load_checkpoint()
+        workdir = tempfile.mkdtemp(prefix='application-import-')
+
+        try:
+            source = DropSource(self.args.source, self.s3_client, workdir)
+            with ThreadPoolExecutor(max_workers=self.args.upload_concurrency) as upload_pool, \
+                    ThreadPoolExecutor(max_workers=self.args.start_concurrency) as start_pool:
+                batch = []
+                for line_number, line in source.lines():
+                    if line_number <= start_line or not line.strip():
+                        continue
+                    batch.append((line_number, line))
+                    if len(batch) >= self.args.batch_size:
+                        self.process_batch(batch, source, upload_pool, start_pool)
+                        self.save_checkpoint(line_number)
+                        self.report(line_number)
+                        batch = []
+
+                if batch:
+                    self.process_batch(batch, source, upload_pool, start_pool)
+                    self.save_checkpoint(line_number)
+                    self.report(line_number)
+        finally:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+        return self.counts['failed'] == 0
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Bulk import applications from a job-board drop')
+    parser.add_argument('source', help='Drop directory, manifest or archive; local path or s3:// URL')
+    parser.add_argument('--checkpoint', help='Checkpoint file (default: derived from the source)')
+    parser.add_argument('--batch-size', type=int, default=500, help='Manifest lines per batch and checkpoint')
+    parser.add_argument('--upload-concurrency', type=int, default=16, help='Concurrent resume uploads')
+    parser.add_argument('--start-concurrency', type=int, default=8, help='Concurrent StartExecution calls')
+    parser.add_argument('--start-rate', type=float, default=25, help='Workflows started per second')
+    parser.add_argument('--resume-bucket', help='Resume bucket (default: from terraform_output.json)')
+    parser.add_argument('--table', help='Candidate table (default: from terraform_output.json)')
+    parser.add_argument('--state-machine-arn', help='Screening workflow ARN (default: from terraform_output.json)')
+    args = parser.parse_args(argv)
+
+    if not args.checkpoint:
+        name = ''.join(c if c.isalnum() or c in '-_.' else '_' for c in args.source.rstrip('/'))
+        args.checkpoint = f".import-{name[-80:]}.checkpoint.json"
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    importer = Importer(args, load_terraform_outputs())
+    if not importer.run():
+        logger.warning(f"Some lines failed; see {args.checkpoint}.failures.jsonl")
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,254 @@
+import os
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, TypedDict
+import boto3
+from botocore.exceptions import ClientError
+
+# Configure logging
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Initialize DynamoDB
+dynamodb = boto3.resource('dynamodb')
+
+# Get environment variables
+DYNAMODB_TABLE = os.environ['DYNAMODB_TABLE']
+candidate_table = dynamodb.Table(DYNAMODB_TABLE)
+
+# Application / candidate statuses in pipeline order
+SUBMITTED = 'SUBMITTED'
+EXTRACTED = 'EXTRACTED'
+SCREENED = 'SCREENED'
+RANKED = 'RANKED'
+PHONE_INTERVIEW_INITIATED = 'PHONE_INTERVIEW_INITIATED'
+PHONE_INTERVIEW_COMPLETED = 'PHONE_INTERVIEW_COMPLETED'
+INTERVIEW_SCHEDULED = 'INTERVIEW_SCHEDULED'
+
+# Statuses a record may be in before moving to each status; None means the
+# record may not exist yet. Extraction needs an application: the S3 upload
+# notification can fire before the application is submitted, and must not
+# create the record the submission then finds already present.
+ALLOWED_TRANSITIONS = {
+    SUBMITTED: [None],
+    EXTRACTED: [SUBMITTED, EXTRACTED],
+    SCREENED: [EXTRACTED, SCREENED, RANKED],
+    RANKED: [SCREENED, RANKED],
+    PHONE_INTERVIEW_INITIATED: [RANKED, PHONE_INTERVIEW_INITIATED],
+    PHONE_INTERVIEW_COMPLETED: [PHONE_INTERVIEW_INITIATED, PHONE_INTERVIEW_COMPLETED],
+    INTERVIEW_SCHEDULED: [PHONE_INTERVIEW_INITIATED, PHONE_INTERVIEW_COMPLETED, INTERVIEW_SCHEDULED]
+}
+
+# Attributes answering "where is this application?" in one read
+STATUS_ATTRIBUTES = ['id', 'jobId', 'status', 'statusVersion', 'submissionDate', 'updatedDate']
+
+class PhoneInterview(TypedDict, total=False):
+    contactId: str
+    scriptKey: str
+    timestamp: int
+    status: str
+    notes: str
+    passed: bool
+
+class Interview(TypedDict, total=False):
+    datetime: str
+    start: str
+    end: str
+    calendarEventId: str
+    invitationSent: bool
+    hiringManager: str
+    technicalStaff: str
+    status: str
+    timestamp: int
+
+class CandidateRecord(TypedDict, total=False):
+    """
+    One item per application in the candidate table, written by the API and
+    every pipeline stage
+    """
+    # Application
+    id: str
+    jobId: str
+    fullName: str
+    email: str
+    phone: str
+    resumeKey: str
+    coverLetter: str
+    linkedIn: str
+    portfolio: str
+    additionalInfo: str
+    timeZone: str
+    submissionDate: str
+
+    # Status, maintained only through this module
+    status: str
+    statusVersion: int
+    updatedDate: str
+
+    # Extraction
+    resumePath: str
+    resumeTextKey: str
+    resumeTextDigest: str
+    resumeTextLength: int
+    timestamp: int
+
+    # Screening and ranking
+    screening: Dict[str, Any]
+    screeningScore: int
+    rankedScore: int
+    isTopCandidate: bool
+
+    # Interviews
+    phoneInterview: PhoneInterview
+    interview: Interview
+
+class StatusTransitionError(ValueError):
+    """
+    Raised when a record is not in a status the requested status may follow
+    """
+    def __init__(self, candidate_id, status):
+        super().__init__(f"Candidate {candidate_id} cannot move to {status} from its current status")
+        self.candidate_id = candidate_id
+        self.status = status
+
+def now_iso():
+    return datetime.now().isoformat()
+
+def _is_conditional_check_failure(error):
+    return error.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException'
+
+def _path(attribute, names):
+    """
+    Expression path for a (possibly dotted) attribute, registering a name placeholder per segment
+    """
+    segments = []
+    for segment in attribute.split('.'):
+        placeholder = f"#n{len(names)}"
+        names[placeholder] = segment
+        segments.append(placeholder)
+    return '.'.join(segments)
+
+def get_record(candidate_id, attributes: Optional[List[str]] = None, consistent=False) -> Optional[CandidateRecord]:
+    """
+    Read a candidate record, optionally only some attributes
+    """
+    params = {'Key': {'id': candidate_id}, 'ConsistentRead': consistent}
+    if attributes:
+        names = {}
+        params['ProjectionExpression'] = ', '.join(_path(attribute, names) for attribute in attributes)
+        params['ExpressionAttributeNames'] = names
+
+    return candidate_table.get_item(**params).get('Item')
+
+def get_status(candidate_id) -> Optional[CandidateRecord]:
+    """
+    Read only the status attributes of a record
+    """
+    return get_record(candidate_id, STATUS_ATTRIBUTES)
+
+def new_application(record: CandidateRecord) -> CandidateRecord:
+    """
+    Copy of an application's fields as a new SUBMITTED record
+    """
+    timestamp = now_iso()
+    return dict(
+        record,
+        status=SUBMITTED,
+        statusVersion=1,
+        submissionDate=timestamp,
+        updatedDate=timestamp
+    )
+
+def create_application(record: CandidateRecord) -> bool:
+    """
+    Create a SUBMITTED record for a new application
+
+    Upserts the application fields, so a record a pipeline stage already
+    created keeps its status and stage fields. Returns False if this
+    application was already submitted.
+    """
+    names = {}
+    values = {}
+    assignments = []
+    for index, (attribute, value) in enumerate(new_application(record).items()):
+        if attribute == 'id':
+            continue
+        path = _path(attribute, names)
+        values[f":v{index}"] = value
+        if attribute in ('status', 'statusVersion'):
+            assignments.append(f"{path} = if_not_exists({path}, :v{index})")
+        else:
+            assignments.append(f"{path} = :v{index}")
+
+    names['#submissionDate'] = 'submissionDate'
+    try:
+        candidate_table.update_item(
+            Key={'id': record['id']},
+            UpdateExpression=f"SET {', '.join(assignments)}",
+            ConditionExpression='attribute_not_exists(#submissionDate)',
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values
+        )
+        return True
+    except ClientError as e:
+        if _is_conditional_check_failure(e):
+            return False
+        raise
+
+def transition_status(candidate_id, status, set_fields: Optional[Dict[str, Any]] = None,
+                      remove_fields: Optional[List[str]] = None,
+                      set_if_missing: Optional[Dict[str, Any]] = None):
+    """
+    Move a record to a new status together with the stage's own fields in one
+    conditional update
+
+    The update only applies if the record's current status is one the new
+    status may follow (ALLOWED_TRANSITIONS). It also maintains updatedDate and
+    increments statusVersion. Dotted field names update nested attributes.
+    Raises StatusTransitionError otherwise.
+    """
+    names = {'#status': 'status'}
+    values = {
+        ':status': status,
+        ':updatedDate': now_iso(),
+        ':one': 1
+    }
+    assignments = ['#status = :status', 'updatedDate = :updatedDate']
+
+    for index, (attribute, value) in enumerate((set_fields or {}).items()):
+        values[f":v{index}"] = value
+        assignments.append(f"{_path(attribute, names)} = :v{index}")
+
+    for index, (attribute, value) in enumerate((set_if_missing or {}).items()):
+        path = _path(attribute, names)
+        values[f":d{index}"] = value
+        assignments.append(f"{path} = if_not_exists({path}, :d{index})")
+
+    update_expression = f"SET {', '.join(assignments)} ADD statusVersion :one"
+    if remove_fields:
+        update_expression += f" REMOVE {', '.join(_path(attribute, names) for attribute in remove_fields)}"
+
+    allowed = ALLOWED_TRANSITIONS[status]
+    conditions = []
+    if None in allowed:
+        conditions.append('attribute_not_exists(#status)')
+    previous = [previous_status for previous_status in allowed if previous_status is not None]
+    if previous:
+        placeholders = []
+        for index, previous_status in enumerate(previous):
+            values[f":from{index}"] = previous_status
+            placeholders.append(f":from{index}")
+        conditions.append(f"#status IN ({', '.join(placeholders)})")
+
+    try:
+        candidate_table.update_item(
+            Key={'id': candidate_id},
+            UpdateExpression=update_expression,
+            ConditionExpression=' OR '.join(conditions),
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values
+        )
+    except ClientError as e:
+        if _is_conditional_check_failure(e):
+            raise StatusTransitionError(candidate_id, status)
+        raise
@@ -0,0 +1,153 @@
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+import boto3
+
+# Configure logging
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Initialize DynamoDB
+dynamodb = boto3.resource('dynamodb')
+
+# Get environment variables
+JOB_TABLE_NAME = os.environ.get('JOB_TABLE_NAME', 'Jobs')
+JOB_CACHE_TTL_SECONDS = int(os.environ.get('JOB_CACHE_TTL_SECONDS', '300'))
+JOB_CACHE_MAX_ENTRIES = int(os.environ.get('JOB_CACHE_MAX_ENTRIES', '256'))
+job_table = dynamodb.Table(JOB_TABLE_NAME)
+
+# Attributes that identify a revision of a job posting; anything that writes a
+# job (e.g. setup_job_data.sh) must set updated_date or bump version on every write
+VERSION_ATTRIBUTES = ['version', 'updated_date', 'posted_date']
+
+DEFAULT_JOB_DESCRIPTION = """
+    Generic Technical Position
+    
+    Responsibilities:
+    - Contribute to technical projects and initiatives
+    - Collaborate with team members and stakeholders
+    - Ensure high-quality deliverables and outcomes
+    
+    Requirements:
+    - Technical degree or equivalent experience
+    - Strong problem-solving skills
+    - Ability to work in a collaborative environment
+    - Good communication skills
+    """
+
+# Per-container LRU cache: job_id -> (description, version, validated_at)
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+def job_version(item):
+    """
+    Return the revision marker of a job item (explicit version, else its dates)
+    """
+    for attribute in VERSION_ATTRIBUTES:
+        if attribute in item:
+            return str(item[attribute])
+    return None
+
+def format_job_description(job):
+    """
+    Render a job item from the jobs table as prompt text
+    """
+    lines = [job.get('title', 'Untitled Position')]
+    
+    details = [job.get(field) for field in ('company', 'location', 'job_type') if job.get(field)]
+    if details:
+        lines.append(' | '.join(details))
+    
+    if job.get('description'):
+        lines.extend(['', job['description']])
+    
+    for heading, field in (('Responsibilities', 'responsibilities'), ('Requirements', 'requirements')):
+        if job.get(field):
+            lines.extend(['', f"{heading}:"])
+            lines.extend(f"- {entry}" for entry in job[field])
+    
+    return "\n".join(lines)
+
+def _store(job_id, description, version):
+    with _cache_lock:
+        _cache[job_id] = (description, version, time.monotonic())
+        _cache.move_to_end(job_id)
+        while len(_cache) > JOB_CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+
+def _fetch(job_id):
+    """
+    Read the full job posting and cache its rendered description
+    """
+    response = job_table.get_item(Key={'id': job_id})
+    item = response.get('Item')
+    
+    if not item:
+        logger.warning(f"Job {job_id} not found, using default job description")
+        description, version = DEFAULT_JOB_DESCRIPTION, None
+    else:
+        description, version = format_job_description(item), job_version(item)
+    
+    _store(job_id, description, version)
+    return description
+
+def _current_version(job_id):
+    """
+    Read only the revision attributes of a job posting
+    """
+    response = job_table.get_item(
+        Key={'id': job_id},
+        ProjectionExpression=', '.join(f"#v{i}" for i in range(len(VERSION_ATTRIBUTES))),
+        ExpressionAttributeNames={f"#v{i}": name for i, name in enumerate(VERSION_ATTRIBUTES)}
+    )
+    item = response.get('Item')
+    return job_version(item) if item else None
+
+def get_job_description(job_id):
+    """
+    Get the job description for a given job ID from the jobs table
+    
+    Warm lookups are served from the container cache. Once an entry is older
+    than the TTL it is revalidated with a small version-only read, and the
+    full posting is re-read only if the version changed.
+    """
+    with _cache_lock:
+        entry = _cache.get(job_id)
+        if entry:
+            _cache.move_to_end(job_id)
+    
+    try:
+        if entry is None:
+            return _fetch(job_id)
+        
+        description, version, validated_at = entry
+        if time.monotonic() - validated_at < JOB_CACHE_TTL_SECONDS:
+            return description
+        
+        if _current_version(job_id) == version and version is not None:
+            _store(job_id, description, version)
+            return description
+        
+        return _fetch(job_id)
+    
+    except Exception as e:
+        logger.error(f"Error retrieving job description for {job_id}: {str(e)}")
+        return entry[0] if entry else DEFAULT_JOB_DESCRIPTION
+
+def seed_job_description(job_id, description, version=None):
+    """
+    Put a job description into the cache directly (used for offline runs)
+    """
+    _store(job_id, description, version)
+
+def invalidate_job_description(job_id=None):
+    """
+    Drop one cached job description, or the whole cache
+    """
+    with _cache_lock:
+        if job_id is None:
+            _cache.clear()
+        else:
+            _cache.pop(job_id, None)
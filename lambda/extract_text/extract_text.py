@@ -1,9 +1,24 @@
+import io
+import gzip
 import json
 import boto3
+import hashlib
 import os
+import re
 import uuid
+import zipfile
+import time
+import random
 import logging
 from urllib.parse import unquote_plus
+from xml.etree import ElementTree
+from candidate_records import EXTRACTED, StatusTransitionError, transition_status
+
+try:
+    from pypdf import PdfReader, PdfWriter
+except ImportError:
+    PdfReader = None
+    PdfWriter = None
 
 # Configure logging
 logger = logging.getLogger()
@@ -16,12 +31,340 @@ dynamodb = boto3.resource('dynamodb')
 
 # Get environment variables
 RESUME_BUCKET = os.environ['RESUME_BUCKET']
-DYNAMODB_TABLE = os.environ['DYNAMODB_TABLE']
-candidate_table = dynamodb.Table(DYNAMODB_TABLE)
 
-def extract_text_from_document(bucket, document_key):
+# Optional SNS completion channel for Textract jobs
+TEXTRACT_SNS_TOPIC_ARN = os.environ.get('TEXTRACT_SNS_TOPIC_ARN')
+TEXTRACT_ROLE_ARN = os.environ.get('TEXTRACT_ROLE_ARN')
+
+# Polling configuration for Textract jobs
+INLINE_POLL_SECONDS = float(os.environ.get('INLINE_POLL_SECONDS', '10'))
+POLL_INITIAL_DELAY_SECONDS = 0.5
+POLL_MAX_DELAY_SECONDS = 8
+MAX_POLL_ATTEMPTS = int(os.environ.get('MAX_POLL_ATTEMPTS', '30'))
+HANDOFF_MARGIN_SECONDS = 5
+
+# Local extraction configuration
+LOCAL_EXTRACTION_MAX_BYTES = int(os.environ.get('LOCAL_EXTRACTION_MAX_BYTES', str(10 * 1024 * 1024)))
+MIN_PAGE_TEXT_CHARS = int(os.environ.get('MIN_PAGE_TEXT_CHARS', '20'))
+WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+# Extracted text is stored as a compressed S3 object, keyed by its digest
+RESUME_TEXT_PREFIX = 'resume-text/'
+
+# Content-addressed extraction cache (disabled when no table is configured)
+EXTRACTION_CACHE_TABLE = os.environ.get('EXTRACTION_CACHE_TABLE')
+EXTRACTION_CACHE_TTL_DAYS = int(os.environ.get('EXTRACTION_CACHE_TTL_DAYS', '30'))
+EXTRACTION_CACHE_MAX_TEXT_BYTES = 350 * 1024
+extraction_cache_table = dynamodb.Table(EXTRACTION_CACHE_TABLE) if EXTRACTION_CACHE_TABLE else None
+METRICS_NAMESPACE = 'ResumeScreening'
+
+def parse_resume_key(key):
+    """
+    Derive the job ID and candidate ID from a resume object key
+    """
+    # Assuming path pattern: resumes/{job_id}/{candidate_id}.pdf
+    path_parts = key.split('/')
+    if len(path_parts) >= 3 and path_parts[0] == 'resumes':
+        job_id = path_parts[1]
+        candidate_id = path_parts[2].split('.')[0]
+    else:
+        # Generate IDs if path pattern doesn't match
+        job_id = 'default-job'
+        candidate_id = str(uuid.uuid4())
+    
+    return job_id, candidate_id
+
+def next_poll_delay(attempt):
+    """
+    Exponential backoff delay (with jitter) before the given poll attempt
+    """
+    delay = min(POLL_MAX_DELAY_SECONDS, POLL_INITIAL_DELAY_SECONDS * (2 ** attempt))
+    return round(random.uniform(delay / 2, delay), 2)
+
+def start_text_detection(bucket, document_key, notify=False, content_digest=None):
+    """
+    Start an asynchronous Textract text detection job and return its job ID
+    
+    When notify is set and a completion topic is configured, Textract publishes
+    the job status to SNS and the continuation handler picks up the results.
+    """
+    params = {
+        'DocumentLocation': {
+            'S3Object': {
+                'Bucket': bucket,
+                'Name': document_key
+            }
+        }
+    }
+    
+    # The digest comes back in the completion notification so the result can be cached
+    if content_digest:
+        params['JobTag'] = content_digest
+    
+    if notify and TEXTRACT_SNS_TOPIC_ARN and TEXTRACT_ROLE_ARN:
+        params['NotificationChannel'] = {
+            'SNSTopicArn': TEXTRACT_SNS_TOPIC_ARN,
+            'RoleArn': TEXTRACT_ROLE_ARN
+        }
+    
+    response = textract_client.start_document_text_detection(**params)
+    return response['JobId']
+
+def collect_text_detection_results(textract_job_id, response):
+    """
+    Collect the LINE blocks of a finished Textract job, following NextToken pages
+    """
+    lines = []
+    while True:
+        for item in response['Blocks']:
+            if item['BlockType'] == 'LINE':
+                lines.append(item['Text'] + "\n")
+        
+        next_token = response.get('NextToken', None)
+        if not next_token:
+            break
+        
+        response = textract_client.get_document_text_detection(
+            JobId=textract_job_id,
+            NextToken=next_token
+        )
+    
+    return "".join(lines)
+
+def check_text_detection(textract_job_id):
+    """
+    Check a Textract job once
+    Returns the extracted text if the job has finished, or None if it is still running
+    """
+    response = textract_client.get_document_text_detection(JobId=textract_job_id)
+    status = response['JobStatus']
+    
+    if status == 'SUCCEEDED':
+        return collect_text_detection_results(textract_job_id, response)
+    
+    if status == 'FAILED':
+        raise ValueError(f"Textract job {textract_job_id} failed: {response.get('StatusMessage', 'unknown error')}")
+    
+    return None
+
+def poll_text_detection(textract_job_id, max_wait_seconds):
+    """
+    Poll a Textract job with exponential backoff for at most max_wait_seconds
+    Returns the extracted text, or None if the job is still running when the budget runs out
+    """
+    deadline = time.monotonic() + max_wait_seconds
+    attempt = 0
+    
+    while True:
+        delay = next_poll_delay(attempt)
+        if time.monotonic() + delay > deadline:
+            return None
+        
+        time.sleep(delay)
+        attempt += 1
+        
+        text = check_text_detection(textract_job_id)
+        if text is not None:
+            logger.info(f"Textract job {textract_job_id} finished after {attempt} polls")
+            return text
+
+def inline_poll_budget(context):
+    """
+    Seconds this invocation may spend polling Textract before handing off
+    """
+    if context is None or not hasattr(context, 'get_remaining_time_in_millis'):
+        return INLINE_POLL_SECONDS
+    
+    remaining = context.get_remaining_time_in_millis() / 1000.0 - HANDOFF_MARGIN_SECONDS
+    return max(0, min(INLINE_POLL_SECONDS, remaining))
+
+def read_document_bytes(bucket, document_key):
+    """
+    Read a document from S3 and compute the SHA-256 digest of its bytes
+    
+    Returns a tuple of (document_bytes, content_digest). The bytes are None if
+    the object is too large to parse in memory; it is then hashed as a stream.
+    """
+    response = s3_client.get_object(Bucket=bucket, Key=document_key)
+    if response.get('ContentLength', 0) > LOCAL_EXTRACTION_MAX_BYTES:
+        digest = hashlib.sha256()
+        for chunk in response['Body'].iter_chunks(chunk_size=1024 * 1024):
+            digest.update(chunk)
+        return None, digest.hexdigest()
+    
+    document_bytes = response['Body'].read()
+    return document_bytes, hashlib.sha256(document_bytes).hexdigest()
+
+def report_cache_lookup(hit):
+    """
+    Emit an extraction cache hit/miss as a CloudWatch embedded metric
+    """
+    print(json.dumps({
+        '_aws': {
+            'Timestamp': int(time.time() * 1000),
+            'CloudWatchMetrics': [{
+                'Namespace': METRICS_NAMESPACE,
+                'Dimensions': [['Function']],
+                'Metrics': [
+                    {'Name': 'ExtractionCacheHit', 'Unit': 'Count'},
+                    {'Name': 'ExtractionCacheMiss', 'Unit': 'Count'}
+                ]
+            }]
+        },
+        'Function': 'ExtractText',
+        'ExtractionCacheHit': 1 if hit else 0,
+        'ExtractionCacheMiss': 0 if hit else 1
+    }))
+
+def get_cached_text(content_digest):
+    """
+    Look up previously extracted text by content digest
+    """
+    if extraction_cache_table is None or not content_digest:
+        return None
+    
+    try:
+        response = extraction_cache_table.get_item(
+            Key={'contentDigest': content_digest}
+        )
+        item = response.get('Item')
+        
+        # DynamoDB TTL deletion is lazy, so expired items can still be returned
+        if item and int(item.get('expiresAt', 0)) > time.time():
+            report_cache_lookup(True)
+            logger.info(f"Extraction cache hit for {content_digest}")
+            return item['resumeText']
+    
+    except Exception as e:
+        logger.warning(f"Error reading extraction cache: {str(e)}")
+    
+    report_cache_lookup(False)
+    return None
+
+def put_cached_text(content_digest, text_content):
+    """
+    Store extracted text under its content digest with a TTL
+    """
+    if extraction_cache_table is None or not content_digest or text_content is None:
+        return
+    
+    if len(text_content.encode('utf-8')) > EXTRACTION_CACHE_MAX_TEXT_BYTES:
+        logger.info(f"Extracted text for {content_digest} is too large to cache")
+        return
+    
+    try:
+        extraction_cache_table.put_item(
+            Item={
+                'contentDigest': content_digest,
+                'resumeText': text_content,
+                'createdAt': int(time.time()),
+                'expiresAt': int(time.time()) + EXTRACTION_CACHE_TTL_DAYS * 86400
+            }
+        )
+    except Exception as e:
+        logger.warning(f"Error writing extraction cache: {str(e)}")
+
+def extract_docx_text(document_bytes):
+    """
+    Extract paragraph text from the XML parts of a DOCX file
+    """
+    with zipfile.ZipFile(io.BytesIO(document_bytes)) as archive:
+        root = ElementTree.fromstring(archive.read('word/document.xml'))
+    
+    paragraphs = []
+    for paragraph in root.iter(f'{WORD_NAMESPACE}p'):
+        parts = []
+        for node in paragraph.iter():
+            if node.tag == f'{WORD_NAMESPACE}t' and node.text:
+                parts.append(node.text)
+            elif node.tag == f'{WORD_NAMESPACE}tab':
+                parts.append('\t')
+            elif node.tag in (f'{WORD_NAMESPACE}br', f'{WORD_NAMESPACE}cr'):
+                parts.append('\n')
+        
+        text = ''.join(parts).strip()
+        if text:
+            paragraphs.append(text)
+    
+    return "\n".join(paragraphs) + "\n" if paragraphs else ""
+
+def detect_page_text(page):
+    """
+    Run synchronous Textract OCR on a single image-only PDF page
+    """
+    writer = PdfWriter()
+    writer.add_page(page)
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    
+    response = textract_client.detect_document_text(
+        Document={'Bytes': buffer.getvalue()}
+    )
+    
+    return "".join(
+        item['Text'] + "\n" for item in response['Blocks'] if item['BlockType'] == 'LINE'
+    )
+
+def extract_pdf_text(document_bytes):
+    """
+    Extract the text layer of a PDF page by page
+    
+    Pages without a usable text layer are sent individually to synchronous
+    Textract OCR. Returns None if no page has a text layer, so the caller can
+    fall back to the asynchronous Textract job for fully scanned documents.
+    """
+    reader = PdfReader(io.BytesIO(document_bytes))
+    page_texts = []
+    scanned_pages = []
+    
+    for index, page in enumerate(reader.pages):
+        text = re.sub(r'[ \t]+\n', '\n', page.extract_text() or '').strip()
+        if len(text) < MIN_PAGE_TEXT_CHARS:
+            scanned_pages.append(index)
+            page_texts.append(None)
+        else:
+            page_texts.append(text + "\n")
+    
+    if len(scanned_pages) == len(page_texts):
+        return None
+    
+    for index in scanned_pages:
+        page_texts[index] = detect_page_text(reader.pages[index])
+    
+    logger.info(
+        f"Extracted {len(page_texts) - len(scanned_pages)} PDF pages locally, "
+        f"{len(scanned_pages)} with Textract OCR"
+    )
+    return "".join(page_texts)
+
+def extract_text_locally(document_bytes, document_key, file_extension):
     """
-    Use Amazon Textract to extract text from a document stored in S3
+    Fast path: parse the PDF text layer or the DOCX XML in-process
+    Returns None when the document has to go through asynchronous Textract
+    """
+    if document_bytes is None or (file_extension == 'pdf' and PdfReader is None):
+        return None
+    
+    try:
+        if file_extension == 'docx':
+            return extract_docx_text(document_bytes)
+        
+        return extract_pdf_text(document_bytes)
+    
+    except Exception as e:
+        logger.warning(f"Local extraction failed for {document_key}, falling back to Textract: {str(e)}")
+        return None
+
+def extract_text_from_document(bucket, document_key, max_wait_seconds=INLINE_POLL_SECONDS, notify=False):
+    """
+    Extract text from a document stored in S3
+    
+    Identical files are served from the content-addressed extraction cache.
+    Born-digital PDFs and DOCX files are parsed in-process; scanned documents
+    go through Amazon Textract. Returns a tuple of (text, textract_job_id,
+    content_digest). The text is None when the Textract job did not finish
+    within max_wait_seconds; the caller then hands the job ID to the
+    completion handler or the Step Functions poll loop instead of blocking.
     """
     logger.info(f"Extracting text from {document_key}")
     
@@ -29,45 +372,29 @@ def extract_text_from_document(bucket, document_key):
     file_extension = document_key.lower().split('.')[-1]
     
     try:
-        if file_extension in ['pdf', 'doc', 'docx']:
-            # Use Textract to extract text from document
-            response = textract_client.start_document_text_detection(
-                DocumentLocation={
-                    'S3Object': {
-                        'Bucket': bucket,
-                        'Name': document_key
-                    }
-                }
+        if file_extension in ['pdf', 'docx']:
+            document_bytes, content_digest = read_document_bytes(bucket, document_key)
+            
+            text = get_cached_text(content_digest)
+            if text is not None:
+                return text, None, content_digest
+            
+            text = extract_text_locally(document_bytes, document_key, file_extension)
+            if text is not None:
+                put_cached_text(content_digest, text)
+                return text, None, content_digest
+            
+            textract_job_id = start_text_detection(
+                bucket, document_key, notify=notify, content_digest=content_digest
             )
-            job_id = response['JobId']
             
-            # Wait for the job to complete
-            while True:
-                response = textract_client.get_document_text_detection(JobId=job_id)
-                status = response['JobStatus']
-                if status in ['SUCCEEDED', 'FAILED']:
-                    break
-                
-            # If job succeeded, extract the text
-            if status == 'SUCCEEDED':
-                text = ""
-                for item in response['Blocks']:
-                    if item['BlockType'] == 'LINE':
-                        text += item['Text'] + "\n"
-                
-                # Get all pages if there are more
-                next_token = response.get('NextToken', None)
-                while next_token:
-                    response = textract_client.get_document_text_detection(
-                        JobId=job_id,
-                        NextToken=next_token
-                    )
-                    for item in response['Blocks']:
-                        if item['BlockType'] == 'LINE':
-                            text += item['Text'] + "\n"
-                    next_token = response.get('NextToken', None)
-                
-                return text
+            # With a completion topic there is nothing to wait for
+            if notify and TEXTRACT_SNS_TOPIC_ARN and TEXTRACT_ROLE_ARN:
+                return None, textract_job_id, content_digest
+            
+            text = poll_text_detection(textract_job_id, max_wait_seconds)
+            put_cached_text(content_digest, text)
+            return text, textract_job_id, content_digest
         else:
             # For other file types, handle accordingly or raise an error
             raise ValueError(f"Unsupported file type: {file_extension}")
@@ -76,35 +403,135 @@ def extract_text_from_document(bucket, document_key):
         logger.error(f"Error extracting text from document: {str(e)}")
         raise
 
+def store_resume_text(text_content):
+    """
+    Write extracted text to S3 as a gzip object keyed by the text's SHA-256
+    Returns a tuple of (text_key, text_digest)
+    """
+    text_bytes = text_content.encode('utf-8')
+    text_digest = hashlib.sha256(text_bytes).hexdigest()
+    text_key = f"{RESUME_TEXT_PREFIX}{text_digest}.txt.gz"
+    
+    s3_client.put_object(
+        Bucket=RESUME_BUCKET,
+        Key=text_key,
+        Body=gzip.compress(text_bytes),
+        ContentType='text/plain; charset=utf-8',
+        ContentEncoding='gzip'
+    )
+    
+    return text_key, text_digest
+
 def store_resume_data(candidate_id, job_id, text_content, file_path):
     """
     Store extracted resume data in DynamoDB
+    
+    The text itself goes to S3; the item only keeps a pointer and digest. A
+    single conditional status transition creates or refreshes the record, and
+    an existing timestamp is preserved server-side with if_not_exists.
     """
     try:
-        item = {
-            'id': candidate_id,
-            'jobId': job_id,
-            'resumeText': text_content,
-            'resumePath': file_path,
-            'status': 'EXTRACTED',
-            'timestamp': int(boto3.client('dynamodb').get_item(
-                TableName='candidate-tracking',
-                Key={'id': {'S': candidate_id}}
-            ).get('Item', {}).get('timestamp', {'N': '0'}).get('N', '0')) or int(boto3.client('dynamodb').get_item(
-                TableName='candidate-tracking',
-                Key={'id': {'S': candidate_id}}
-            ).get('Item', {}).get('timestamp', {'N': '0'}).get('N', '0'))
-        }
+        text_key, text_digest = store_resume_text(text_content)
         
-        # Store in DynamoDB
-        candidate_table.put_item(Item=item)
+        transition_status(
+            candidate_id,
+            EXTRACTED,
+            set_fields={
+                'jobId': job_id,
+                'resumeTextKey': text_key,
+                'resumeTextDigest': text_digest,
+                'resumeTextLength': len(text_content),
+                'resumePath': file_path
+            },
+            remove_fields=['resumeText'],
+            set_if_missing={'timestamp': int(time.time())}
+        )
         logger.info(f"Stored resume data for candidate {candidate_id}")
         return True
     
+    except StatusTransitionError:
+        # An S3 notification for a resume whose application is not submitted yet
+        # (the workflow started on submission extracts it), or a repeated
+        # extraction after the candidate moved on
+        logger.info(f"Candidate {candidate_id} has no submitted application or is past extraction, not storing resume data")
+        return True
+    
     except Exception as e:
         logger.error(f"Error storing resume data: {str(e)}")
         return False
 
+def extraction_pending_response(candidate_id, job_id, resume_path, textract_job_id, content_digest=None, poll_attempt=0):
+    """
+    Build the response returned while a Textract job is still running
+    
+    It carries the resume's key, so the wait loop's checks do not depend on
+    the execution input.
+    """
+    return {
+        'statusCode': 202,
+        'candidateId': candidate_id,
+        'jobId': job_id,
+        'resumePath': resume_path,
+        'textExtracted': False,
+        'extractionPending': True,
+        'textractJobId': textract_job_id,
+        'contentDigest': content_digest,
+        'pollAttempt': poll_attempt,
+        'pollDelaySeconds': max(1, int(next_poll_delay(poll_attempt + 2)))
+    }
+
+def handle_textract_completion(record):
+    """
+    Continuation handler for Textract completion notifications delivered via SNS
+    """
+    message = json.loads(record['Sns']['Message'])
+    textract_job_id = message['JobId']
+    location = message.get('DocumentLocation', {})
+    key = location.get('S3ObjectName', '')
+    job_id, candidate_id = parse_resume_key(key)
+    
+    if message.get('Status') != 'SUCCEEDED':
+        raise ValueError(f"Textract job {textract_job_id} for {key} finished with status {message.get('Status')}")
+    
+    text_content = check_text_detection(textract_job_id)
+    put_cached_text(message.get('JobTag'), text_content)
+    store_resume_data(candidate_id, job_id, text_content, key)
+    
+    return {
+        'statusCode': 200,
+        'candidateId': candidate_id,
+        'jobId': job_id,
+        'textExtracted': True
+    }
+
+def check_extraction(event):
+    """
+    Single non-blocking status check, driven by the Step Functions wait loop
+    """
+    candidate_id = event['candidateId']
+    job_id = event['jobId']
+    textract_job_id = event['textractJobId']
+    content_digest = event.get('contentDigest')
+    poll_attempt = int(event.get('pollAttempt', 0)) + 1
+    file_path = event.get('resumePath', f"resumes/{job_id}/{candidate_id}.pdf")
+    
+    text_content = check_text_detection(textract_job_id)
+    if text_content is None:
+        if poll_attempt >= MAX_POLL_ATTEMPTS:
+            raise ValueError(f"Textract job {textract_job_id} did not finish after {poll_attempt} checks")
+        return extraction_pending_response(candidate_id, job_id, file_path, textract_job_id, content_digest, poll_attempt)
+    
+    put_cached_text(content_digest, text_content)
+    store_resume_data(candidate_id, job_id, text_content, file_path)
+    
+    return {
+        'statusCode': 200,
+        'candidateId': candidate_id,
+        'jobId': job_id,
+        'textExtracted': True,
+        'extractionPending': False
+    }
+
 def lambda_handler(event, context):
     """
     Lambda handler for extracting text from resumes
@@ -112,24 +539,30 @@ def lambda_handler(event, context):
     logger.info(f"Received event: {json.dumps(event)}")
     
     try:
+        records = event.get('Records') or [{}]
+        
+        # If event is a Textract completion notification
+        if records[0].get('EventSource') == 'aws:sns':
+            return handle_textract_completion(records[0])
+        
+        # If event is a poll from the Step Functions wait loop
+        elif event.get('action') == 'check_extraction':
+            return check_extraction(event)
+        
         # If event is from S3
-        if 'Records' in event and event['Records'][0]['eventSource'] == 'aws:s3':
-            bucket = event['Records'][0]['s3']['bucket']['name']
-            key = unquote_plus(event['Records'][0]['s3']['object']['key'])
+        elif records[0].get('eventSource') == 'aws:s3':
+            bucket = records[0]['s3']['bucket']['name']
+            key = unquote_plus(records[0]['s3']['object']['key'])
             
             # Extract candidate ID and job ID from file path
-            # Assuming path pattern: resumes/{job_id}/{candidate_id}.pdf
-            path_parts = key.split('/')
-            if len(path_parts) >= 3 and path_parts[0] == 'resumes':
-                job_id = path_parts[1]
-                candidate_id = path_parts[2].split('.')[0]
-            else:
-                # Generate IDs if path pattern doesn't match
-                job_id = 'default-job'
-                candidate_id = str(uuid.uuid4())
+            job_id, candidate_id = parse_resume_key(key)
             
-            # Extract text from the document
-            text_content = extract_text_from_document(bucket, key)
+            # Start extraction; the SNS continuation stores the text when it is ready
+            text_content, textract_job_id, content_digest = extract_text_from_document(
+                bucket, key, max_wait_seconds=inline_poll_budget(context), notify=True
+            )
+            if text_content is None:
+                return extraction_pending_response(candidate_id, job_id, key, textract_job_id, content_digest)
             
             # Store the extracted text in DynamoDB
             store_resume_data(candidate_id, job_id, text_content, key)
@@ -145,10 +578,14 @@ def lambda_handler(event, context):
         elif 'candidateId' in event and 'jobId' in event:
             candidate_id = event['candidateId']
             job_id = event['jobId']
-            file_path = f"resumes/{job_id}/{candidate_id}.pdf"
+            file_path = event.get('resumePath', f"resumes/{job_id}/{candidate_id}.pdf")
             
-            # Extract text from the document
-            text_content = extract_text_from_document(RESUME_BUCKET, file_path)
+            # Extract text from the document, handing long jobs to the wait loop
+            text_content, textract_job_id, content_digest = extract_text_from_document(
+                RESUME_BUCKET, file_path, max_wait_seconds=inline_poll_budget(context)
+            )
+            if text_content is None:
+                return extraction_pending_response(candidate_id, job_id, file_path, textract_job_id, content_digest)
             
             # Store the extracted text in DynamoDB
             store_resume_data(candidate_id, job_id, text_content, file_path)
@@ -157,7 +594,8 @@ def lambda_handler(event, context):
                 'statusCode': 200,
                 'candidateId': candidate_id,
                 'jobId': job_id,
-                'textExtracted': True
+                'textExtracted': True,
+                'extractionPending': False
             }
         
         else:
@@ -169,4 +607,4 @@ def lambda_handler(event, context):
             'statusCode': 500,
             'error': str(e),
             'textExtracted': False
-        }
\ No newline at end of file
+        }
@@ -3,8 +3,23 @@ import boto3
 import os
 import logging
 import time
+import gzip
+import pytz
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime
 from decimal import Decimal
-import uuid
+from boto3.dynamodb.conditions import Attr, Key
+from botocore.exceptions import ClientError
+from job_descriptions import get_job_description
+from candidate_records import (
+    PHONE_INTERVIEW_INITIATED,
+    PHONE_INTERVIEW_COMPLETED,
+    StatusTransitionError,
+    get_record,
+    transition_status
+)
 
 # Configure logging
 logger = logging.getLogger()
@@ -13,14 +28,63 @@ logger.setLevel(logging.INFO)
 # Initialize AWS clients
 connect = boto3.client('connect')
 bedrock = boto3.client('bedrock-runtime')
+sfn_client = boto3.client('stepfunctions')
+s3_client = boto3.client('s3')
 dynamodb = boto3.resource('dynamodb')
 
 # Get environment variables
 CONNECT_INSTANCE_ID = os.environ['CONNECT_INSTANCE_ID']
 CONNECT_CONTACT_FLOW_ID = os.environ['CONNECT_CONTACT_FLOW_ID']
 BEDROCK_MODEL_ID = os.environ['BEDROCK_MODEL_ID']
-DYNAMODB_TABLE = os.environ['DYNAMODB_TABLE']
-candidate_table = dynamodb.Table(DYNAMODB_TABLE)
+RESUME_BUCKET = os.environ['RESUME_BUCKET']
+
+# Scripts are stored once as gzip objects keyed by their SHA-256; the queue,
+# the candidate record and the contact flow only carry the key, and the flow
+# reads the script back in segments it can speak one at a time
+INTERVIEW_SCRIPT_PREFIX = 'interview-scripts/'
+SCRIPT_KEY_ATTRIBUTE = 'interviewScriptKey'
+SCRIPT_SEGMENT_CHARS = int(os.environ.get('SCRIPT_SEGMENT_CHARS', '2500'))
+SEGMENT_CACHE_MAX_ENTRIES = 32
+_segment_cache = OrderedDict()
+_segment_cache_lock = threading.Lock()
+
+# Correlation records link an outbound contact to the waiting workflow
+PHONE_INTERVIEW_CONTACTS_TABLE = os.environ['PHONE_INTERVIEW_CONTACTS_TABLE']
+PHONE_INTERVIEW_TIMEOUT_SECONDS = int(os.environ.get('PHONE_INTERVIEW_TIMEOUT_SECONDS', '3600'))
+CORRELATION_TTL_MARGIN_SECONDS = 24 * 60 * 60
+contacts_table = dynamodb.Table(PHONE_INTERVIEW_CONTACTS_TABLE)
+
+# Contact attributes the interview contact flow sets with its outcome
+RESULT_PASSED_ATTRIBUTE = 'interviewPassed'
+RESULT_NOTES_ATTRIBUTE = 'interviewNotes'
+
+# Phone screens wait in a queue until the dispatcher places them within the
+# concurrency and rate budget and the candidate's local calling window
+PHONE_SCREEN_QUEUE_TABLE = os.environ['PHONE_SCREEN_QUEUE_TABLE']
+MAX_CONCURRENT_CALLS = int(os.environ.get('MAX_CONCURRENT_CALLS', '10'))
+CALLS_PER_MINUTE = int(os.environ.get('CALLS_PER_MINUTE', '20'))
+MAX_CALL_SECONDS = int(os.environ.get('MAX_CALL_SECONDS', '3600'))
+CALLING_WINDOW_START_HOUR = int(os.environ.get('CALLING_WINDOW_START_HOUR', '9'))
+CALLING_WINDOW_END_HOUR = int(os.environ.get('CALLING_WINDOW_END_HOUR', '18'))
+DEFAULT_CANDIDATE_TIMEZONE = os.environ.get('DEFAULT_CANDIDATE_TIMEZONE', 'UTC')
+DISPATCH_SCAN_LIMIT = int(os.environ.get('DISPATCH_SCAN_LIMIT', '500'))
+queue_table = dynamodb.Table(PHONE_SCREEN_QUEUE_TABLE)
+
+QUEUE_PENDING = 'PENDING'
+QUEUE_CALLING = 'CALLING'
+MAX_PRIORITY_SCORE = 1000000
+
+# Connect errors that mean "not now" rather than "never"
+CONNECT_THROTTLING_ERRORS = {'ThrottlingException', 'LimitExceededException', 'ServiceQuotaExceededException'}
+METRICS_NAMESPACE = 'ResumeScreening'
+
+# Interview script templates, shared by candidates for the same job with the
+# same skill profile; only the candidate slots are filled per call
+SCRIPT_CACHE_TTL_SECONDS = int(os.environ.get('SCRIPT_CACHE_TTL_SECONDS', '3600'))
+SCRIPT_CACHE_MAX_ENTRIES = int(os.environ.get('SCRIPT_CACHE_MAX_ENTRIES', '256'))
+CANDIDATE_NAME_SLOT = '{{CANDIDATE_NAME}}'
+_script_cache = OrderedDict()
+_script_cache_lock = threading.Lock()
 
 # JSON helper class for Decimal types
 class DecimalEncoder(json.JSONEncoder):
@@ -34,43 +98,95 @@ def get_candidate_data(candidate_id):
     Retrieve candidate data from DynamoDB
     """
     try:
-        response = candidate_table.get_item(
-            Key={'id': candidate_id}
-        )
+        record = get_record(candidate_id)
         
-        if 'Item' not in response:
+        if record is None:
             logger.error(f"No data found for candidate {candidate_id}")
             return None
         
-        return response['Item']
+        return record
     
     except Exception as e:
         logger.error(f"Error retrieving candidate data: {str(e)}")
         return None
 
-def generate_interview_script(candidate_data, job_id):
+def normalize_skills(skills):
     """
-    Use Amazon Bedrock to generate a personalized interview script
+    Case- and whitespace-insensitive, de-duplicated, sorted skill list
     """
-    try:
-        # Get job description
-        job_description = get_job_description(job_id)
-        
-        # Get candidate information
-        candidate_name = candidate_data.get('name', 'Candidate')
-        screening_results = candidate_data.get('screening', {})
-        matching_skills = screening_results.get('matching_skills', [])
-        missing_skills = screening_results.get('missing_skills', [])
-        
-        # Construct the prompt for Bedrock
-        prompt = f"""
+    return sorted({' '.join(str(skill).lower().split()) for skill in skills or [] if str(skill).strip()})
+
+def skill_signature(matching_skills, missing_skills):
+    """
+    Stable digest of a candidate's skill profile for the script template cache
+    """
+    profile = json.dumps([normalize_skills(matching_skills), normalize_skills(missing_skills)])
+    return hashlib.sha256(profile.encode('utf-8')).hexdigest()[:32]
+
+def get_cached_script_template(cache_key):
+    """
+    Return a cached script template if it is still fresh
+    """
+    with _script_cache_lock:
+        entry = _script_cache.get(cache_key)
+        if entry is None:
+            return None
+        if entry['expires_at'] <= time.monotonic():
+            del _script_cache[cache_key]
+            return None
+        _script_cache.move_to_end(cache_key)
+        return entry['template']
+
+def cache_script_template(cache_key, template):
+    with _script_cache_lock:
+        _script_cache[cache_key] = {
+            'template': template,
+            'expires_at': time.monotonic() + SCRIPT_CACHE_TTL_SECONDS
+        }
+        _script_cache.move_to_end(cache_key)
+        while len(_script_cache) > SCRIPT_CACHE_MAX_ENTRIES:
+            _script_cache.popitem(last=False)
+
+def report_script_cache_lookup(hit):
+    """
+    Emit a script template cache hit/miss as a CloudWatch embedded metric
+    """
+    print(json.dumps({
+        '_aws': {
+            'Timestamp': int(time.time() * 1000),
+            'CloudWatchMetrics': [{
+                'Namespace': METRICS_NAMESPACE,
+                'Dimensions': [['Function']],
+                'Metrics': [
+                    {'Name': 'ScriptCacheHit', 'Unit': 'Count'},
+                    {'Name': 'ScriptCacheMiss', 'Unit': 'Count'}
+                ]
+            }]
+        },
+        'Function': 'PhoneInterview',
+        'ScriptCacheHit': 1 if hit else 0,
+        'ScriptCacheMiss': 0 if hit else 1
+    }))
+
+def generate_script_template(job_id, matching_skills, missing_skills):
+    """
+    Use Amazon Bedrock to generate an interview script template for a job and skill profile
+    
+    The candidate's name is left as CANDIDATE_NAME_SLOT so one template
+    serves every candidate with the same profile.
+    """
+    # Get job description
+    job_description = get_job_description(job_id)
+    
+    # Construct the prompt for Bedrock
+    prompt = f"""
         You are an AI assistant for a recruiting team. Your task is to create a phone interview script for a candidate.
         
         JOB DESCRIPTION:
         {job_description}
         
         CANDIDATE INFORMATION:
-        Name: {candidate_name}
+        Name: {CANDIDATE_NAME_SLOT}
         Matching Skills: {', '.join(matching_skills)}
         Skills to Validate: {', '.join(missing_skills)}
         
@@ -84,75 +200,145 @@ def generate_interview_script(candidate_data, job_id):
         6. A conclusion explaining next steps
         
         The script should be conversational, professional, and designed to be read by a voice assistant during a phone call.
+        Wherever the script uses the candidate's name, write exactly {CANDIDATE_NAME_SLOT}; it is filled in before the call.
         """
+    
+    # Call Bedrock with the prompt
+    response = bedrock.invoke_model(
+        modelId=BEDROCK_MODEL_ID,
+        body=json.dumps({
+            "anthropic_version": "bedrock-2023-05-31",
+            "max_tokens": 2000,
+            "temperature": 0.7,
+            "messages": [
+                {
+                    "role": "user", 
+                    "content": prompt
+                }
+            ]
+        })
+    )
+    
+    # Parse the response
+    response_body = json.loads(response['body'].read().decode('utf-8'))
+    return response_body['content'][0]['text']
+
+def generate_interview_script(candidate_data, job_id):
+    """
+    Personalized interview script for a candidate, from the cached template
+    for the job and the candidate's skill profile when there is one
+    """
+    try:
+        # Get candidate information
+        candidate_name = candidate_data.get('fullName') or candidate_data.get('name') or 'Candidate'
+        screening_results = candidate_data.get('screening', {})
+        matching_skills = normalize_skills(screening_results.get('matching_skills', []))
+        missing_skills = normalize_skills(screening_results.get('missing_skills', []))
         
-        # Call Bedrock with the prompt
-        response = bedrock.invoke_model(
-            modelId=BEDROCK_MODEL_ID,
-            body=json.dumps({
-                "anthropic_version": "bedrock-2023-05-31",
-                "max_tokens": 2000,
-                "temperature": 0.7,
-                "messages": [
-                    {
-                        "role": "user", 
-                        "content": prompt
-                    }
-                ]
-            })
-        )
-        
-        # Parse the response
-        response_body = json.loads(response['body'].read().decode('utf-8'))
-        interview_script = response_body['content'][0]['text']
+        cache_key = (job_id, skill_signature(matching_skills, missing_skills))
+        template = get_cached_script_template(cache_key)
+        report_script_cache_lookup(template is not None)
+        if template is None:
+            template = generate_script_template(job_id, matching_skills, missing_skills)
+            cache_script_template(cache_key, template)
         
-        return interview_script
+        return template.replace(CANDIDATE_NAME_SLOT, candidate_name)
     
     except Exception as e:
         logger.error(f"Error generating interview script: {str(e)}")
         raise
 
-def get_job_description(job_id):
+def store_interview_script(interview_script):
     """
-    Get job description for a given job ID
-    This is a placeholder function - in a real implementation,
-    you would retrieve this from a database
+    Write a script to S3 as a gzip object keyed by its SHA-256 and return the key
     """
-    # Sample job descriptions (same as in screen_resume.py)
-    job_descriptions = {
-        "software-engineer": """
-        Software Engineer
-        
-        Responsibilities:
-        - Design, develop, and maintain high-quality software solutions
-        - Write clean, efficient, and maintainable code
-        - Collaborate with cross-functional teams to define and implement new features
-        - Troubleshoot and debug applications
-        - Participate in code reviews and contribute to team knowledge sharing
-        
-        Requirements:
-        - Bachelor's degree in Computer Science or related field
-        - 3+ years of experience in software development
-        - Proficiency in Python, Java, or similar programming languages
-        - Experience with cloud technologies (AWS, Azure, or GCP)
-        - Knowledge of software engineering best practices
-        - Strong problem-solving skills and attention to detail
-        - Excellent communication and teamwork abilities
-        """,
-        
-        # Additional job descriptions omitted for brevity...
-    }
+    script_bytes = interview_script.encode('utf-8')
+    script_key = f"{INTERVIEW_SCRIPT_PREFIX}{hashlib.sha256(script_bytes).hexdigest()}.txt.gz"
+    
+    s3_client.put_object(
+        Bucket=RESUME_BUCKET,
+        Key=script_key,
+        Body=gzip.compress(script_bytes),
+        ContentType='text/plain; charset=utf-8',
+        ContentEncoding='gzip'
+    )
+    
+    return script_key
+
+def split_script(interview_script, max_chars):
+    """
+    Split a script into segments of at most max_chars, preferring paragraph,
+    then sentence boundaries
+    """
+    pieces = []
+    for paragraph in interview_script.split('\n'):
+        paragraph = paragraph.strip()
+        while len(paragraph) > max_chars:
+            cut = paragraph.rfind('. ', 0, max_chars)
+            cut = cut + 1 if cut > 0 else max_chars
+            pieces.append(paragraph[:cut].strip())
+            paragraph = paragraph[cut:].strip()
+        if paragraph:
+            pieces.append(paragraph)
+    
+    segments = []
+    for piece in pieces:
+        if segments and len(segments[-1]) + 1 + len(piece) <= max_chars:
+            segments[-1] = f"{segments[-1]}\n{piece}"
+        else:
+            segments.append(piece)
+    return segments
+
+def load_script_segments(script_key):
+    """
+    Segments of a stored script, cached in the container while a call reads them
+    """
+    if not script_key.startswith(INTERVIEW_SCRIPT_PREFIX):
+        raise ValueError(f"Not an interview script key: {script_key}")
+    
+    with _segment_cache_lock:
+        segments = _segment_cache.get(script_key)
+        if segments is not None:
+            _segment_cache.move_to_end(script_key)
+            return segments
+    
+    body = s3_client.get_object(Bucket=RESUME_BUCKET, Key=script_key)['Body'].read()
+    segments = split_script(gzip.decompress(body).decode('utf-8'), SCRIPT_SEGMENT_CHARS)
+    
+    with _segment_cache_lock:
+        _segment_cache[script_key] = segments
+        while len(_segment_cache) > SEGMENT_CACHE_MAX_ENTRIES:
+            _segment_cache.popitem(last=False)
+    return segments
+
+def get_script_segment(event):
+    """
+    Contact flow lookup of one script segment
+    
+    The flow invokes this with a 'segment' parameter (starting at 0) and loops
+    while hasMore is 'true', playing scriptSegment and passing nextSegment back.
+    """
+    details = event['Details']
+    script_key = details['ContactData'].get('Attributes', {}).get(SCRIPT_KEY_ATTRIBUTE, '')
+    segment = int(details.get('Parameters', {}).get('segment', '0'))
     
-    # Return the job description for the given job ID, or a default one if not found
-    return job_descriptions.get(job_id, "Generic Technical Position")
+    segments = load_script_segments(script_key)
+    return {
+        'scriptSegment': segments[segment] if segment < len(segments) else '',
+        'segment': str(segment),
+        'nextSegment': str(segment + 1),
+        'segmentCount': str(len(segments)),
+        'hasMore': 'true' if segment + 1 < len(segments) else 'false'
+    }
 
-def initiate_phone_call(candidate_phone, interview_script):
+def initiate_phone_call(candidate_id, candidate_phone, script_key):
     """
     Initiate a phone call using Amazon Connect
     """
     try:
         attributes = {
-            'interviewScript': interview_script
+            'candidateId': candidate_id,
+            SCRIPT_KEY_ATTRIBUTE: script_key
         }
         
         response = connect.start_outbound_voice_contact(
@@ -168,30 +354,22 @@ def initiate_phone_call(candidate_phone, interview_script):
         logger.error(f"Error initiating phone call: {str(e)}")
         raise
 
-def update_candidate_phone_interview(candidate_id, contact_id, interview_script):
+def update_candidate_phone_interview(candidate_id, contact_id, script_key):
     """
     Update the candidate's record with phone interview details
     """
     try:
-        update_expression = """
-        SET phoneInterview = :phoneInterview,
-            status = :status
-        """
-        
-        expression_values = {
-            ':phoneInterview': {
-                'contactId': contact_id,
-                'script': interview_script,
-                'timestamp': int(time.time()),
-                'status': 'INITIATED'
-            },
-            ':status': 'PHONE_INTERVIEW_INITIATED'
-        }
-        
-        candidate_table.update_item(
-            Key={'id': candidate_id},
-            UpdateExpression=update_expression,
-            ExpressionAttributeValues=expression_values
+        transition_status(
+            candidate_id,
+            PHONE_INTERVIEW_INITIATED,
+            set_fields={
+                'phoneInterview': {
+                    'contactId': contact_id,
+                    'scriptKey': script_key,
+                    'timestamp': int(time.time()),
+                    'status': 'INITIATED'
+                }
+            }
         )
         
         logger.info(f"Updated phone interview details for candidate {candidate_id}")
@@ -201,37 +379,97 @@ def update_candidate_phone_interview(candidate_id, contact_id, interview_script)
         logger.error(f"Error updating phone interview details: {str(e)}")
         return False
 
+def save_interview_correlation(contact_id, candidate_id, job_id, task_token=None):
+    """
+    Record which candidate and waiting workflow an outbound contact belongs to
+    """
+    now = int(time.time())
+    item = {
+        'contactId': contact_id,
+        'candidateId': candidate_id,
+        'jobId': job_id,
+        'initiatedAt': now,
+        'expiresAt': now + PHONE_INTERVIEW_TIMEOUT_SECONDS + CORRELATION_TTL_MARGIN_SECONDS
+    }
+    if task_token:
+        item['taskToken'] = task_token
+    
+    contacts_table.put_item(Item=item)
+
+def claim_interview_correlation(contact_id):
+    """
+    Mark a contact's correlation record completed and return it
+    
+    Only the first caller gets the record, so duplicate completion events are
+    ignored. Returns None if the record is missing or already completed.
+    """
+    try:
+        response = contacts_table.update_item(
+            Key={'contactId': contact_id},
+            UpdateExpression='SET completedAt = :now',
+            ConditionExpression='attribute_exists(contactId) AND attribute_not_exists(completedAt)',
+            ExpressionAttributeValues={':now': int(time.time())},
+            ReturnValues='ALL_NEW'
+        )
+        return response['Attributes']
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+            return None
+        raise
+
+def release_interview_correlation(correlation):
+    """
+    Undo a claim whose processing failed, so the retried event can claim it again
+    """
+    try:
+        contacts_table.update_item(
+            Key={'contactId': correlation['contactId']},
+            UpdateExpression='REMOVE completedAt',
+            ConditionExpression='completedAt = :claimedAt',
+            ExpressionAttributeValues={':claimedAt': correlation['completedAt']}
+        )
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') != 'ConditionalCheckFailedException':
+            raise
+
+def get_contact_attributes(contact_id):
+    return connect.get_contact_attributes(
+        InstanceId=CONNECT_INSTANCE_ID,
+        InitialContactId=contact_id
+    ).get('Attributes', {})
+
+def read_contact_results(attributes):
+    """
+    Interview outcome from the attributes the contact flow set; a call that
+    ended without an outcome (no answer, hang-up) did not pass
+    """
+    if RESULT_PASSED_ATTRIBUTE not in attributes:
+        return {
+            'passed': False,
+            'notes': 'Call ended without an interview result.'
+        }
+    
+    return {
+        'passed': attributes[RESULT_PASSED_ATTRIBUTE].strip().lower() == 'true',
+        'notes': attributes.get(RESULT_NOTES_ATTRIBUTE, '')
+    }
+
 def process_phone_interview_results(candidate_id, interview_results):
     """
     Process the results of a phone interview
-    This would be called by a callback from Amazon Connect after the call
     """
     try:
-        # In a real implementation, you would analyze the call recording
-        # or transcript using Amazon Transcribe and Bedrock
-        # For this example, we'll simulate a successful interview
-        
-        passed_interview = True
-        interview_notes = "Candidate performed well in the phone interview."
-        
-        update_expression = """
-        SET phoneInterview.status = :status,
-            phoneInterview.notes = :notes,
-            phoneInterview.passed = :passed,
-            status = :candidateStatus
-        """
-        
-        expression_values = {
-            ':status': 'COMPLETED',
-            ':notes': interview_notes,
-            ':passed': passed_interview,
-            ':candidateStatus': 'PHONE_INTERVIEW_COMPLETED'
-        }
+        passed_interview = bool(interview_results.get('passed', False))
+        interview_notes = interview_results.get('notes', '')
         
-        candidate_table.update_item(
-            Key={'id': candidate_id},
-            UpdateExpression=update_expression,
-            ExpressionAttributeValues=expression_values
+        transition_status(
+            candidate_id,
+            PHONE_INTERVIEW_COMPLETED,
+            set_fields={
+                'phoneInterview.status': 'COMPLETED',
+                'phoneInterview.notes': interview_notes,
+                'phoneInterview.passed': passed_interview
+            }
         )
         
         return {
@@ -242,34 +480,388 @@ def process_phone_interview_results(candidate_id, interview_results):
     
     except Exception as e:
         logger.error(f"Error processing phone interview results: {str(e)}")
+        raise
+
+def complete_phone_interview(correlation, interview_results):
+    """
+    Record a claimed interview's results and resume the workflow waiting on it
+    
+    A candidate that can no longer complete the interview fails the waiting
+    workflow; any other error is raised for the caller to retry, since the
+    results were not recorded.
+    """
+    candidate_id = correlation['candidateId']
+    task_token = correlation.get('taskToken')
+    try:
+        result = process_phone_interview_results(candidate_id, interview_results)
+    except StatusTransitionError as e:
+        release_call_slot(candidate_id)
+        if task_token:
+            try:
+                sfn_client.send_task_failure(taskToken=task_token, error='PhoneInterviewFailed', cause=str(e)[:256])
+            except ClientError as send_error:
+                logger.warning(f"Could not fail workflow for contact {correlation['contactId']}: {str(send_error)}")
         return {
             'candidateId': candidate_id,
-            'passedPhoneInterview': False,
+            'jobId': correlation['jobId'],
+            'contactId': correlation['contactId'],
             'error': str(e)
         }
+    
+    release_call_slot(candidate_id)
+    output = {
+        'candidateId': candidate_id,
+        'jobId': correlation['jobId'],
+        'contactId': correlation['contactId'],
+        'passedPhoneInterview': result['passedPhoneInterview'],
+        'notes': result['notes']
+    }
+    
+    if task_token:
+        try:
+            sfn_client.send_task_success(taskToken=task_token, output=json.dumps(output))
+        except ClientError as e:
+            # The workflow already timed out waiting for this call
+            logger.warning(f"Could not resume workflow for contact {correlation['contactId']}: {str(e)}")
+    
+    return output
+
+def process_contact_event(detail):
+    """
+    Complete the phone interview a disconnected Amazon Connect contact belongs to
+    """
+    contact_id = detail['contactId']
+    
+    # Read everything that can fail before claiming, so a retried event still
+    # finds the correlation unclaimed
+    attributes = get_contact_attributes(contact_id)
+    
+    correlation = claim_interview_correlation(contact_id)
+    if correlation is None:
+        if 'Item' in contacts_table.get_item(Key={'contactId': contact_id}):
+            logger.info(f"Contact {contact_id} was already processed")
+            return {'contactId': contact_id, 'processed': False}
+        
+        # Ours, but the start handler has not saved the correlation yet: fail so
+        # the event is retried; contacts of other flows are ignored
+        if attributes.get('candidateId'):
+            raise RuntimeError(f"No correlation record yet for contact {contact_id}")
+        return {'contactId': contact_id, 'processed': False}
+    
+    return dict(complete_claimed_interview(correlation, read_contact_results(attributes)), processed=True)
+
+def complete_claimed_interview(correlation, interview_results):
+    """
+    Complete a claimed interview, releasing the claim if that fails so a retry can complete it
+    """
+    try:
+        return complete_phone_interview(correlation, interview_results)
+    except Exception:
+        release_interview_correlation(correlation)
+        raise
+
+def priority_key(score, enqueued_at):
+    """
+    Queue index sort key: highest rank score first, then first come first served
+    """
+    return f"{MAX_PRIORITY_SCORE - int(score):07d}#{enqueued_at:010d}"
+
+def in_calling_window(time_zone, now):
+    """
+    Whether it is a weekday within calling hours in the candidate's time zone
+    """
+    try:
+        zone = pytz.timezone(time_zone or DEFAULT_CANDIDATE_TIMEZONE)
+    except pytz.UnknownTimeZoneError:
+        zone = pytz.timezone(DEFAULT_CANDIDATE_TIMEZONE)
+    
+    local_time = datetime.fromtimestamp(now, zone)
+    return local_time.weekday() < 5 and CALLING_WINDOW_START_HOUR <= local_time.hour < CALLING_WINDOW_END_HOUR
+
+def enqueue_phone_screen(candidate_id, job_id, candidate_data, script_key, task_token=None):
+    """
+    Queue a phone screen for the dispatcher, prioritized by the candidate's rank score
+    """
+    now = int(time.time())
+    score = candidate_data.get('rankedScore', candidate_data.get('screeningScore', 0))
+    item = {
+        'candidateId': candidate_id,
+        'jobId': job_id,
+        'phone': candidate_data['phone'],
+        'scriptKey': script_key,
+        'timeZone': candidate_data.get('timeZone') or DEFAULT_CANDIDATE_TIMEZONE,
+        'score': int(score),
+        'queueStatus': QUEUE_PENDING,
+        'priorityKey': priority_key(score, now),
+        'enqueuedAt': now,
+        # The waiting workflow gives up after this, so the call is no longer wanted
+        'expiresAt': now + PHONE_INTERVIEW_TIMEOUT_SECONDS
+    }
+    if task_token:
+        item['taskToken'] = task_token
+    
+    queue_table.put_item(Item=item)
+
+def count_calls_in_flight(now):
+    """
+    Calls placed and not yet completed; calls past MAX_CALL_SECONDS are presumed lost
+    """
+    params = {
+        'IndexName': 'QueueStatusIndex',
+        'KeyConditionExpression': Key('queueStatus').eq(QUEUE_CALLING),
+        'FilterExpression': Attr('expiresAt').gt(now),
+        'Select': 'COUNT'
+    }
+    
+    count = 0
+    while True:
+        response = queue_table.query(**params)
+        count += response['Count']
+        if 'LastEvaluatedKey' not in response:
+            return count
+        params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def count_pending_calls():
+    params = {
+        'IndexName': 'QueueStatusIndex',
+        'KeyConditionExpression': Key('queueStatus').eq(QUEUE_PENDING),
+        'Select': 'COUNT'
+    }
+    
+    count = 0
+    while True:
+        response = queue_table.query(**params)
+        count += response['Count']
+        if 'LastEvaluatedKey' not in response:
+            return count
+        params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def pending_calls():
+    """
+    Yield queued phone screens in priority order, up to DISPATCH_SCAN_LIMIT
+    """
+    params = {
+        'IndexName': 'QueueStatusIndex',
+        'KeyConditionExpression': Key('queueStatus').eq(QUEUE_PENDING),
+        'Limit': min(DISPATCH_SCAN_LIMIT, 100)
+    }
+    
+    seen = 0
+    while seen < DISPATCH_SCAN_LIMIT:
+        response = queue_table.query(**params)
+        for item in response.get('Items', []):
+            seen += 1
+            yield item
+        if 'LastEvaluatedKey' not in response:
+            return
+        params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def claim_queued_call(item, now):
+    """
+    Move a queued phone screen to CALLING; False if another dispatcher run or a
+    newer request for the candidate got there first
+    """
+    try:
+        queue_table.update_item(
+            Key={'candidateId': item['candidateId']},
+            UpdateExpression='SET queueStatus = :calling, dispatchedAt = :now, expiresAt = :expiresAt',
+            ConditionExpression='queueStatus = :pending AND enqueuedAt = :enqueuedAt',
+            ExpressionAttributeValues={
+                ':calling': QUEUE_CALLING,
+                ':pending': QUEUE_PENDING,
+                ':now': now,
+                ':expiresAt': now + MAX_CALL_SECONDS,
+                ':enqueuedAt': item['enqueuedAt']
+            }
+        )
+        return True
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+            return False
+        raise
+
+def requeue_call(item):
+    """
+    Put a claimed phone screen back in the queue unchanged
+    """
+    queue_table.update_item(
+        Key={'candidateId': item['candidateId']},
+        UpdateExpression='SET queueStatus = :pending, expiresAt = :expiresAt REMOVE dispatchedAt',
+        ExpressionAttributeValues={
+            ':pending': QUEUE_PENDING,
+            ':expiresAt': item['expiresAt']
+        }
+    )
+
+def release_call_slot(candidate_id):
+    """
+    Remove a completed call from the queue, freeing its concurrency slot
+    """
+    try:
+        queue_table.delete_item(
+            Key={'candidateId': candidate_id},
+            ConditionExpression='queueStatus = :calling',
+            ExpressionAttributeValues={':calling': QUEUE_CALLING}
+        )
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') != 'ConditionalCheckFailedException':
+            raise
+
+def fail_queued_call(item, error):
+    """
+    Drop a phone screen that cannot be placed and fail the workflow waiting on it
+    """
+    logger.error(f"Could not place phone screen for candidate {item['candidateId']}: {str(error)}")
+    queue_table.delete_item(Key={'candidateId': item['candidateId']})
+    if item.get('taskToken'):
+        sfn_client.send_task_failure(
+            taskToken=item['taskToken'],
+            error='PhoneInterviewFailed',
+            cause=str(error)[:256]
+        )
+
+def place_queued_call(item):
+    """
+    Call a claimed candidate and link the contact to the waiting workflow
+    """
+    candidate_id = item['candidateId']
+    contact_id = initiate_phone_call(candidate_id, item['phone'], item['scriptKey'])
+    
+    # Update the candidate's record, then link the call to the waiting
+    # workflow; completion events arriving before the link are retried
+    update_candidate_phone_interview(candidate_id, contact_id, item['scriptKey'])
+    save_interview_correlation(contact_id, candidate_id, item['jobId'], item.get('taskToken'))
+    return contact_id
+
+def report_dispatch_metrics(queue_depth, calls_in_flight, stats, wait_seconds, oldest_wait_seconds):
+    """
+    Emit queue depth, wait time and dispatch outcomes as CloudWatch embedded metrics
+    """
+    print(json.dumps({
+        '_aws': {
+            'Timestamp': int(time.time() * 1000),
+            'CloudWatchMetrics': [{
+                'Namespace': METRICS_NAMESPACE,
+                'Dimensions': [['Function']],
+                'Metrics': [
+                    {'Name': 'PhoneScreenQueueDepth', 'Unit': 'Count'},
+                    {'Name': 'PhoneCallsInFlight', 'Unit': 'Count'},
+                    {'Name': 'PhoneCallsDispatched', 'Unit': 'Count'},
+                    {'Name': 'PhoneCallsDeferred', 'Unit': 'Count'},
+                    {'Name': 'PhoneCallsThrottled', 'Unit': 'Count'},
+                    {'Name': 'PhoneCallsFailed', 'Unit': 'Count'},
+                    {'Name': 'PhoneScreenWaitSeconds', 'Unit': 'Seconds'},
+                    {'Name': 'OldestPhoneScreenWaitSeconds', 'Unit': 'Seconds'}
+                ]
+            }]
+        },
+        'Function': 'PhoneCallDispatcher',
+        'PhoneScreenQueueDepth': queue_depth,
+        'PhoneCallsInFlight': calls_in_flight,
+        'PhoneCallsDispatched': stats['dispatched'],
+        'PhoneCallsDeferred': stats['deferred'],
+        'PhoneCallsThrottled': stats['throttled'],
+        'PhoneCallsFailed': stats['failed'],
+        'PhoneScreenWaitSeconds': wait_seconds or [0],
+        'OldestPhoneScreenWaitSeconds': oldest_wait_seconds
+    }))
+
+def dispatch_calls():
+    """
+    Place queued phone screens in priority order within the concurrency and
+    per-run rate budget, skipping candidates outside their calling window
+    """
+    now = int(time.time())
+    calls_in_flight = count_calls_in_flight(now)
+    budget = max(0, min(MAX_CONCURRENT_CALLS - calls_in_flight, CALLS_PER_MINUTE))
+    stats = {'dispatched': 0, 'deferred': 0, 'throttled': 0, 'failed': 0, 'expired': 0}
+    wait_seconds = []
+    oldest_wait_seconds = 0
+    
+    for item in pending_calls():
+        waited = now - int(item['enqueuedAt'])
+        oldest_wait_seconds = max(oldest_wait_seconds, waited)
+        
+        # The workflow stopped waiting for this call
+        if int(item['expiresAt']) <= now:
+            queue_table.delete_item(Key={'candidateId': item['candidateId']})
+            stats['expired'] += 1
+            continue
+        
+        # Keep scanning once the budget is spent, for the wait-time metric only
+        if budget <= 0 or stats['throttled']:
+            continue
+        
+        if not in_calling_window(item.get('timeZone'), now):
+            stats['deferred'] += 1
+            continue
+        
+        if not claim_queued_call(item, now):
+            continue
+        
+        try:
+            place_queued_call(item)
+            budget -= 1
+            stats['dispatched'] += 1
+            wait_seconds.append(waited)
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in CONNECT_THROTTLING_ERRORS:
+                # Connect is at capacity: stop for this run and retry the call next run
+                logger.warning(f"Connect throttled outbound calls: {str(e)}")
+                requeue_call(item)
+                stats['throttled'] += 1
+            else:
+                fail_queued_call(item, e)
+                stats['failed'] += 1
+        except Exception as e:
+            fail_queued_call(item, e)
+            stats['failed'] += 1
+    
+    queue_depth = count_pending_calls()
+    report_dispatch_metrics(queue_depth, calls_in_flight + stats['dispatched'], stats, wait_seconds, oldest_wait_seconds)
+    
+    return dict(stats, queueDepth=queue_depth, callsInFlight=calls_in_flight + stats['dispatched'])
 
 def lambda_handler(event, context):
     """
     Lambda handler for phone interviews
+    
+    Starting an interview generates the script and queues the call; the
+    scheduled dispatcher places queued calls and saves their correlation
+    records. The workflow waits on its task token until the contact's
+    completion event (or a process_results stand-in) resumes it.
     """
     logger.info(f"Received event: {json.dumps(event)}")
     
     try:
-        # Check if this is a new phone interview request or a callback
-        if event.get('action') == 'process_results':
-            # Process the results of a completed phone interview
-            candidate_id = event.get('candidateId')
-            interview_results = event.get('results', {})
+        # If event is a script lookup from the interview contact flow
+        if event.get('Name') == 'ContactFlowEvent':
+            return get_script_segment(event)
+        
+        # If event is an Amazon Connect contact event
+        elif event.get('source') == 'aws.connect':
+            return process_contact_event(event['detail'])
+        
+        # If event is the dispatcher schedule
+        elif event.get('source') == 'aws.events' or event.get('action') == 'dispatch_calls':
+            return dispatch_calls()
+        
+        # Stand-in for a completion event, with the results given directly
+        elif event.get('action') == 'process_results':
+            contact_id = event.get('contactId')
+            if not contact_id:
+                raise ValueError("Missing required parameter: contactId")
             
-            result = process_phone_interview_results(candidate_id, interview_results)
+            correlation = claim_interview_correlation(contact_id)
+            if correlation is None:
+                return {
+                    'statusCode': 404,
+                    'contactId': contact_id,
+                    'processed': False
+                }
             
-            return {
-                'statusCode': 200,
-                'candidateId': candidate_id,
-                'jobId': event.get('jobId'),
-                'passedPhoneInterview': result.get('passedPhoneInterview', False),
-                'processed': True
-            }
+            output = complete_claimed_interview(correlation, event.get('results', {}))
+            return dict(output, statusCode=200, processed=True)
         
         else:
             # Initiate a new phone interview
@@ -292,37 +884,36 @@ def lambda_handler(event, context):
             # Generate the interview script
             interview_script = generate_interview_script(candidate_data, job_id)
             
-            # Initiate the phone call
-            contact_id = initiate_phone_call(candidate_phone, interview_script)
-            
-            # Update the candidate's record
-            update_candidate_phone_interview(candidate_id, contact_id, interview_script)
-            
-            # For this example, we'll simulate the interview results after a delay
-            # In a real implementation, this would come from a callback from Amazon Connect
-            
-            # Simulate interview results
-            result = process_phone_interview_results(candidate_id, {
-                'contactId': contact_id,
-                'callStatus': 'COMPLETED',
-                'callDuration': 300,  # 5 minutes
-                'callRecordingUrl': f"s3://call-recordings/{contact_id}.wav"
-            })
+            # Store the script once and queue the call for the dispatcher with its key
+            script_key = store_interview_script(interview_script)
+            enqueue_phone_screen(candidate_id, job_id, candidate_data, script_key, event.get('taskToken'))
             
             return {
                 'statusCode': 200,
                 'candidateId': candidate_id,
                 'jobId': job_id,
-                'contactId': contact_id,
-                'initiated': True,
-                'passedPhoneInterview': result.get('passedPhoneInterview', False)
+                'queued': True
             }
     
     except Exception as e:
         logger.error(f"Error processing request: {str(e)}")
+        
+        # Contact events are retried, dispatcher runs recorded as failed and
+        # contact flows sent down their error branch by raising
+        if event.get('source') in ('aws.connect', 'aws.events') or event.get('Name') == 'ContactFlowEvent':
+            raise
+        
+        # A workflow waiting on this invocation fails now instead of timing out
+        if event.get('taskToken'):
+            sfn_client.send_task_failure(
+                taskToken=event['taskToken'],
+                error='PhoneInterviewFailed',
+                cause=str(e)[:256]
+            )
+        
         return {
             'statusCode': 500,
             'error': str(e),
-            'initiated': False,
+            'queued': False,
             'passedPhoneInterview': False
-        }
\ No newline at end of file
+        }
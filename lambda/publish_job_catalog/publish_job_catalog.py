@@ -0,0 +1,177 @@
+import re
+import gzip
+import json
+import boto3
+import hashlib
+import os
+import logging
+from decimal import Decimal
+from boto3.dynamodb.conditions import Key
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Configure logging
+logger = logging.getLogger()
+logger.setLevel(logging.INFO)
+
+# Initialize AWS clients
+s3_client = boto3.client('s3')
+dynamodb = boto3.resource('dynamodb')
+
+# Get environment variables
+JOB_TABLE_NAME = os.environ['JOB_TABLE_NAME']
+FRONTEND_BUCKET = os.environ['FRONTEND_BUCKET']
+CATALOG_PREFIX = os.environ.get('CATALOG_PREFIX', 'catalog')
+SNAPSHOT_MAX_AGE_SECONDS = int(os.environ.get('SNAPSHOT_MAX_AGE_SECONDS', '60'))
+job_table = dynamodb.Table(JOB_TABLE_NAME)
+
+# Only open jobs are listed on the job board
+CATALOG_STATUS = 'OPEN'
+
+# Precompressed variants written for every snapshot: (key suffix, Content-Encoding)
+SNAPSHOT_ENCODINGS = [('br', 'br'), ('gz', 'gzip')]
+
+# Helper class for DynamoDB Decimal serialization
+class DecimalEncoder(json.JSONEncoder):
+    def default(self, obj):
+        if isinstance(obj, Decimal):
+            return int(obj) if obj == obj.to_integral_value() else float(obj)
+        return super(DecimalEncoder, self).default(obj)
+
+def category_slug(category):
+    """
+    Object key segment for a category; frontend/src/services/api.ts derives the same slug
+    """
+    return re.sub(r'[^a-z0-9]+', '-', category.lower()).strip('-') or 'uncategorized'
+
+def load_open_jobs():
+    """
+    Read every open job, newest first, from the date-ordered status index
+    """
+    jobs = []
+    params = {
+        'IndexName': 'StatusPostedDateIndex',
+        'KeyConditionExpression': Key('status').eq(CATALOG_STATUS),
+        'ScanIndexForward': False
+    }
+    
+    while True:
+        response = job_table.query(**params)
+        jobs.extend(response.get('Items', []))
+        if 'LastEvaluatedKey' not in response:
+            break
+        params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    
+    return jobs
+
+def serialize_snapshot(jobs):
+    """
+    Compact JSON document for a list of jobs
+    """
+    return json.dumps({'jobs': jobs}, cls=DecimalEncoder, separators=(',', ':')).encode('utf-8')
+
+def compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=11)
+    return gzip.compress(body, compresslevel=9, mtime=0)
+
+def publish_snapshot(name, body):
+    """
+    Write the precompressed variants of one snapshot, e.g. catalog/jobs.json.br
+    
+    Returns the object keys written.
+    """
+    digest = hashlib.sha256(body).hexdigest()
+    keys = []
+    
+    for suffix, encoding in SNAPSHOT_ENCODINGS:
+        if encoding == 'br' and brotli is None:
+            continue
+        
+        key = f"{CATALOG_PREFIX}/{name}.json.{suffix}"
+        s3_client.put_object(
+            Bucket=FRONTEND_BUCKET,
+            Key=key,
+            Body=compress(body, encoding),
+            ContentType='application/json',
+            ContentEncoding=encoding,
+            CacheControl=f'public, max-age={SNAPSHOT_MAX_AGE_SECONDS}',
+            Metadata={'sha256': digest}
+        )
+        keys.append(key)
+    
+    return keys
+
+def remove_stale_snapshots(current_keys):
+    """
+    Delete category snapshots for categories that no longer have open jobs
+    """
+    stale = []
+    paginator = s3_client.get_paginator('list_objects_v2')
+    for page in paginator.paginate(Bucket=FRONTEND_BUCKET, Prefix=f"{CATALOG_PREFIX}/categories/"):
+        stale.extend(
+            {'Key': item['Key']}
+            for item in page.get('Contents', [])
+            if item['Key'] not in current_keys
+        )
+    
+    for start in range(0, len(stale), 1000):
+        s3_client.delete_objects(
+            Bucket=FRONTEND_BUCKET,
+            Delete={'Objects': stale[start:start + 1000], 'Quiet': True}
+        )
+    
+    return len(stale)
+
+def publish_catalog():
+    """
+    Regenerate the full catalog snapshot and one snapshot per category
+    """
+    if brotli is None:
+        logger.warning("brotli is not installed, publishing gzip snapshots only")
+    
+    jobs = load_open_jobs()
+    
+    jobs_by_category = {}
+    for job in jobs:
+        jobs_by_category.setdefault(category_slug(job.get('category', '')), []).append(job)
+    
+    published = publish_snapshot('jobs', serialize_snapshot(jobs))
+    for slug, category_jobs in jobs_by_category.items():
+        published.extend(publish_snapshot(f"categories/{slug}", serialize_snapshot(category_jobs)))
+    
+    removed = remove_stale_snapshots(set(published))
+    logger.info(
+        f"Published catalog of {len(jobs)} jobs in {len(jobs_by_category)} categories "
+        f"({len(published)} objects, {removed} stale removed)"
+    )
+    
+    return {
+        'jobs': len(jobs),
+        'categories': len(jobs_by_category),
+        'objects': len(published),
+        'removed': removed
+    }
+
+def lambda_handler(event, context):
+    """
+    Republish the job catalog snapshots when the jobs table changes
+    
+    Invoked by the jobs table stream (batched, so a burst of edits produces
+    one publish) or directly to force a publish.
+    """
+    records = event.get('Records', [])
+    logger.info(f"Publishing job catalog for {len(records)} table changes")
+    
+    try:
+        result = publish_catalog()
+        return {
+            'statusCode': 200,
+            **result
+        }
+    except Exception as e:
+        logger.error(f"Error publishing job catalog: {str(e)}")
+        raise
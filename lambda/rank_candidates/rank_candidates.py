@@ -1,20 +1,63 @@
 import json
 import boto3
 import os
+import time
+import uuid
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
 from boto3.dynamodb.conditions import Key
+from boto3.dynamodb.types import TypeSerializer
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from candidate_records import ALLOWED_TRANSITIONS, SCREENED, RANKED, now_iso
 
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
-# Initialize DynamoDB
+# Bulk write configuration
+RANK_WRITE_CONCURRENCY = int(os.environ.get('RANK_WRITE_CONCURRENCY', '8'))
+STATEMENT_BATCH_SIZE = 25
+# TransactWriteItems takes 100 items: the ranking state plus 99 candidates
+RANK_TRANSACTION_CANDIDATES = 99
+BATCH_MAX_RETRIES = 5
+BATCH_GET_CHUNK_SIZE = 100
+RETRYABLE_STATEMENT_ERRORS = {
+    'ThrottlingError',
+    'ProvisionedThroughputExceeded',
+    'RequestLimitExceeded',
+    'TransactionConflict',
+    'InternalServerError'
+}
+
+# Initialize AWS clients
+sfn_client = boto3.client('stepfunctions')
 dynamodb = boto3.resource('dynamodb')
+dynamodb_client = boto3.client(
+    'dynamodb',
+    config=Config(max_pool_connections=RANK_WRITE_CONCURRENCY + 2)
+)
+serializer = TypeSerializer()
 
 # Get environment variables
 DYNAMODB_TABLE = os.environ['DYNAMODB_TABLE']
+RANKING_STATE_TABLE = os.environ['RANKING_STATE_TABLE']
 candidate_table = dynamodb.Table(DYNAMODB_TABLE)
+ranking_state_table = dynamodb.Table(RANKING_STATE_TABLE)
+
+# Ranking configuration
+MAX_SCORE = 100
+TOP_CANDIDATE_FRACTION = 0.05
+STATE_UPDATE_RETRIES = 10
+TOP_SUMMARY_SIZE = int(os.environ.get('TOP_SUMMARY_SIZE', '10'))
+
+# Queued ranking passes for one job run one at a time under a lease on the
+# job's ranking state; a pass waits this long for another to finish
+RANK_LOCK_WAIT_SECONDS = int(os.environ.get('RANK_LOCK_WAIT_SECONDS', '30'))
+
+# Task tokens that can no longer be resumed; their requests are finished
+CLOSED_TASK_ERRORS = {'TaskTimedOut', 'TaskDoesNotExist', 'InvalidToken'}
 
 # JSON helper class for Decimal types
 class DecimalEncoder(json.JSONEncoder):
@@ -23,77 +66,733 @@ class DecimalEncoder(json.JSONEncoder):
             return float(obj)
         return super(DecimalEncoder, self).default(obj)
 
-def get_candidates_for_job(job_id):
+class ScoreHistogram:
     """
-    Retrieve all screened candidates for a specific job
+    Per-job histogram of integer screening scores (0-100) stored as a Fenwick
+    tree indexed from the highest score down, so a prefix sum is the number of
+    candidates at or above a score. Updates and rank queries are O(log S).
+    """
+    def __init__(self, tree=None):
+        self.tree = [int(value) for value in tree] if tree else [0] * (MAX_SCORE + 2)
+    
+    def _index(self, score):
+        return MAX_SCORE + 1 - score
+    
+    def add(self, score, delta=1):
+        index = self._index(score)
+        while index < len(self.tree):
+            self.tree[index] += delta
+            index += index & -index
+    
+    def count_at_least(self, score):
+        if score > MAX_SCORE:
+            return 0
+        
+        index = self._index(max(score, 0))
+        total = 0
+        while index > 0:
+            total += self.tree[index]
+            index -= index & -index
+        return total
+    
+    def total(self):
+        return self.count_at_least(0)
+    
+    def rank(self, score):
+        """
+        1-based rank of a score; tied scores share a rank
+        """
+        return self.count_at_least(score + 1) + 1
+    
+    def score_at_position(self, position):
+        """
+        Score of the candidate at a 1-based position in descending score order
+        """
+        index = 0
+        remaining = position
+        step = 1 << (len(self.tree) - 1).bit_length()
+        while step:
+            next_index = index + step
+            if next_index < len(self.tree) and self.tree[next_index] < remaining:
+                index = next_index
+                remaining -= self.tree[next_index]
+            step >>= 1
+        return MAX_SCORE - index
+    
+    def top_cutoff(self):
+        """
+        Lowest score that is still in the top 5% (at least one candidate), or None if empty
+        """
+        total = self.total()
+        if total == 0:
+            return None
+        
+        top_count = max(1, int(total * TOP_CANDIDATE_FRACTION))
+        return self.score_at_position(top_count)
+
+def score_bucket(score):
+    """
+    Clamp a screening score to the integer 0-100 buckets used for ranking
     """
     try:
-        response = candidate_table.query(
-            IndexName='JobRankingIndex',
-            KeyConditionExpression=Key('jobId').eq(job_id)
+        return max(0, min(MAX_SCORE, int(round(float(score)))))
+    except (TypeError, ValueError):
+        return 0
+
+def is_conditional_check_failure(error):
+    return error.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException'
+
+def merge_top_candidates(top_candidates, scores):
+    """
+    Merge newly ranked candidate scores into the job's short top-K list
+    
+    Entries are {'id', 'score'} dicts in descending score order. A candidate
+    already in the list is replaced by its new score.
+    """
+    merged = [entry for entry in top_candidates if entry['id'] not in scores]
+    merged.extend({'id': candidate_id, 'score': score} for candidate_id, score in scores.items())
+    merged.sort(key=lambda entry: entry['score'], reverse=True)
+    return merged[:TOP_SUMMARY_SIZE]
+
+def load_ranking_state(job_id):
+    """
+    Read the per-job score histogram, its version, the top-K candidate list
+    and the cutoff the stored top-5% flags agree with
+    """
+    response = ranking_state_table.get_item(
+        Key={'jobId': job_id},
+        ConsistentRead=True
+    )
+    item = response.get('Item', {})
+    top_candidates = [
+        {'id': entry['id'], 'score': int(entry['score'])}
+        for entry in item.get('topCandidates', [])
+    ]
+    flag_cutoff = item.get('flagCutoff', item.get('cutoffScore'))
+    flag_cutoff = int(flag_cutoff) if flag_cutoff is not None else None
+    return ScoreHistogram(item.get('scoreTree')), int(item.get('version', 0)), top_candidates, flag_cutoff
+
+def save_ranking_state(job_id, histogram, top_candidates, expected_version=None):
+    """
+    Write the per-job score histogram and ranking summary, optionally only if
+    nobody else updated it first. Returns the new version.
+    """
+    params = {
+        'Key': {'jobId': job_id},
+        'UpdateExpression': (
+            "SET scoreTree = :tree, totalCandidates = :total, cutoffScore = :cutoff, "
+            "flagCutoff = :cutoff, topCandidates = :top ADD version :one"
+        ),
+        'ExpressionAttributeValues': {
+            ':tree': histogram.tree,
+            ':total': histogram.total(),
+            ':cutoff': histogram.top_cutoff(),
+            ':top': top_candidates,
+            ':one': 1
+        },
+        'ReturnValues': 'UPDATED_NEW'
+    }
+    
+    if expected_version is not None:
+        params['ConditionExpression'] = "attribute_not_exists(version) OR version = :expected"
+        params['ExpressionAttributeValues'][':expected'] = expected_version
+    
+    response = ranking_state_table.update_item(**params)
+    return int(response.get('Attributes', {}).get('version', 0))
+
+def save_flag_cutoff(job_id, cutoff):
+    """
+    Record the cutoff every stored top-5% flag of the job now agrees with
+    """
+    ranking_state_table.update_item(
+        Key={'jobId': job_id},
+        UpdateExpression="SET flagCutoff = :cutoff",
+        ExpressionAttributeValues={':cutoff': cutoff}
+    )
+
+def ranking_state_update(job_id, histogram, top_candidates, expected_version):
+    """
+    Transaction item writing the job's score histogram and ranking summary if
+    its version is still the one read
+    """
+    return {
+        'Update': {
+            'TableName': RANKING_STATE_TABLE,
+            'Key': {'jobId': serializer.serialize(job_id)},
+            'UpdateExpression': (
+                "SET scoreTree = :tree, totalCandidates = :total, cutoffScore = :cutoff, "
+                "topCandidates = :top ADD version :one"
+            ),
+            'ConditionExpression': "attribute_not_exists(version) OR version = :expected",
+            'ExpressionAttributeValues': {
+                ':tree': serializer.serialize(histogram.tree),
+                ':total': serializer.serialize(histogram.total()),
+                ':cutoff': serializer.serialize(histogram.top_cutoff()),
+                ':top': serializer.serialize(top_candidates),
+                ':one': serializer.serialize(1),
+                ':expected': serializer.serialize(expected_version)
+            }
+        }
+    }
+
+def candidate_ranking_update(candidate_id, is_top_candidate, score, seen_status):
+    """
+    Transaction item recording a candidate's ranked score, if its status is
+    still the one read; a SCREENED candidate moves to RANKED
+    """
+    names = {'#status': 'status'}
+    values = {
+        ':top': serializer.serialize(is_top_candidate),
+        ':score': serializer.serialize(score),
+        ':seen': serializer.serialize(seen_status)
+    }
+    update_expression = "SET isTopCandidate = :top, rankedScore = :score"
+    if seen_status == SCREENED:
+        # Same bookkeeping as candidate_records.transition_status
+        update_expression += ", #status = :ranked, updatedDate = :updatedDate ADD statusVersion :one"
+        values[':ranked'] = serializer.serialize(RANKED)
+        values[':updatedDate'] = serializer.serialize(now_iso())
+        values[':one'] = serializer.serialize(1)
+    update_expression += " REMOVE ranking"
+    
+    return {
+        'Update': {
+            'TableName': DYNAMODB_TABLE,
+            'Key': {'id': serializer.serialize(candidate_id)},
+            'UpdateExpression': update_expression,
+            'ConditionExpression': "#status = :seen",
+            'ExpressionAttributeNames': names,
+            'ExpressionAttributeValues': values
+        }
+    }
+
+def is_transaction_conflict(error):
+    """
+    A transaction cancelled because an item changed since it was read
+    """
+    if error.response.get('Error', {}).get('Code') != 'TransactionCanceledException':
+        return False
+    reasons = error.response.get('CancellationReasons', [])
+    return any(reason.get('Code') in ('ConditionalCheckFailed', 'TransactionConflict') for reason in reasons)
+
+def acquire_job_lock(job_id, owner, lease_seconds):
+    """
+    Take the job's ranking lease, waiting up to RANK_LOCK_WAIT_SECONDS for a
+    concurrent pass to release it. Returns False if it stayed taken.
+    """
+    deadline = time.monotonic() + RANK_LOCK_WAIT_SECONDS
+    while True:
+        now = int(time.time())
+        try:
+            ranking_state_table.update_item(
+                Key={'jobId': job_id},
+                UpdateExpression="SET lockOwner = :owner, lockedUntil = :until",
+                ConditionExpression="attribute_not_exists(lockedUntil) OR lockedUntil < :now",
+                ExpressionAttributeValues={
+                    ':owner': owner,
+                    ':until': now + lease_seconds,
+                    ':now': now
+                }
+            )
+            return True
+        except ClientError as e:
+            if not is_conditional_check_failure(e):
+                raise
+        
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.5)
+
+def release_job_lock(job_id, owner):
+    """
+    Release the job's ranking lease if this pass still holds it
+    """
+    try:
+        ranking_state_table.update_item(
+            Key={'jobId': job_id},
+            UpdateExpression="REMOVE lockOwner, lockedUntil",
+            ConditionExpression="lockOwner = :owner",
+            ExpressionAttributeValues={':owner': owner}
         )
+    except ClientError as e:
+        if not is_conditional_check_failure(e):
+            raise
+        logger.warning(f"Ranking lease for job {job_id} expired before the pass finished")
+
+def get_ranking_summary(job_id):
+    """
+    Read the compact ranking summary of a job without its histogram
+    """
+    response = ranking_state_table.get_item(
+        Key={'jobId': job_id},
+        ProjectionExpression="totalCandidates, cutoffScore, version, topCandidates"
+    )
+    item = response.get('Item', {})
+    return {
+        'totalCandidates': int(item.get('totalCandidates', 0)),
+        'cutoffScore': int(item['cutoffScore']) if item.get('cutoffScore') is not None else None,
+        'version': int(item.get('version', 0)),
+        'topCandidateIds': [entry['id'] for entry in item.get('topCandidates', [])]
+    }
+
+def get_ranked_candidate(job_id, candidate_id):
+    """
+    Read a candidate's ranked score and its current rank in the job
+    
+    The rank is computed from the job's histogram rather than read from the
+    record, since every later insert can move it.
+    """
+    response = candidate_table.get_item(
+        Key={'id': candidate_id},
+        ProjectionExpression="rankedScore"
+    )
+    item = response.get('Item', {})
+    if item.get('rankedScore') is not None:
+        histogram = load_ranking_state(job_id)[0]
+        item['ranking'] = histogram.rank(score_bucket(item['rankedScore']))
+    return item
+
+def is_top_score(score, cutoff_score):
+    """
+    A candidate is in the top 5% when its ranked score reaches the job's cutoff
+    """
+    return score is not None and cutoff_score is not None and score >= cutoff_score
+
+def ranking_statement(candidate_id, is_top_candidate, score, set_status):
+    """
+    PartiQL update persisting one candidate's ranking
+
+    Ranks are not stored: every later insert would move them, so they are
+    computed from the job's histogram when read.
+    """
+    assignments = 'isTopCandidate = ?, rankedScore = ?'
+    parameters = [is_top_candidate, score]
+    condition = 'id = ?'
+    if set_status:
+        # Same bookkeeping and transition check as candidate_records.transition_status;
+        # a candidate that moved past RANKED in the meantime is left untouched
+        assignments += ', "status" = ?, updatedDate = ?, statusVersion = statusVersion + 1'
+        parameters.extend([RANKED, now_iso()])
+        condition += ' AND "status" IN [?, ?]'
+    parameters.append(candidate_id)
+    if set_status:
+        parameters.extend(ALLOWED_TRANSITIONS[RANKED])
+    
+    return {
+        'Statement': f'UPDATE "{DYNAMODB_TABLE}" SET {assignments} REMOVE ranking WHERE {condition}',
+        'Parameters': [serializer.serialize(value) for value in parameters]
+    }
+
+def top_flag_statement(candidate_id, is_top_candidate):
+    """
+    PartiQL update flipping the top-5% flag of an already ranked candidate
+    """
+    return {
+        'Statement': f'UPDATE "{DYNAMODB_TABLE}" SET isTopCandidate = ? WHERE id = ? AND rankedScore IS NOT MISSING',
+        'Parameters': [serializer.serialize(is_top_candidate), serializer.serialize(candidate_id)]
+    }
+
+def execute_statement_batch(statements):
+    """
+    Run up to 25 statements with BatchExecuteStatement, retrying throttled ones
+    Returns a tuple of (failed statement count, elapsed seconds)
+    """
+    started = time.monotonic()
+    pending = statements
+    failed = 0
+    
+    for attempt in range(BATCH_MAX_RETRIES + 1):
+        response = dynamodb_client.batch_execute_statement(Statements=pending)
+        retry = []
+        for statement, result in zip(pending, response['Responses']):
+            error = result.get('Error')
+            if not error:
+                continue
+            if error.get('Code') in RETRYABLE_STATEMENT_ERRORS:
+                retry.append(statement)
+            elif error.get('Code') != 'ConditionalCheckFailed':
+                failed += 1
+                logger.error(f"Ranking write failed: {error.get('Code')} {error.get('Message')}")
         
-        if 'Items' not in response or not response['Items']:
-            logger.warning(f"No candidates found for job {job_id}")
-            return []
+        if not retry:
+            break
+        pending = retry
+        time.sleep(min(2, 0.05 * (2 ** attempt)))
+    else:
+        failed += len(pending)
+        logger.error(f"{len(pending)} ranking writes still throttled after {BATCH_MAX_RETRIES} retries")
+    
+    return failed, time.monotonic() - started
+
+def persist_rankings(statements):
+    """
+    Write ranking updates in parallel batches of 25 on a bounded thread pool
+    """
+    if not statements:
+        return 0
+    
+    batches = [
+        statements[start:start + STATEMENT_BATCH_SIZE]
+        for start in range(0, len(statements), STATEMENT_BATCH_SIZE)
+    ]
+    
+    started = time.monotonic()
+    with ThreadPoolExecutor(max_workers=RANK_WRITE_CONCURRENCY) as executor:
+        results = list(executor.map(execute_statement_batch, batches))
+    elapsed = time.monotonic() - started
+    
+    failed = sum(batch_failed for batch_failed, _ in results)
+    batch_times = sorted(batch_elapsed for _, batch_elapsed in results)
+    logger.info(
+        f"Persisted {len(statements) - failed}/{len(statements)} ranking updates in "
+        f"{len(batches)} batches, {elapsed:.2f}s total; per-batch "
+        f"p50 {batch_times[len(batch_times) // 2] * 1000:.0f}ms, max {batch_times[-1] * 1000:.0f}ms"
+    )
+    
+    if failed:
+        raise RuntimeError(f"{failed} ranking updates could not be written")
+    return len(statements)
+
+def update_top_flags(job_id, old_cutoff, new_cutoff, exclude_ids):
+    """
+    Flip isTopCandidate for the ranked candidates whose scores lie between the
+    old and the new cutoff; every other candidate keeps its flag
+    """
+    old_cutoff = MAX_SCORE + 1 if old_cutoff is None else old_cutoff
+    new_cutoff = MAX_SCORE + 1 if new_cutoff is None else new_cutoff
+    if old_cutoff == new_cutoff:
+        return 0
+    
+    is_top = new_cutoff < old_cutoff
+    low, high = min(old_cutoff, new_cutoff), max(old_cutoff, new_cutoff) - 1
+    query = {
+        'IndexName': 'JobScoreIndex',
+        'KeyConditionExpression': Key('jobId').eq(job_id) & Key('screeningScore').between(low, high)
+    }
+    
+    statements = []
+    while True:
+        response = candidate_table.query(**query)
+        statements.extend(
+            top_flag_statement(item['id'], is_top)
+            for item in response.get('Items', [])
+            if item['id'] not in exclude_ids
+        )
         
-        # Filter for candidates that have been screened
-        screened_candidates = [
-            item for item in response['Items'] 
-            if item.get('status') == 'SCREENED' and 'screening' in item
-        ]
+        if 'LastEvaluatedKey' not in response:
+            break
+        query['ExclusiveStartKey'] = response['LastEvaluatedKey']
+    
+    return persist_rankings(statements)
+
+def get_screened_candidates(candidate_ids):
+    """
+    Fetch the screening score and previously ranked score of candidates with BatchGetItem
+    """
+    items = []
+    for start in range(0, len(candidate_ids), BATCH_GET_CHUNK_SIZE):
+        request = {
+            DYNAMODB_TABLE: {
+                'Keys': [{'id': candidate_id} for candidate_id in candidate_ids[start:start + BATCH_GET_CHUNK_SIZE]],
+                'ProjectionExpression': "id, #screening.score, rankedScore, #status",
+                'ExpressionAttributeNames': {'#screening': 'screening', '#status': 'status'}
+            }
+        }
         
-        return screened_candidates
+        for attempt in range(BATCH_MAX_RETRIES + 1):
+            response = dynamodb.batch_get_item(RequestItems=request)
+            items.extend(response.get('Responses', {}).get(DYNAMODB_TABLE, []))
+            request = response.get('UnprocessedKeys') or {}
+            if not request:
+                break
+            time.sleep(min(2, 0.05 * (2 ** attempt)))
+        
+        if request:
+            raise RuntimeError(f"Unprocessed keys remained after {BATCH_MAX_RETRIES} retries")
     
-    except Exception as e:
-        logger.error(f"Error retrieving candidates: {str(e)}")
-        return []
+    return {item['id']: item for item in items if 'screening' in item}
+
+def rank_new_candidates(job_id, candidate_ids):
+    """
+    Insert newly screened candidates into the job's score histogram in one pass
+    
+    Their ranks and the top-5% cutoff come from the histogram in logarithmic
+    time. Each candidate's rankedScore is written in the same transaction as
+    the histogram that counts it, so a failed pass can be retried without
+    counting anyone twice. Only the new candidates and candidates whose top-5%
+    flag flips because the cutoff moved are written. Returns results by
+    candidate ID.
+    """
+    candidate_ids = list(dict.fromkeys(candidate_ids))
+    
+    for attempt in range(STATE_UPDATE_RETRIES):
+        candidates = get_screened_candidates(candidate_ids)
+        missing = [candidate_id for candidate_id in candidate_ids if candidate_id not in candidates]
+        if missing:
+            logger.error(f"No screening results found for candidates {missing}")
+        if not candidates:
+            raise ValueError(f"No screening results found for candidates {candidate_ids}")
+        
+        scores = {
+            candidate_id: score_bucket(item['screening'].get('score', 0))
+            for candidate_id, item in candidates.items()
+        }
+        
+        histogram, version, top_candidates, flag_cutoff = load_ranking_state(job_id)
+        
+        # The new cutoff decides the new candidates' flags before anything is written
+        final_histogram = ScoreHistogram(histogram.tree)
+        for candidate_id, item in candidates.items():
+            # A retried or re-screened candidate replaces its previous entry
+            if item.get('rankedScore') is not None:
+                final_histogram.add(score_bucket(item['rankedScore']), -1)
+            final_histogram.add(scores[candidate_id], 1)
+        new_cutoff = final_histogram.top_cutoff()
+        
+        try:
+            ids = list(candidates)
+            for start in range(0, len(ids), RANK_TRANSACTION_CANDIDATES):
+                chunk = ids[start:start + RANK_TRANSACTION_CANDIDATES]
+                chunk_scores = {candidate_id: scores[candidate_id] for candidate_id in chunk}
+                for candidate_id in chunk:
+                    if candidates[candidate_id].get('rankedScore') is not None:
+                        histogram.add(score_bucket(candidates[candidate_id]['rankedScore']), -1)
+                    histogram.add(scores[candidate_id], 1)
+                top_candidates = merge_top_candidates(top_candidates, chunk_scores)
+                
+                dynamodb_client.transact_write_items(TransactItems=[
+                    ranking_state_update(job_id, histogram, top_candidates, version)
+                ] + [
+                    candidate_ranking_update(
+                        candidate_id,
+                        scores[candidate_id] >= new_cutoff,
+                        scores[candidate_id],
+                        candidates[candidate_id].get('status')
+                    )
+                    for candidate_id in chunk
+                ])
+                version += 1
+            break
+        except ClientError as e:
+            if not is_transaction_conflict(e):
+                raise
+            logger.info(f"Ranking state or candidates for job {job_id} changed concurrently, retrying")
+    else:
+        raise RuntimeError(f"Could not update ranking state for job {job_id}")
+    
+    total = histogram.total()
+    results = {
+        candidate_id: {
+            'ranking': histogram.rank(score),
+            'isTopCandidate': score >= new_cutoff,
+            'totalCandidates': total,
+            'cutoffScore': new_cutoff,
+            'rankingVersion': version
+        }
+        for candidate_id, score in scores.items()
+    }
+    
+    # Flags flipped by earlier passes that failed before finishing are caught up too
+    flipped = update_top_flags(job_id, flag_cutoff, new_cutoff, set(scores))
+    save_flag_cutoff(job_id, new_cutoff)
+    logger.info(
+        f"Ranked {len(scores)} new candidates for job {job_id} among {total} "
+        f"(cutoff {new_cutoff}, {flipped} top flags changed)"
+    )
+    
+    return results
 
-def rank_candidates(candidates):
+def get_candidates_for_job(job_id):
+    """
+    Stream all screened candidates for a specific job, highest score first
+    
+    Reads the sparse JobScoreIndex page by page (only screened candidates carry
+    screeningScore), projecting just the ID, score and status.
+    """
+    query = {
+        'IndexName': 'JobScoreIndex',
+        'KeyConditionExpression': Key('jobId').eq(job_id),
+        'ProjectionExpression': 'id, screeningScore, #status',
+        'ExpressionAttributeNames': {'#status': 'status'},
+        'ScanIndexForward': False
+    }
+    
+    while True:
+        response = candidate_table.query(**query)
+        for item in response.get('Items', []):
+            yield item
+        
+        if 'LastEvaluatedKey' not in response:
+            break
+        query['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def rank_candidates(job_id, candidates, lease_seconds=900):
     """
-    Rank candidates based on their screening scores
+    Rank candidates based on their screening scores and rebuild the job's score histogram
+    Returns the job's ranking summary
+    
+    Runs under the job's ranking lease, so no queued incremental pass commits
+    while the candidates are read, and the histogram is only replaced if its
+    version is still the one read at the start.
     """
+    lock_owner = str(uuid.uuid4())
+    if not acquire_job_lock(job_id, lock_owner, lease_seconds):
+        raise RuntimeError(f"Another ranking pass for job {job_id} is running")
+    
     try:
+        _, expected_version, _, _ = load_ranking_state(job_id)
+        
+        # Only IDs and scores are held in memory
+        scored_candidates = [
+            {
+                'id': candidate['id'],
+                'score': score_bucket(candidate.get('screeningScore', 0)),
+                'status': candidate.get('status')
+            }
+            for candidate in candidates
+        ]
+        if not scored_candidates:
+            logger.warning(f"No candidates found for job {job_id}")
+        
         # Sort candidates based on screening score (descending)
-        sorted_candidates = sorted(
-            candidates,
-            key=lambda x: x.get('screening', {}).get('score', 0),
-            reverse=True
-        )
+        scored_candidates.sort(key=lambda x: x['score'], reverse=True)
         
-        # Calculate total number of candidates
-        total_candidates = len(sorted_candidates)
+        histogram = ScoreHistogram()
+        for candidate in scored_candidates:
+            histogram.add(candidate['score'])
         
-        # Mark whether each candidate is in the top 5%
-        top_threshold = max(1, int(total_candidates * 0.05))  # At least 1 candidate
+        # Candidates at or above the cutoff score are in the top 5%
+        top_cutoff = histogram.top_cutoff()
+        statements = []
         
-        for i, candidate in enumerate(sorted_candidates):
-            # Calculate ranking (1-based index)
-            ranking = i + 1
+        for candidate in scored_candidates:
+            score = candidate['score']
+            is_top_candidate = score >= top_cutoff
             
-            # Determine if candidate is in top 5%
-            is_top_candidate = ranking <= top_threshold
+            # Only SCREENED candidates move to RANKED; later stages keep their status
+            statements.append(ranking_statement(
+                candidate['id'],
+                is_top_candidate,
+                score,
+                set_status=candidate['status'] == SCREENED
+            ))
             
-            # Update candidate record with ranking
-            candidate_table.update_item(
-                Key={'id': candidate['id']},
-                UpdateExpression="SET ranking = :ranking, isTopCandidate = :isTop, status = :status",
-                ExpressionAttributeValues={
-                    ':ranking': Decimal(str(ranking)),
-                    ':isTop': is_top_candidate,
-                    ':status': 'RANKED'
-                }
-            )
-            
-            # Update the candidate object for return value
-            candidate['ranking'] = ranking
-            candidate['isTopCandidate'] = is_top_candidate
         
-        return sorted_candidates
+        # Persist all rankings in parallel batches
+        persist_rankings(statements)
+        
+        top_candidates = [
+            {'id': candidate['id'], 'score': candidate['score']}
+            for candidate in scored_candidates[:TOP_SUMMARY_SIZE]
+        ]
+        version = save_ranking_state(job_id, histogram, top_candidates, expected_version=expected_version)
+        
+        return {
+            'totalCandidates': histogram.total(),
+            'cutoffScore': top_cutoff,
+            'version': version,
+            'topCandidateIds': [candidate['id'] for candidate in top_candidates]
+        }
     
     except Exception as e:
         logger.error(f"Error ranking candidates: {str(e)}")
         raise
+    
+    finally:
+        release_job_lock(job_id, lock_owner)
+
+def resume_ranking_request(job_id, request, result):
+    """
+    Resume the execution waiting on a ranking request with its result
+    
+    Returns False if Step Functions could not be reached, so the request is
+    redelivered; a token that already completed or timed out counts as done.
+    """
+    candidate_id = request['candidateId']
+    try:
+        if result is None:
+            sfn_client.send_task_failure(
+                taskToken=request['taskToken'],
+                error='RankingFailed',
+                cause=f"Candidate {candidate_id} could not be ranked for job {job_id}"
+            )
+            return True
+        
+        sfn_client.send_task_success(
+            taskToken=request['taskToken'],
+            output=json.dumps({
+                'statusCode': 200,
+                'jobId': job_id,
+                'candidateId': candidate_id,
+                'totalCandidates': result['totalCandidates'],
+                'ranking': result['ranking'],
+                'cutoffScore': result['cutoffScore'],
+                'rankingVersion': result['rankingVersion'],
+                'isTopCandidate': result['isTopCandidate'],
+                'ranked': True
+            }, cls=DecimalEncoder)
+        )
+        return True
+    
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') in CLOSED_TASK_ERRORS:
+            logger.info(f"Ranking request for candidate {candidate_id} is no longer awaited: {str(e)}")
+            return True
+        logger.error(f"Error resuming ranking request for candidate {candidate_id}: {str(e)}")
+        return False
+    
+    except Exception as e:
+        logger.error(f"Error resuming ranking request for candidate {candidate_id}: {str(e)}")
+        return False
+
+def process_ranking_requests(records, context=None):
+    """
+    Coalesce queued ranking requests into one ranking pass per job
+    
+    Screening completions are queued with the waiting execution's task token;
+    the queue's batching window acts as the debounce window. Each execution is
+    resumed with its result from the pass that included it.
+    
+    Only permanent errors, such as a candidate without screening results, fail
+    the waiting execution. A pass that fails for any other reason (throttling,
+    conflicts that outlast the retries, or flag updates after the histogram
+    committed) returns its requests as batch item failures, so they are
+    redelivered with their task tokens still open; the retried pass replaces
+    already counted scores instead of adding them again.
+    """
+    requests_by_job = {}
+    for record in records:
+        message = json.loads(record['body'])
+        requests_by_job.setdefault(message['jobId'], []).append((record, message))
+    
+    lock_owner = str(uuid.uuid4())
+    lease_seconds = int(context.get_remaining_time_in_millis() / 1000) if context else 900
+    failures = []
+    
+    for job_id, requests in requests_by_job.items():
+        if not acquire_job_lock(job_id, lock_owner, lease_seconds):
+            logger.warning(f"Another ranking pass for job {job_id} is running, retrying {len(requests)} requests later")
+            failures.extend({'itemIdentifier': record['messageId']} for record, _ in requests)
+            continue
+        
+        try:
+            results = rank_new_candidates(job_id, [request['candidateId'] for _, request in requests])
+        except ValueError as e:
+            logger.error(f"Candidates for job {job_id} cannot be ranked: {str(e)}")
+            results = {}
+        except Exception as e:
+            logger.error(f"Error ranking candidates for job {job_id}, retrying {len(requests)} requests later: {str(e)}")
+            failures.extend({'itemIdentifier': record['messageId']} for record, _ in requests)
+            continue
+        finally:
+            release_job_lock(job_id, lock_owner)
+        
+        for record, request in requests:
+            if not resume_ranking_request(job_id, request, results.get(request['candidateId'])):
+                failures.append({'itemIdentifier': record['messageId']})
+    
+    logger.info(f"Processed {len(records)} ranking requests for {len(requests_by_job)} jobs, {len(failures)} to retry")
+    return {'batchItemFailures': failures}
 
 def lambda_handler(event, context):
     """
@@ -101,36 +800,64 @@ def lambda_handler(event, context):
     """
     logger.info(f"Received event: {json.dumps(event)}")
     
+    # Queued ranking requests from the Step Functions workflow
+    if event.get('Records') and event['Records'][0].get('eventSource') == 'aws:sqs':
+        return process_ranking_requests(event['Records'], context)
+    
     try:
         # Extract job ID from event
         if 'jobId' not in event:
             raise ValueError("Missing required parameter: jobId")
         
         job_id = event['jobId']
+        current_candidate_id = event.get('candidateId')
         
-        # Get all candidates for the job
-        candidates = get_candidates_for_job(job_id)
+        # A newly screened candidate is inserted incrementally
+        if current_candidate_id and not event.get('fullRerank') and event.get('action') != 'get_ranking_summary':
+            result = rank_new_candidates(job_id, [current_candidate_id])[current_candidate_id]
+            
+            return {
+                'statusCode': 200,
+                'jobId': job_id,
+                'candidateId': current_candidate_id,
+                'totalCandidates': result['totalCandidates'],
+                'ranking': result['ranking'],
+                'cutoffScore': result['cutoffScore'],
+                'rankingVersion': result['rankingVersion'],
+                'isTopCandidate': result['isTopCandidate'],
+                'ranked': True
+            }
         
-        # Rank the candidates
-        ranked_candidates = rank_candidates(candidates)
+        if event.get('action') == 'get_ranking_summary':
+            # Answer from the stored summary without re-ranking
+            summary = get_ranking_summary(job_id)
+        else:
+            # Get all candidates for the job
+            candidates = get_candidates_for_job(job_id)
+            
+            # Rank the candidates
+            lease_seconds = int(context.get_remaining_time_in_millis() / 1000) if context else 900
+            summary = rank_candidates(job_id, candidates, lease_seconds)
         
         # Determine if the current candidate is in the top 5%
-        current_candidate_id = event.get('candidateId')
         is_top_candidate = False
+        ranking = None
         
         if current_candidate_id:
-            for candidate in ranked_candidates:
-                if candidate['id'] == current_candidate_id:
-                    is_top_candidate = candidate.get('isTopCandidate', False)
-                    break
+            candidate = get_ranked_candidate(job_id, current_candidate_id)
+            ranking = int(candidate['ranking']) if 'ranking' in candidate else None
+            is_top_candidate = is_top_score(candidate.get('rankedScore'), summary['cutoffScore'])
         
-        # Return the ranking results
+        # Return the ranking summary; its size does not grow with the job
         return {
             'statusCode': 200,
             'jobId': job_id,
             'candidateId': current_candidate_id,
-            'totalCandidates': len(ranked_candidates),
-            'topCandidates': [c for c in ranked_candidates if c.get('isTopCandidate', False)],
+            'totalCandidates': summary['totalCandidates'],
+            'cutoffScore': summary['cutoffScore'],
+            'rankingVersion': summary['version'],
+            'topCandidateIds': summary['topCandidateIds'],
+            'ranking': ranking,
             'isTopCandidate': is_top_candidate,
             'ranked': True
         }
@@ -141,4 +868,4 @@ def lambda_handler(event, context):
             'statusCode': 500,
             'error': str(e),
             'ranked': False
-        }
\ No newline at end of file
+        }
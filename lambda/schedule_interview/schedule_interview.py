@@ -2,12 +2,18 @@ import json
 import boto3
 import os
 import logging
-import base64
 import time
+import pytz
+import hashlib
+import uuid
+import urllib.error
+import urllib.parse
+import urllib.request
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from datetime import datetime, timedelta
-import random
+from datetime import datetime, timedelta, timezone
+from botocore.exceptions import ClientError
+from candidate_records import ALLOWED_TRANSITIONS, INTERVIEW_SCHEDULED, StatusTransitionError, get_record, transition_status
 
 # Configure logging
 logger = logging.getLogger()
@@ -16,27 +22,52 @@ logger.setLevel(logging.INFO)
 # Initialize AWS clients
 secretsmanager = boto3.client('secretsmanager')
 ses = boto3.client('ses')
+sfn_client = boto3.client('stepfunctions')
 dynamodb = boto3.resource('dynamodb')
 
 # Get environment variables
 GMAIL_CREDENTIALS_SECRET = os.environ['GMAIL_CREDENTIALS_SECRET']
-DYNAMODB_TABLE = os.environ['DYNAMODB_TABLE']
-candidate_table = dynamodb.Table(DYNAMODB_TABLE)
+SCHEDULING_LOCK_TABLE = os.environ['SCHEDULING_LOCK_TABLE']
+scheduling_lock_table = dynamodb.Table(SCHEDULING_LOCK_TABLE)
+HIRING_MANAGER_EMAIL = os.environ.get('HIRING_MANAGER_EMAIL', 'hiring_manager@example.com')
+TECHNICAL_STAFF_EMAIL = os.environ.get('TECHNICAL_STAFF_EMAIL', 'tech_staff@example.com')
+
+# Calendar backing the slot search: 'google' (Google Calendar free/busy with
+# the credentials secret) or 'memory' (in-container, for local runs and tests)
+CALENDAR_PROVIDER = os.environ.get('CALENDAR_PROVIDER', 'memory')
+
+# Interview slot configuration
+INTERVIEW_TIMEZONE = os.environ.get('INTERVIEW_TIMEZONE', 'UTC')
+INTERVIEW_DAY_START_HOUR = int(os.environ.get('INTERVIEW_DAY_START_HOUR', '9'))
+INTERVIEW_DAY_END_HOUR = int(os.environ.get('INTERVIEW_DAY_END_HOUR', '17'))
+INTERVIEW_DURATION_MINUTES = int(os.environ.get('INTERVIEW_DURATION_MINUTES', '60'))
+INTERVIEW_BUFFER_MINUTES = int(os.environ.get('INTERVIEW_BUFFER_MINUTES', '15'))
+INTERVIEW_SLOT_STEP_MINUTES = int(os.environ.get('INTERVIEW_SLOT_STEP_MINUTES', '30'))
+INTERVIEW_LEAD_HOURS = int(os.environ.get('INTERVIEW_LEAD_HOURS', '24'))
+INTERVIEW_HORIZON_DAYS = int(os.environ.get('INTERVIEW_HORIZON_DAYS', '14'))
+
+# Batches for different jobs run concurrently but book the same interviewers,
+# so slot allocation and booking run under a lease on the interviewer pair; a
+# batch waits this long for another to finish
+SCHEDULING_LOCK_WAIT_SECONDS = int(os.environ.get('SCHEDULING_LOCK_WAIT_SECONDS', '60'))
+
+# Task tokens that can no longer be resumed; their requests are finished
+CLOSED_TASK_ERRORS = {'TaskTimedOut', 'TaskDoesNotExist', 'InvalidToken'}
+
+_calendar_provider = None
 
 def get_candidate_data(candidate_id):
     """
     Retrieve candidate data from DynamoDB
     """
     try:
-        response = candidate_table.get_item(
-            Key={'id': candidate_id}
-        )
+        record = get_record(candidate_id)
         
-        if 'Item' not in response:
+        if record is None:
             logger.error(f"No data found for candidate {candidate_id}")
             return None
         
-        return response['Item']
+        return record
     
     except Exception as e:
         logger.error(f"Error retrieving candidate data: {str(e)}")
@@ -58,51 +89,287 @@ def get_gmail_credentials():
         logger.error(f"Error retrieving Gmail credentials: {str(e)}")
         raise
 
-def find_available_interview_slots(hiring_manager_email, technical_staff_email):
+class InMemoryCalendarProvider:
     """
-    Find available interview slots for the hiring manager and technical staff
-    In a real implementation, this would use the Gmail API to check calendars
-    For this example, we'll generate some sample slots
+    Calendars kept in memory, for local runs and tests
+    
+    Busy intervals are (start, end) epoch seconds per calendar ID. Like the
+    Google provider, booking an event ID again returns the existing booking.
     """
-    # Start from tomorrow
-    start_date = datetime.now() + timedelta(days=1)
+    def __init__(self, busy=None):
+        self.busy = {calendar: list(intervals) for calendar, intervals in (busy or {}).items()}
+        self.events = {}
     
-    # Generate 3 available slots in the next week
-    available_slots = []
-    for i in range(3):
-        interview_date = start_date + timedelta(days=i+1)
-        
-        # Generate a morning slot (9-11 AM)
-        morning_hour = random.randint(9, 11)
-        morning_slot = datetime(
-            interview_date.year, 
-            interview_date.month, 
-            interview_date.day, 
-            morning_hour, 
-            0, 0
-        )
-        
-        # Generate an afternoon slot (1-4 PM)
-        afternoon_hour = random.randint(13, 16)
-        afternoon_slot = datetime(
-            interview_date.year, 
-            interview_date.month, 
-            interview_date.day, 
-            afternoon_hour, 
-            0, 0
+    def get_busy(self, calendars, start, end):
+        return {
+            calendar: [(busy_start, busy_end) for busy_start, busy_end in self.busy.get(calendar, []) if busy_start < end and busy_end > start]
+            for calendar in calendars
+        }
+    
+    def book(self, event_id, calendars, start, end, summary, description=''):
+        if event_id in self.events:
+            return self.events[event_id]['start'], self.events[event_id]['end']
+        
+        for calendar in calendars:
+            self.busy.setdefault(calendar, []).append((start, end))
+        self.events[event_id] = {'calendars': list(calendars), 'start': start, 'end': end, 'summary': summary}
+        return start, end
+    
+    def cancel(self, event_id):
+        event = self.events.pop(event_id, None)
+        if event is None:
+            return
+        for calendar in event['calendars']:
+            self.busy[calendar].remove((event['start'], event['end']))
+
+class GoogleCalendarProvider:
+    """
+    Google Calendar free/busy and event booking over the REST API
+    
+    The credentials secret holds an OAuth client_id, client_secret and a
+    refresh_token with calendar scope; events are created on the token
+    owner's primary calendar with the interviewers as attendees.
+    """
+    TOKEN_URL = 'https://oauth2.googleapis.com/token'
+    API_URL = 'https://www.googleapis.com/calendar/v3'
+    
+    def __init__(self, credentials):
+        self.credentials = credentials
+        self.access_token = None
+        self.expires_at = 0
+    
+    def _get_access_token(self):
+        if self.access_token and time.time() < self.expires_at - 60:
+            return self.access_token
+        
+        data = urllib.parse.urlencode({
+            'client_id': self.credentials['client_id'],
+            'client_secret': self.credentials['client_secret'],
+            'refresh_token': self.credentials['refresh_token'],
+            'grant_type': 'refresh_token'
+        }).encode('utf-8')
+        with urllib.request.urlopen(urllib.request.Request(self.TOKEN_URL, data=data), timeout=10) as response:
+            token = json.loads(response.read())
+        
+        self.access_token = token['access_token']
+        self.expires_at = time.time() + int(token.get('expires_in', 3600))
+        return self.access_token
+    
+    def _request(self, path, body=None, method=None):
+        request = urllib.request.Request(
+            f"{self.API_URL}{path}",
+            data=json.dumps(body).encode('utf-8') if body is not None else None,
+            headers={
+                'Authorization': f"Bearer {self._get_access_token()}",
+                'Content-Type': 'application/json'
+            },
+            method=method
         )
-        
-        available_slots.extend([morning_slot, afternoon_slot])
+        with urllib.request.urlopen(request, timeout=10) as response:
+            payload = response.read()
+            return json.loads(payload) if payload else {}
     
-    # Format the slots for display
-    formatted_slots = []
-    for slot in available_slots:
-        formatted_slots.append({
-            'datetime': slot,
-            'formatted': slot.strftime('%A, %B %d, %Y at %I:%M %p')
+    def get_busy(self, calendars, start, end):
+        response = self._request('/freeBusy', {
+            'timeMin': to_rfc3339(start),
+            'timeMax': to_rfc3339(end),
+            'items': [{'id': calendar} for calendar in calendars]
         })
+        
+        busy = {}
+        for calendar in calendars:
+            entry = response.get('calendars', {}).get(calendar, {})
+            if entry.get('errors'):
+                raise RuntimeError(f"Free/busy lookup failed for {calendar}: {entry['errors']}")
+            busy[calendar] = [(from_rfc3339(period['start']), from_rfc3339(period['end'])) for period in entry.get('busy', [])]
+        return busy
     
-    return formatted_slots
+    def book(self, event_id, calendars, start, end, summary, description=''):
+        try:
+            self._request('/calendars/primary/events', {
+                'id': event_id,
+                'summary': summary,
+                'description': description,
+                'start': {'dateTime': to_rfc3339(start)},
+                'end': {'dateTime': to_rfc3339(end)},
+                'attendees': [{'email': calendar} for calendar in calendars]
+            })
+            return start, end
+        except urllib.error.HTTPError as e:
+            if e.code != 409:
+                raise
+        
+        # Already booked by an earlier attempt; keep that booking
+        event = self._request(f"/calendars/primary/events/{event_id}")
+        return from_rfc3339(event['start']['dateTime']), from_rfc3339(event['end']['dateTime'])
+    
+    def cancel(self, event_id):
+        try:
+            self._request(f"/calendars/primary/events/{event_id}?sendUpdates=all", method='DELETE')
+        except urllib.error.HTTPError as e:
+            # Already gone
+            if e.code not in (404, 410):
+                raise
+
+def interview_event_id(candidate_id):
+    """
+    Calendar event ID of a candidate's interview, so retried bookings find
+    the first one instead of creating another (Google event IDs use base32hex
+    characters, which include hex digits)
+    """
+    return f"interview{hashlib.sha1(candidate_id.encode('utf-8')).hexdigest()}"
+
+def to_rfc3339(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+def from_rfc3339(value):
+    return int(datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp())
+
+def get_calendar_provider():
+    """
+    Calendar provider for this container, created on first use
+    """
+    global _calendar_provider
+    if _calendar_provider is None:
+        if CALENDAR_PROVIDER == 'google':
+            _calendar_provider = GoogleCalendarProvider(get_gmail_credentials())
+        else:
+            _calendar_provider = InMemoryCalendarProvider()
+    return _calendar_provider
+
+def merge_intervals(intervals):
+    """
+    Sort and merge overlapping or touching (start, end) intervals
+    """
+    merged = []
+    for start, end in sorted(intervals):
+        if end <= start:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+def subtract_intervals(windows, busy):
+    """
+    Parts of sorted, disjoint windows not covered by sorted, merged busy intervals
+    """
+    free = []
+    first = 0
+    for window_start, window_end in windows:
+        cursor = window_start
+        while first < len(busy) and busy[first][1] <= cursor:
+            first += 1
+        
+        index = first
+        while index < len(busy) and busy[index][0] < window_end:
+            if busy[index][0] > cursor:
+                free.append((cursor, busy[index][0]))
+            cursor = max(cursor, busy[index][1])
+            index += 1
+        
+        if cursor < window_end:
+            free.append((cursor, window_end))
+    return free
+
+def intersect_intervals(interval_lists):
+    """
+    Times covered by every list of disjoint intervals, by one sweep over all boundaries
+    """
+    events = []
+    for intervals in interval_lists:
+        for start, end in intervals:
+            events.append((start, 1))
+            events.append((end, -1))
+    
+    # Ends sort before starts at the same instant, so touching intervals do not overlap
+    events.sort()
+    
+    required = len(interval_lists)
+    common = []
+    depth = 0
+    opened_at = None
+    for instant, delta in events:
+        depth += delta
+        if delta == 1 and depth == required:
+            opened_at = instant
+        elif delta == -1 and opened_at is not None:
+            if instant > opened_at:
+                common.append((opened_at, instant))
+            opened_at = None
+    return common
+
+def working_windows(start, end):
+    """
+    Weekday interview hours in INTERVIEW_TIMEZONE between two epoch times
+    """
+    zone = pytz.timezone(INTERVIEW_TIMEZONE)
+    day = datetime.fromtimestamp(start, zone).date()
+    last_day = datetime.fromtimestamp(end, zone).date()
+    
+    windows = []
+    while day <= last_day:
+        if day.weekday() < 5:
+            window_start = int(zone.localize(datetime(day.year, day.month, day.day, INTERVIEW_DAY_START_HOUR)).timestamp())
+            window_end = int(zone.localize(datetime(day.year, day.month, day.day, INTERVIEW_DAY_END_HOUR)).timestamp())
+            window_start, window_end = max(window_start, start), min(window_end, end)
+            if window_start < window_end:
+                windows.append((window_start, window_end))
+        day += timedelta(days=1)
+    return windows
+
+def find_common_free_time(provider, calendars, start, end):
+    """
+    Interview hours in which every calendar is free
+    """
+    windows = working_windows(start, end)
+    busy = provider.get_busy(calendars, start, end)
+    return intersect_intervals([subtract_intervals(windows, merge_intervals(busy.get(calendar, []))) for calendar in calendars])
+
+def allocate_slots(free, count, duration, buffer, step):
+    """
+    Pack up to count interviews into free time, earliest first
+    
+    Each slot starts on a step boundary and is followed by the buffer before
+    the next one, so no two interviews overlap.
+    """
+    slots = []
+    for free_start, free_end in free:
+        cursor = -(-free_start // step) * step
+        while len(slots) < count and cursor + duration <= free_end:
+            slots.append((cursor, cursor + duration))
+            cursor = -(-(cursor + duration + buffer) // step) * step
+        if len(slots) >= count:
+            break
+    return slots
+
+def format_slot(start, end):
+    local_start = datetime.fromtimestamp(start, pytz.timezone(INTERVIEW_TIMEZONE))
+    return {
+        'start': to_rfc3339(start),
+        'end': to_rfc3339(end),
+        'formatted': local_start.strftime('%A, %B %d, %Y at %I:%M %p %Z')
+    }
+
+def find_available_interview_slots(count, calendars, provider=None, now=None):
+    """
+    Up to count non-overlapping interview slots in which every interviewer is free
+    """
+    provider = provider or get_calendar_provider()
+    now = int(now or time.time())
+    start = now + INTERVIEW_LEAD_HOURS * 3600
+    end = start + INTERVIEW_HORIZON_DAYS * 86400
+    
+    free = find_common_free_time(provider, calendars, start, end)
+    slots = allocate_slots(
+        free,
+        count,
+        INTERVIEW_DURATION_MINUTES * 60,
+        INTERVIEW_BUFFER_MINUTES * 60,
+        INTERVIEW_SLOT_STEP_MINUTES * 60
+    )
+    return slots
 
 def send_interview_invitation(candidate_data, interview_slot, hiring_manager_email, technical_staff_email):
     """
@@ -110,7 +377,7 @@ def send_interview_invitation(candidate_data, interview_slot, hiring_manager_ema
     """
     try:
         # Get candidate information
-        candidate_name = candidate_data.get('name', 'Candidate')
+        candidate_name = candidate_data.get('fullName') or candidate_data.get('name') or 'Candidate'
         candidate_email = candidate_data.get('email', '')
         
         if not candidate_email:
@@ -206,26 +473,21 @@ def update_candidate_interview(candidate_id, interview_slot, hiring_manager_emai
     Update the candidate's record with interview details
     """
     try:
-        update_expression = """
-        SET interview = :interview,
-            status = :status
-        """
-        
-        expression_values = {
-            ':interview': {
-                'datetime': interview_slot['formatted'],
-                'hiringManager': hiring_manager_email,
-                'technicalStaff': technical_staff_email,
-                'status': 'SCHEDULED',
-                'timestamp': int(time.time())
-            },
-            ':status': 'INTERVIEW_SCHEDULED'
-        }
-        
-        candidate_table.update_item(
-            Key={'id': candidate_id},
-            UpdateExpression=update_expression,
-            ExpressionAttributeValues=expression_values
+        transition_status(
+            candidate_id,
+            INTERVIEW_SCHEDULED,
+            set_fields={
+                'interview': {
+                    'datetime': interview_slot['formatted'],
+                    'start': interview_slot['start'],
+                    'end': interview_slot['end'],
+                    'calendarEventId': interview_slot.get('calendarEventId'),
+                    'hiringManager': hiring_manager_email,
+                    'technicalStaff': technical_staff_email,
+                    'status': 'SCHEDULED',
+                    'timestamp': int(time.time())
+                }
+            }
         )
         
         logger.info(f"Updated interview details for candidate {candidate_id}")
@@ -233,53 +495,267 @@ def update_candidate_interview(candidate_id, interview_slot, hiring_manager_emai
     
     except Exception as e:
         logger.error(f"Error updating interview details: {str(e)}")
+        raise
+
+def send_invitation_once(candidate_data, interview_slot):
+    """
+    Send the interview invitation and record that it went out, so a retried
+    request does not send it again
+    """
+    send_interview_invitation(candidate_data, interview_slot, HIRING_MANAGER_EMAIL, TECHNICAL_STAFF_EMAIL)
+    transition_status(candidate_data['id'], INTERVIEW_SCHEDULED, set_fields={'interview.invitationSent': True})
+
+def interviewer_lock_id(interviewers):
+    return '|'.join(sorted(interviewers))
+
+def acquire_interviewer_lock(interviewers, owner, lease_seconds):
+    """
+    Take the lease on the interviewers' calendars, waiting up to
+    SCHEDULING_LOCK_WAIT_SECONDS for a concurrent batch to release it.
+    Returns False if it stayed taken.
+    """
+    deadline = time.monotonic() + SCHEDULING_LOCK_WAIT_SECONDS
+    while True:
+        now = int(time.time())
+        try:
+            scheduling_lock_table.update_item(
+                Key={'lockId': interviewer_lock_id(interviewers)},
+                UpdateExpression="SET lockOwner = :owner, lockedUntil = :until",
+                ConditionExpression="attribute_not_exists(lockedUntil) OR lockedUntil < :now",
+                ExpressionAttributeValues={
+                    ':owner': owner,
+                    ':until': now + lease_seconds,
+                    ':now': now
+                }
+            )
+            return True
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') != 'ConditionalCheckFailedException':
+                raise
+        
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.5)
+
+def release_interviewer_lock(interviewers, owner):
+    """
+    Release the lease on the interviewers' calendars if this batch still holds it
+    """
+    try:
+        scheduling_lock_table.update_item(
+            Key={'lockId': interviewer_lock_id(interviewers)},
+            UpdateExpression="REMOVE lockOwner, lockedUntil",
+            ConditionExpression="lockOwner = :owner",
+            ExpressionAttributeValues={':owner': owner}
+        )
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') != 'ConditionalCheckFailedException':
+            raise
+        logger.warning("Scheduling lease expired before the batch finished")
+
+def schedule_interviews(candidate_ids, provider=None, lease_seconds=300):
+    """
+    Schedule interviews for a batch of candidates without double-booking
+    
+    Interviewer free/busy is read once for the batch and slots are handed
+    out earliest first; each booking is written to the calendar so later
+    batches see it. Slots are allocated and booked under a lease on the
+    interviewers' calendars, so batches running concurrently for other jobs
+    cannot pick the same slot. Only candidates whose status allows scheduling
+    are booked, and a booking whose status transition still fails is
+    cancelled. Bookings are keyed by candidate ID and the invitation is
+    recorded once sent, so a retried request reuses both. Returns a result
+    per candidate ID; candidates that could not be scheduled get an 'error'
+    entry, with 'retry' set when the failure may be transient.
+    """
+    provider = provider or get_calendar_provider()
+    interviewers = [HIRING_MANAGER_EMAIL, TECHNICAL_STAFF_EMAIL]
+    results = {}
+    
+    # Candidates already scheduled (redelivered requests) keep their interview
+    to_schedule = []
+    for candidate_id in dict.fromkeys(candidate_ids):
+        candidate_data = get_candidate_data(candidate_id)
+        if not candidate_data:
+            results[candidate_id] = {'error': f"No data found for candidate {candidate_id}"}
+            continue
+        
+        interview = candidate_data.get('interview')
+        if candidate_data.get('status') != INTERVIEW_SCHEDULED or not interview:
+            if candidate_data.get('status') not in ALLOWED_TRANSITIONS[INTERVIEW_SCHEDULED]:
+                results[candidate_id] = {'error': f"Candidate {candidate_id} in status {candidate_data.get('status')} cannot be scheduled"}
+                continue
+            to_schedule.append(candidate_data)
+            continue
+        
+        try:
+            if not interview.get('invitationSent'):
+                send_invitation_once(candidate_data, {
+                    'formatted': interview['datetime'],
+                    'start': interview.get('start'),
+                    'end': interview.get('end')
+                })
+            results[candidate_id] = {'interviewDateTime': interview['datetime']}
+        except Exception as e:
+            logger.error(f"Error sending interview invitation to candidate {candidate_id}: {str(e)}")
+            results[candidate_id] = {'error': str(e), 'retry': True}
+    
+    if not to_schedule:
+        return results
+    
+    lock_owner = str(uuid.uuid4())
+    if not acquire_interviewer_lock(interviewers, lock_owner, lease_seconds):
+        raise RuntimeError("Another scheduling batch is booking the interviewers' calendars")
+    
+    try:
+        book_interviews(to_schedule, interviewers, provider, results)
+    finally:
+        release_interviewer_lock(interviewers, lock_owner)
+    
+    return results
+
+def book_interviews(to_schedule, interviewers, provider, results):
+    """
+    Allocate slots from the interviewers' free/busy, book them and record
+    each candidate's interview, adding a result per candidate to results
+    """
+    slots = find_available_interview_slots(len(to_schedule), interviewers, provider)
+    logger.info(f"Found {len(slots)} interview slots for {len(to_schedule)} candidates")
+    
+    for index, candidate_data in enumerate(to_schedule):
+        candidate_id = candidate_data['id']
+        if index >= len(slots):
+            results[candidate_id] = {'error': "No available interview slots found"}
+            continue
+        
+        try:
+            candidate_name = candidate_data.get('fullName', candidate_id)
+            event_id = interview_event_id(candidate_id)
+            booked_start, booked_end = provider.book(
+                event_id,
+                interviewers,
+                slots[index][0],
+                slots[index][1],
+                f"Interview: {candidate_name}",
+                f"Technical interview with {candidate_name} (candidate {candidate_id})"
+            )
+            if (booked_start, booked_end) != slots[index]:
+                logger.info(f"Candidate {candidate_id} already had an interview booked, keeping it")
+            selected_slot = format_slot(booked_start, booked_end)
+            selected_slot['calendarEventId'] = event_id
+            
+            # Update the candidate's record, then send the invitation
+            try:
+                update_candidate_interview(candidate_id, selected_slot, HIRING_MANAGER_EMAIL, TECHNICAL_STAFF_EMAIL)
+            except StatusTransitionError:
+                # The status changed since it was read; free the slot again
+                provider.cancel(event_id)
+                raise
+            send_invitation_once(candidate_data, selected_slot)
+            
+            results[candidate_id] = {'interviewDateTime': selected_slot['formatted']}
+        except StatusTransitionError as e:
+            logger.error(f"Candidate {candidate_id} cannot be scheduled: {str(e)}")
+            results[candidate_id] = {'error': str(e)}
+        except Exception as e:
+            logger.error(f"Error scheduling interview for candidate {candidate_id}: {str(e)}")
+            results[candidate_id] = {'error': str(e), 'retry': True}
+
+def resume_scheduling_request(request, result):
+    """
+    Resume the execution waiting on a scheduling request with its result
+    
+    Returns False if Step Functions could not be reached, so the request is
+    redelivered; a token that already completed or timed out counts as done.
+    """
+    candidate_id = request['candidateId']
+    try:
+        if 'error' in result:
+            sfn_client.send_task_failure(
+                taskToken=request['taskToken'],
+                error='SchedulingFailed',
+                cause=result['error'][:256]
+            )
+            return True
+        
+        sfn_client.send_task_success(
+            taskToken=request['taskToken'],
+            output=json.dumps({
+                'statusCode': 200,
+                'candidateId': candidate_id,
+                'interviewScheduled': True,
+                'interviewDateTime': result['interviewDateTime'],
+                'hiringManager': HIRING_MANAGER_EMAIL,
+                'technicalStaff': TECHNICAL_STAFF_EMAIL
+            })
+        )
+        return True
+    
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') in CLOSED_TASK_ERRORS:
+            logger.info(f"Scheduling request for candidate {candidate_id} is no longer awaited: {str(e)}")
+            return True
+        logger.error(f"Error resuming scheduling request for candidate {candidate_id}: {str(e)}")
+        return False
+    
+    except Exception as e:
+        logger.error(f"Error resuming scheduling request for candidate {candidate_id}: {str(e)}")
         return False
 
+def process_scheduling_requests(records, context=None):
+    """
+    Schedule queued requests as one batch and resume each waiting execution
+    
+    Requests that failed transiently, or whose execution could not be
+    resumed, are returned as batch item failures so only they are redelivered.
+    Requests are grouped by job, so a request that keeps failing only holds
+    up its own job's group.
+    """
+    requests = [(record, json.loads(record['body'])) for record in records]
+    lease_seconds = int(context.get_remaining_time_in_millis() / 1000) if context else 300
+    
+    try:
+        results = schedule_interviews([request['candidateId'] for _, request in requests], lease_seconds=lease_seconds)
+    except Exception as e:
+        logger.error(f"Error scheduling interviews: {str(e)}")
+        results = {request['candidateId']: {'error': str(e), 'retry': True} for _, request in requests}
+    
+    failures = []
+    for record, request in requests:
+        result = results[request['candidateId']]
+        if result.get('retry') or not resume_scheduling_request(request, result):
+            failures.append({'itemIdentifier': record['messageId']})
+    
+    logger.info(f"Processed {len(records)} scheduling requests, {len(failures)} to retry")
+    return {'batchItemFailures': failures}
+
 def lambda_handler(event, context):
     """
     Lambda handler for scheduling interviews
     """
     logger.info(f"Received event: {json.dumps(event)}")
     
+    # Queued scheduling requests from the Step Functions workflow
+    if event.get('Records') and event['Records'][0].get('eventSource') == 'aws:sqs':
+        return process_scheduling_requests(event['Records'], context)
+    
     try:
         # Extract candidate ID and job ID from event
         if 'candidateId' not in event:
             raise ValueError("Missing required parameter: candidateId")
         
         candidate_id = event['candidateId']
-        
-        # Get the candidate data
-        candidate_data = get_candidate_data(candidate_id)
-        if not candidate_data:
-            raise ValueError(f"No data found for candidate {candidate_id}")
-        
-        # For this example, we'll use hardcoded email addresses
-        # In a real implementation, these would come from configuration or the event
-        hiring_manager_email = "hiring_manager@example.com"
-        technical_staff_email = "tech_staff@example.com"
-        
-        # Find available interview slots
-        available_slots = find_available_interview_slots(hiring_manager_email, technical_staff_email)
-        
-        if not available_slots:
-            raise ValueError("No available interview slots found")
-        
-        # Select the first available slot
-        selected_slot = available_slots[0]
-        
-        # Send the interview invitation
-        send_interview_invitation(candidate_data, selected_slot, hiring_manager_email, technical_staff_email)
-        
-        # Update the candidate's record
-        update_candidate_interview(candidate_id, selected_slot, hiring_manager_email, technical_staff_email)
+        result = schedule_interviews([candidate_id])[candidate_id]
+        if 'error' in result:
+            raise ValueError(result['error'])
         
         return {
             'statusCode': 200,
             'candidateId': candidate_id,
             'interviewScheduled': True,
-            'interviewDateTime': selected_slot['formatted'],
-            'hiringManager': hiring_manager_email,
-            'technicalStaff': technical_staff_email
+            'interviewDateTime': result['interviewDateTime'],
+            'hiringManager': HIRING_MANAGER_EMAIL,
+            'technicalStaff': TECHNICAL_STAFF_EMAIL
         }
     
     except Exception as e:
@@ -288,4 +764,4 @@ def lambda_handler(event, context):
             'statusCode': 500,
             'error': str(e),
             'interviewScheduled': False
-        }
\ No newline at end of file
+        }
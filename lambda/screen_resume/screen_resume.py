@@ -1,20 +1,50 @@
 import json
+import gzip
+import hashlib
 import boto3
 import os
+import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
+from functools import lru_cache
+from botocore.config import Config
+from job_descriptions import get_job_description
+from candidate_records import SCREENED, get_record, transition_status
 
 # Configure logging
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Batch screening configuration
+SCREENING_CONCURRENCY = int(os.environ.get('SCREENING_CONCURRENCY', '8'))
+BATCH_GET_CHUNK_SIZE = 100
+BATCH_MAX_RETRIES = 5
+
+# Send the per-job prompt prefix as a cache point (requires a model with Bedrock prompt caching).
+# Prefixes shorter than the model's minimum cacheable length (1,024 tokens for
+# Claude Sonnet models) are never cached, so they are sent without one
+PROMPT_CACHING_ENABLED = os.environ.get('PROMPT_CACHING_ENABLED', 'false').lower() == 'true'
+PROMPT_CACHE_MIN_TOKENS = int(os.environ.get('PROMPT_CACHE_MIN_TOKENS', '1024'))
+# Rough token estimate for English prompt text
+CHARS_PER_TOKEN = 4
+METRICS_NAMESPACE = 'ResumeScreening'
+
 # Initialize AWS clients
-bedrock = boto3.client('bedrock-runtime')
+bedrock = boto3.client(
+    'bedrock-runtime',
+    config=Config(max_pool_connections=SCREENING_CONCURRENCY + 2)
+)
+s3_client = boto3.client(
+    's3',
+    config=Config(max_pool_connections=SCREENING_CONCURRENCY + 2)
+)
 dynamodb = boto3.resource('dynamodb')
 
 # Get environment variables
 BEDROCK_MODEL_ID = os.environ['BEDROCK_MODEL_ID']
 DYNAMODB_TABLE = os.environ['DYNAMODB_TABLE']
+RESUME_BUCKET = os.environ['RESUME_BUCKET']
 candidate_table = dynamodb.Table(DYNAMODB_TABLE)
 
 # JSON helper class for Decimal types
@@ -29,41 +59,51 @@ def get_resume_data(candidate_id):
     Retrieve resume data from DynamoDB
     """
     try:
-        response = candidate_table.get_item(
-            Key={'id': candidate_id}
-        )
+        record = get_record(candidate_id)
         
-        if 'Item' not in response:
+        if record is None:
             logger.error(f"No data found for candidate {candidate_id}")
             return None
         
-        return response['Item']
+        return record
     
     except Exception as e:
         logger.error(f"Error retrieving resume data: {str(e)}")
         return None
 
-def evaluate_resume_with_bedrock(resume_text, job_id):
+def load_resume_text(resume_data):
     """
-    Use Amazon Bedrock to evaluate a resume for job fit
+    Lazily load the extracted resume text referenced by a candidate item
     """
-    try:
-        # Get job description for the given job_id
-        # This is a placeholder - in a real implementation, you would retrieve 
-        # the job description from a database or other source
-        job_description = get_job_description(job_id)
-        
-        # Construct the prompt for Bedrock
-        prompt = f"""
+    # Items written before text was offloaded to S3 still carry it inline
+    if 'resumeTextKey' not in resume_data:
+        return resume_data.get('resumeText')
+    
+    response = s3_client.get_object(
+        Bucket=RESUME_BUCKET,
+        Key=resume_data['resumeTextKey']
+    )
+    text_bytes = gzip.decompress(response['Body'].read())
+    
+    expected_digest = resume_data.get('resumeTextDigest')
+    if expected_digest and hashlib.sha256(text_bytes).hexdigest() != expected_digest:
+        raise ValueError(f"Resume text digest mismatch for {resume_data['resumeTextKey']}")
+    
+    return text_bytes.decode('utf-8')
+
+@lru_cache(maxsize=128)
+def build_prompt_prefix(job_description):
+    """
+    Build the stable per-job part of the screening prompt
+    Memoized on the job description text, so an edited posting gets a new prefix
+    """
+    return f"""
         You are an expert HR recruiter with deep experience in technical recruitment.
         
         JOB DESCRIPTION:
         {job_description}
         
-        CANDIDATE RESUME:
-        {resume_text}
-        
-        Please evaluate this resume against the job description and provide:
+        You will be given a candidate resume. Please evaluate it against the job description and provide:
         
         1. A score from 0 to 100 representing how well the candidate matches the job requirements
         2. A brief assessment (maximum 300 words) highlighting strengths and weaknesses
@@ -80,9 +120,73 @@ def evaluate_resume_with_bedrock(resume_text, job_id):
             "recommendation": "<PROCEED or REJECT>"
         }}
         """
+
+def build_prompt_content(job_description, resume_text):
+    """
+    Build the message content: the cacheable job prefix followed by the resume
+    """
+    prefix_block = {
+        "type": "text",
+        "text": build_prompt_prefix(job_description)
+    }
+    if PROMPT_CACHING_ENABLED and len(prefix_block["text"]) // CHARS_PER_TOKEN >= PROMPT_CACHE_MIN_TOKENS:
+        prefix_block["cache_control"] = {"type": "ephemeral"}
+    
+    return [
+        prefix_block,
+        {
+            "type": "text",
+            "text": f"""
+        CANDIDATE RESUME:
+        {resume_text}
+        """
+        }
+    ]
+
+def report_token_usage(job_id, usage):
+    """
+    Emit per-call token usage and prompt cache effectiveness as CloudWatch embedded metrics
+    """
+    input_tokens = usage.get('input_tokens', 0)
+    cache_read_tokens = usage.get('cache_read_input_tokens', 0)
+    cache_write_tokens = usage.get('cache_creation_input_tokens', 0)
+    prompt_tokens = input_tokens + cache_read_tokens + cache_write_tokens
+    
+    print(json.dumps({
+        '_aws': {
+            'Timestamp': int(time.time() * 1000),
+            'CloudWatchMetrics': [{
+                'Namespace': METRICS_NAMESPACE,
+                'Dimensions': [['Function']],
+                'Metrics': [
+                    {'Name': 'InputTokens', 'Unit': 'Count'},
+                    {'Name': 'OutputTokens', 'Unit': 'Count'},
+                    {'Name': 'CacheReadInputTokens', 'Unit': 'Count'},
+                    {'Name': 'CacheWriteInputTokens', 'Unit': 'Count'},
+                    {'Name': 'PromptCacheHitRatio', 'Unit': 'None'}
+                ]
+            }]
+        },
+        'Function': 'ScreenResume',
+        'jobId': job_id,
+        'InputTokens': input_tokens,
+        'OutputTokens': usage.get('output_tokens', 0),
+        'CacheReadInputTokens': cache_read_tokens,
+        'CacheWriteInputTokens': cache_write_tokens,
+        'PromptCacheHitRatio': round(cache_read_tokens / prompt_tokens, 4) if prompt_tokens else 0
+    }))
+
+def evaluate_resume_with_bedrock(resume_text, job_id, model_client=None):
+    """
+    Use Amazon Bedrock to evaluate a resume for job fit
+    """
+    model_client = model_client or bedrock
+    try:
+        # Get job description for the given job_id (cached per container)
+        job_description = get_job_description(job_id)
         
-        # Call Bedrock with the prompt
-        response = bedrock.invoke_model(
+        # Call Bedrock with the per-job prefix and the per-candidate resume
+        response = model_client.invoke_model(
             modelId=BEDROCK_MODEL_ID,
             body=json.dumps({
                 "anthropic_version": "bedrock-2023-05-31",
@@ -91,7 +195,7 @@ def evaluate_resume_with_bedrock(resume_text, job_id):
                 "messages": [
                     {
                         "role": "user", 
-                        "content": prompt
+                        "content": build_prompt_content(job_description, resume_text)
                     }
                 ]
             })
@@ -100,6 +204,7 @@ def evaluate_resume_with_bedrock(resume_text, job_id):
         # Parse the response
         response_body = json.loads(response['body'].read().decode('utf-8'))
         assistant_response = response_body['content'][0]['text']
+        report_token_usage(job_id, response_body.get('usage', {}))
         
         try:
             # Extract the JSON part from the response
@@ -129,90 +234,14 @@ def evaluate_resume_with_bedrock(resume_text, job_id):
         logger.error(f"Error evaluating resume with Bedrock: {str(e)}")
         raise
 
-def get_job_description(job_id):
+def score_bucket(evaluation):
     """
-    Get job description for a given job ID
-    This is a placeholder function - in a real implementation,
-    you would retrieve this from a database
+    Integer 0-100 score used as the JobScoreIndex sort key for ranking
     """
-    # Sample job descriptions for different job IDs
-    job_descriptions = {
-        "software-engineer": """
-        Software Engineer
-        
-        Responsibilities:
-        - Design, develop, and maintain high-quality software solutions
-        - Write clean, efficient, and maintainable code
-        - Collaborate with cross-functional teams to define and implement new features
-        - Troubleshoot and debug applications
-        - Participate in code reviews and contribute to team knowledge sharing
-        
-        Requirements:
-        - Bachelor's degree in Computer Science or related field
-        - 3+ years of experience in software development
-        - Proficiency in Python, Java, or similar programming languages
-        - Experience with cloud technologies (AWS, Azure, or GCP)
-        - Knowledge of software engineering best practices
-        - Strong problem-solving skills and attention to detail
-        - Excellent communication and teamwork abilities
-        """,
-        
-        "data-scientist": """
-        Data Scientist
-        
-        Responsibilities:
-        - Develop and implement advanced analytics models and algorithms
-        - Process, cleanse, and validate data for analysis
-        - Build and optimize classifiers using machine learning techniques
-        - Identify patterns and insights in large datasets
-        - Present findings to stakeholders and recommend solutions
-        
-        Requirements:
-        - Master's or PhD in Data Science, Computer Science, Statistics, or related field
-        - 2+ years of experience in data science or related field
-        - Strong programming skills in Python, R, or similar languages
-        - Experience with machine learning libraries (e.g., TensorFlow, PyTorch, scikit-learn)
-        - Knowledge of data visualization techniques and tools
-        - Excellent problem-solving and analytical thinking skills
-        - Ability to communicate complex findings to technical and non-technical audiences
-        """,
-        
-        "devops-engineer": """
-        DevOps Engineer
-        
-        Responsibilities:
-        - Build and maintain CI/CD pipelines
-        - Implement and manage infrastructure as code using tools like Terraform
-        - Monitor system performance and troubleshoot issues
-        - Automate deployment processes and system configurations
-        - Collaborate with development and operations teams
-        
-        Requirements:
-        - Bachelor's degree in Computer Science or related field
-        - 3+ years of experience in DevOps or related roles
-        - Strong knowledge of Linux/Unix systems administration
-        - Experience with containerization technologies (Docker, Kubernetes)
-        - Proficiency in scripting languages (Python, Bash, etc.)
-        - Experience with CI/CD tools (Jenkins, GitLab CI, GitHub Actions)
-        - Knowledge of cloud platforms (AWS, Azure, or GCP)
-        """
-    }
-    
-    # Return the job description for the given job ID, or a default one if not found
-    return job_descriptions.get(job_id, """
-    Generic Technical Position
-    
-    Responsibilities:
-    - Contribute to technical projects and initiatives
-    - Collaborate with team members and stakeholders
-    - Ensure high-quality deliverables and outcomes
-    
-    Requirements:
-    - Technical degree or equivalent experience
-    - Strong problem-solving skills
-    - Ability to work in a collaborative environment
-    - Good communication skills
-    """)
+    try:
+        return max(0, min(100, int(round(float(evaluation.get('score', 0))))))
+    except (TypeError, ValueError):
+        return 0
 
 def update_candidate_screening(candidate_id, evaluation):
     """
@@ -223,16 +252,13 @@ def update_candidate_screening(candidate_id, evaluation):
         if isinstance(evaluation.get('score'), (int, float)):
             evaluation['score'] = Decimal(str(evaluation['score']))
         
-        update_expression = "SET screening = :screening, status = :status"
-        expression_values = {
-            ':screening': evaluation,
-            ':status': 'SCREENED'
-        }
-        
-        candidate_table.update_item(
-            Key={'id': candidate_id},
-            UpdateExpression=update_expression,
-            ExpressionAttributeValues=expression_values
+        transition_status(
+            candidate_id,
+            SCREENED,
+            set_fields={
+                'screening': evaluation,
+                'screeningScore': score_bucket(evaluation)
+            }
         )
         
         logger.info(f"Updated screening results for candidate {candidate_id}")
@@ -242,6 +268,120 @@ def update_candidate_screening(candidate_id, evaluation):
         logger.error(f"Error updating screening results: {str(e)}")
         return False
 
+def batch_get_candidates(candidate_ids):
+    """
+    Fetch candidate items with BatchGetItem, retrying unprocessed keys
+    """
+    items = []
+    unique_ids = list(dict.fromkeys(candidate_ids))
+    
+    for start in range(0, len(unique_ids), BATCH_GET_CHUNK_SIZE):
+        request = {
+            DYNAMODB_TABLE: {
+                'Keys': [{'id': candidate_id} for candidate_id in unique_ids[start:start + BATCH_GET_CHUNK_SIZE]]
+            }
+        }
+        
+        for attempt in range(BATCH_MAX_RETRIES + 1):
+            response = dynamodb.batch_get_item(RequestItems=request)
+            items.extend(response.get('Responses', {}).get(DYNAMODB_TABLE, []))
+            request = response.get('UnprocessedKeys') or {}
+            if not request:
+                break
+            time.sleep(min(2, 0.05 * (2 ** attempt)))
+        
+        if request:
+            logger.error(f"Unprocessed keys remained after {BATCH_MAX_RETRIES} retries")
+    
+    return items
+
+def screen_candidate(resume_data, job_id, model_client):
+    """
+    Load one candidate's resume text and evaluate it
+    """
+    resume_text = load_resume_text(resume_data)
+    if not resume_text:
+        raise ValueError(f"No resume text found for candidate {resume_data['id']}")
+    
+    return evaluate_resume_with_bedrock(resume_text, job_id, model_client)
+
+def evaluate_batch(candidates, job_id, model_client=None, max_workers=SCREENING_CONCURRENCY):
+    """
+    Evaluate many candidates concurrently with a bounded worker pool
+    Returns a tuple of (evaluations by candidate ID, errors by candidate ID)
+    """
+    model_client = model_client or bedrock
+    evaluations = {}
+    errors = {}
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            candidate['id']: executor.submit(screen_candidate, candidate, job_id, model_client)
+            for candidate in candidates
+        }
+        
+        for candidate_id, future in futures.items():
+            try:
+                evaluations[candidate_id] = future.result()
+            except Exception as e:
+                logger.error(f"Error screening candidate {candidate_id}: {str(e)}")
+                errors[candidate_id] = str(e)
+    
+    return evaluations, errors
+
+def write_screening_results(evaluations, max_workers=SCREENING_CONCURRENCY):
+    """
+    Write screening results back with one conditional status transition per
+    candidate, concurrently, so updates other stages made meanwhile are kept
+    Returns the IDs of candidates whose results could not be written
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        written = dict(zip(
+            evaluations,
+            executor.map(lambda item: update_candidate_screening(*item), evaluations.items())
+        ))
+    
+    return [candidate_id for candidate_id, ok in written.items() if not ok]
+
+def screen_batch(job_id, candidate_ids):
+    """
+    Screen a batch of candidates for one job
+    """
+    started = time.monotonic()
+    
+    candidates = [c for c in batch_get_candidates(candidate_ids) if c.get('jobId', job_id) == job_id]
+    missing = set(candidate_ids) - {c['id'] for c in candidates}
+    
+    evaluations, errors = evaluate_batch(candidates, job_id)
+    for candidate_id in write_screening_results(evaluations):
+        errors[candidate_id] = 'Screening results could not be written'
+        del evaluations[candidate_id]
+    
+    for candidate_id in missing:
+        errors[candidate_id] = 'Candidate not found'
+    
+    elapsed = time.monotonic() - started
+    logger.info(
+        f"Screened {len(evaluations)} candidates for job {job_id} in {elapsed:.2f}s "
+        f"({len(evaluations) / elapsed if elapsed else 0:.1f}/s), {len(errors)} failed"
+    )
+    
+    return {
+        'statusCode': 200,
+        'jobId': job_id,
+        'screenedCount': len(evaluations),
+        'results': [
+            {
+                'candidateId': candidate_id,
+                'score': float(evaluation.get('score', 0)),
+                'recommendation': evaluation.get('recommendation')
+            }
+            for candidate_id, evaluation in evaluations.items()
+        ],
+        'errors': errors,
+        'screened': True
+    }
+
 def lambda_handler(event, context):
     """
     Lambda handler for screening resumes
@@ -249,6 +389,13 @@ def lambda_handler(event, context):
     logger.info(f"Received event: {json.dumps(event)}")
     
     try:
+        # Batch mode: screen a list of candidates for one job
+        if 'candidateIds' in event:
+            if 'jobId' not in event:
+                raise ValueError("Missing required parameter: jobId")
+            
+            return screen_batch(event['jobId'], event['candidateIds'])
+        
         # Extract candidate ID and job ID from event
         if 'candidateId' not in event or 'jobId' not in event:
             raise ValueError("Missing required parameters: candidateId and jobId")
@@ -258,11 +405,12 @@ def lambda_handler(event, context):
         
         # Get the resume data
         resume_data = get_resume_data(candidate_id)
-        if not resume_data or 'resumeText' not in resume_data:
+        resume_text = load_resume_text(resume_data) if resume_data else None
+        if not resume_text:
             raise ValueError(f"No resume text found for candidate {candidate_id}")
         
         # Evaluate the resume using Bedrock
-        evaluation = evaluate_resume_with_bedrock(resume_data['resumeText'], job_id)
+        evaluation = evaluate_resume_with_bedrock(resume_text, job_id)
         
         # Update the candidate's record with screening results
         update_candidate_screening(candidate_id, evaluation)
@@ -282,4 +430,4 @@ def lambda_handler(event, context):
             'statusCode': 500,
             'error': str(e),
             'screened': False
-        }
\ No newline at end of file
+        }
@@ -17,6 +17,18 @@ resource "aws_s3_bucket_versioning" "resume_bucket_versioning" {
   }
 }
 
+# Browsers upload resumes directly with presigned POSTs issued by the applications API
+resource "aws_s3_bucket_cors_configuration" "resume_bucket_cors" {
+  bucket = aws_s3_bucket.resume_bucket.id
+
+  cors_rule {
+    allowed_methods = ["POST"]
+    allowed_origins = ["*"]
+    allowed_headers = ["*"]
+    max_age_seconds = 3000
+  }
+}
+
 resource "aws_s3_bucket_public_access_block" "resume_bucket_block" {
   bucket = aws_s3_bucket.resume_bucket.id
 
@@ -26,6 +38,129 @@ resource "aws_s3_bucket_public_access_block" "resume_bucket_block" {
   restrict_public_buckets = true
 }
 
+#------------------------------------------------------------
+# SNS Topic for Textract Job Completion Notifications
+#------------------------------------------------------------
+resource "aws_sns_topic" "textract_completion" {
+  name = "ResumeTextractJobCompletion"
+}
+
+# Role assumed by Textract to publish job completion notifications
+resource "aws_iam_role" "textract_publish_role" {
+  name = "ResumeScreeningTextractPublishRole"
+  
+  assume_role_policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Action = "sts:AssumeRole"
+        Effect = "Allow"
+        Principal = {
+          Service = "textract.amazonaws.com"
+        }
+      }
+    ]
+  })
+}
+
+resource "aws_iam_role_policy" "textract_publish_policy" {
+  name = "ResumeScreeningTextractPublishPolicy"
+  role = aws_iam_role.textract_publish_role.id
+  
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [
+      {
+        Effect   = "Allow"
+        Action   = ["sns:Publish"]
+        Resource = aws_sns_topic.textract_completion.arn
+      }
+    ]
+  })
+}
+
+# Deliver completion notifications to the extraction continuation handler
+resource "aws_sns_topic_subscription" "textract_completion_lambda" {
+  topic_arn = aws_sns_topic.textract_completion.arn
+  protocol  = "lambda"
+  endpoint  = aws_lambda_function.extract_text_lambda.arn
+}
+
+resource "aws_lambda_permission" "allow_sns_invoke" {
+  statement_id  = "AllowExecutionFromTextractSNS"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.extract_text_lambda.function_name
+  principal     = "sns.amazonaws.com"
+  source_arn    = aws_sns_topic.textract_completion.arn
+}
+
+#------------------------------------------------------------
+# SQS Queue for Debounced Candidate Ranking
+#------------------------------------------------------------
+resource "aws_sqs_queue" "ranking_requests" {
+  name                       = "ResumeRankingRequests"
+  visibility_timeout_seconds = 720
+  message_retention_seconds  = 86400
+
+  redrive_policy = jsonencode({
+    deadLetterTargetArn = aws_sqs_queue.ranking_requests_dlq.arn
+    maxReceiveCount     = 5
+  })
+}
+
+resource "aws_sqs_queue" "ranking_requests_dlq" {
+  name                      = "ResumeRankingRequestsDLQ"
+  message_retention_seconds = 1209600
+}
+
+# Requests queued within the batching window are ranked in one pass per job;
+# passes for the same job are serialised by a lease on its ranking state
+resource "aws_lambda_event_source_mapping" "ranking_requests_lambda" {
+  event_source_arn                   = aws_sqs_queue.ranking_requests.arn
+  function_name                      = aws_lambda_function.rank_candidates_lambda.arn
+  batch_size                         = 500
+  maximum_batching_window_in_seconds = var.ranking_debounce_seconds
+  function_response_types            = ["ReportBatchItemFailures"]
+
+  scaling_config {
+    maximum_concurrency = 2
+  }
+}
+
+#------------------------------------------------------------
+# SQS Queue for Batched Interview Scheduling
+#------------------------------------------------------------
+# FIFO with one message group per job, so a request that keeps failing only
+# holds up its own job; batches for different jobs book under a lease on the
+# interviewers' calendars (InterviewSchedulingLocks)
+resource "aws_sqs_queue" "scheduling_requests" {
+  name                        = "InterviewSchedulingRequests.fifo"
+  fifo_queue                  = true
+  content_based_deduplication = true
+  visibility_timeout_seconds  = 1800
+  message_retention_seconds   = 86400
+
+  redrive_policy = jsonencode({
+    deadLetterTargetArn = aws_sqs_queue.scheduling_requests_dlq.arn
+    maxReceiveCount     = 5
+  })
+}
+
+resource "aws_sqs_queue" "scheduling_requests_dlq" {
+  name                      = "InterviewSchedulingRequestsDLQ.fifo"
+  fifo_queue                = true
+  message_retention_seconds = 1209600
+}
+
+# Candidates in one batch share one free/busy lookup; the batch size keeps a
+# batch's bookings, emails and record updates well inside the Lambda timeout
+resource "aws_lambda_event_source_mapping" "scheduling_requests_lambda" {
+  event_source_arn        = aws_sqs_queue.scheduling_requests.arn
+  function_name           = aws_lambda_function.schedule_interview_lambda.arn
+  batch_size              = 10
+  function_response_types = ["ReportBatchItemFailures"]
+}
+
 #------------------------------------------------------------
 # DynamoDB Table for Candidate Rankings and Tracking
 #------------------------------------------------------------
@@ -34,6 +169,10 @@ resource "aws_dynamodb_table" "candidate_table" {
   billing_mode   = "PAY_PER_REQUEST"
   hash_key       = "id"
   
+  # Status transitions are pushed to status page subscribers from the stream
+  stream_enabled   = true
+  stream_view_type = "NEW_AND_OLD_IMAGES"
+  
   attribute {
     name = "id"
     type = "S"
@@ -49,6 +188,11 @@ resource "aws_dynamodb_table" "candidate_table" {
     type = "N"
   }
   
+  attribute {
+    name = "screeningScore"
+    type = "N"
+  }
+  
   global_secondary_index {
     name               = "JobRankingIndex"
     hash_key           = "jobId"
@@ -56,11 +200,143 @@ resource "aws_dynamodb_table" "candidate_table" {
     projection_type    = "ALL"
   }
   
+  # Used by incremental ranking to find candidates whose top-5% flag flips
+  global_secondary_index {
+    name               = "JobScoreIndex"
+    hash_key           = "jobId"
+    range_key          = "screeningScore"
+    projection_type    = "INCLUDE"
+    non_key_attributes = ["status"]
+  }
+  
   tags = {
     Name = "CandidateTrackingTable"
   }
 }
 
+#------------------------------------------------------------
+# DynamoDB Table for Per-Job Ranking State (score histograms)
+#------------------------------------------------------------
+resource "aws_dynamodb_table" "ranking_state_table" {
+  name           = "JobRankingState"
+  billing_mode   = "PAY_PER_REQUEST"
+  hash_key       = "jobId"
+  
+  attribute {
+    name = "jobId"
+    type = "S"
+  }
+  
+  tags = {
+    Name = "JobRankingStateTable"
+  }
+}
+
+#------------------------------------------------------------
+# DynamoDB Table for Content-Addressed Extraction Cache
+#------------------------------------------------------------
+resource "aws_dynamodb_table" "extraction_cache_table" {
+  name           = "ResumeExtractionCache"
+  billing_mode   = "PAY_PER_REQUEST"
+  hash_key       = "contentDigest"
+  
+  attribute {
+    name = "contentDigest"
+    type = "S"
+  }
+  
+  ttl {
+    attribute_name = "expiresAt"
+    enabled        = true
+  }
+  
+  tags = {
+    Name = "ResumeExtractionCacheTable"
+  }
+}
+
+#------------------------------------------------------------
+# DynamoDB Table for Phone Interview Correlation (contact -> waiting workflow)
+#------------------------------------------------------------
+resource "aws_dynamodb_table" "phone_interview_contacts_table" {
+  name           = "PhoneInterviewContacts"
+  billing_mode   = "PAY_PER_REQUEST"
+  hash_key       = "contactId"
+  
+  attribute {
+    name = "contactId"
+    type = "S"
+  }
+  
+  ttl {
+    attribute_name = "expiresAt"
+    enabled        = true
+  }
+  
+  tags = {
+    Name = "PhoneInterviewContactsTable"
+  }
+}
+
+#------------------------------------------------------------
+# DynamoDB Table for the Phone Screen Queue
+#------------------------------------------------------------
+resource "aws_dynamodb_table" "phone_screen_queue_table" {
+  name           = "PhoneScreenQueue"
+  billing_mode   = "PAY_PER_REQUEST"
+  hash_key       = "candidateId"
+  
+  attribute {
+    name = "candidateId"
+    type = "S"
+  }
+  
+  attribute {
+    name = "queueStatus"
+    type = "S"
+  }
+  
+  attribute {
+    name = "priorityKey"
+    type = "S"
+  }
+  
+  # Pending screens in rank-score order, and the count of calls in flight
+  global_secondary_index {
+    name               = "QueueStatusIndex"
+    hash_key           = "queueStatus"
+    range_key          = "priorityKey"
+    projection_type    = "ALL"
+  }
+  
+  ttl {
+    attribute_name = "expiresAt"
+    enabled        = true
+  }
+  
+  tags = {
+    Name = "PhoneScreenQueueTable"
+  }
+}
+
+#------------------------------------------------------------
+# DynamoDB Table for Interview Scheduling Leases
+#------------------------------------------------------------
+resource "aws_dynamodb_table" "interview_scheduling_lock_table" {
+  name           = "InterviewSchedulingLocks"
+  billing_mode   = "PAY_PER_REQUEST"
+  hash_key       = "lockId"
+  
+  attribute {
+    name = "lockId"
+    type = "S"
+  }
+  
+  tags = {
+    Name = "InterviewSchedulingLocksTable"
+  }
+}
+
 #------------------------------------------------------------
 # Amazon OpenSearch Service for Vector Search
 #------------------------------------------------------------
@@ -194,6 +470,13 @@ resource "aws_iam_policy" "lambda_custom_policy" {
         ]
         Resource = "*"
       },
+      {
+        Effect = "Allow"
+        Action = [
+          "iam:PassRole"
+        ]
+        Resource = aws_iam_role.textract_publish_role.arn
+      },
       {
         Effect = "Allow"
         Action = [
@@ -211,7 +494,10 @@ resource "aws_iam_policy" "lambda_custom_policy" {
         Effect = "Allow"
         Action = [
           "dynamodb:GetItem",
+          "dynamodb:BatchGetItem",
           "dynamodb:PutItem",
+          "dynamodb:BatchWriteItem",
+          "dynamodb:PartiQLUpdate",
           "dynamodb:UpdateItem",
           "dynamodb:DeleteItem",
           "dynamodb:Query",
@@ -219,14 +505,23 @@ resource "aws_iam_policy" "lambda_custom_policy" {
         ]
         Resource = [
           aws_dynamodb_table.candidate_table.arn,
-          "${aws_dynamodb_table.candidate_table.arn}/index/*"
+          "${aws_dynamodb_table.candidate_table.arn}/index/*",
+          aws_dynamodb_table.extraction_cache_table.arn,
+          aws_dynamodb_table.ranking_state_table.arn,
+          aws_dynamodb_table.phone_interview_contacts_table.arn,
+          aws_dynamodb_table.phone_screen_queue_table.arn,
+          "${aws_dynamodb_table.phone_screen_queue_table.arn}/index/*",
+          aws_dynamodb_table.interview_scheduling_lock_table.arn,
+          aws_dynamodb_table.job_table.arn,
+          "${aws_dynamodb_table.job_table.arn}/index/*"
         ]
       },
       {
         Effect = "Allow"
         Action = [
           "connect:StartOutboundVoiceContact",
-          "connect:StopContact"
+          "connect:StopContact",
+          "connect:GetContactAttributes"
         ]
         Resource = "*"
       },
@@ -241,9 +536,23 @@ resource "aws_iam_policy" "lambda_custom_policy" {
       {
         Effect = "Allow"
         Action = [
-          "states:StartExecution"
+          "states:StartExecution",
+          "states:SendTaskSuccess",
+          "states:SendTaskFailure"
         ]
         Resource = "*"  # Use wildcard to avoid circular dependency
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "sqs:ReceiveMessage",
+          "sqs:DeleteMessage",
+          "sqs:GetQueueAttributes"
+        ]
+        Resource = [
+          aws_sqs_queue.ranking_requests.arn,
+          aws_sqs_queue.scheduling_requests.arn
+        ]
       }
     ]
   })
@@ -291,6 +600,16 @@ resource "aws_iam_policy" "step_functions_policy" {
           aws_lambda_function.phone_interview_lambda.arn,
           aws_lambda_function.schedule_interview_lambda.arn
         ]
+      },
+      {
+        Effect = "Allow"
+        Action = [
+          "sqs:SendMessage"
+        ]
+        Resource = [
+          aws_sqs_queue.ranking_requests.arn,
+          aws_sqs_queue.scheduling_requests.arn
+        ]
       }
     ]
   })
@@ -314,12 +633,18 @@ resource "aws_lambda_function" "extract_text_lambda" {
   runtime       = "python3.11"
   timeout       = 60
   memory_size   = 512
+  layers        = [aws_lambda_layer_version.common_layer.arn]
 
   environment {
     variables = {
       RESUME_BUCKET = aws_s3_bucket.resume_bucket.bucket,
       DYNAMODB_TABLE = aws_dynamodb_table.candidate_table.name,
-      OPENSEARCH_DOMAIN = aws_opensearch_domain.resume_search.endpoint
+      OPENSEARCH_DOMAIN = aws_opensearch_domain.resume_search.endpoint,
+      TEXTRACT_SNS_TOPIC_ARN = aws_sns_topic.textract_completion.arn,
+      TEXTRACT_ROLE_ARN = aws_iam_role.textract_publish_role.arn,
+      INLINE_POLL_SECONDS = "10",
+      EXTRACTION_CACHE_TABLE = aws_dynamodb_table.extraction_cache_table.name,
+      EXTRACTION_CACHE_TTL_DAYS = "30"
     }
   }
 
@@ -338,11 +663,17 @@ resource "aws_lambda_function" "screen_resume_lambda" {
   runtime       = "python3.11"
   timeout       = 120
   memory_size   = 512
+  layers        = [aws_lambda_layer_version.common_layer.arn]
 
   environment {
     variables = {
-      BEDROCK_MODEL_ID = "anthropic.claude-3-sonnet-20240229-v1:0",
-      DYNAMODB_TABLE = aws_dynamodb_table.candidate_table.name
+      BEDROCK_MODEL_ID = var.screening_model_id,
+      DYNAMODB_TABLE = aws_dynamodb_table.candidate_table.name,
+      JOB_TABLE_NAME = aws_dynamodb_table.job_table.name,
+      RESUME_BUCKET = aws_s3_bucket.resume_bucket.bucket,
+      SCREENING_CONCURRENCY = "8",
+      PROMPT_CACHING_ENABLED = tostring(var.bedrock_prompt_caching),
+      PROMPT_CACHE_MIN_TOKENS = tostring(var.prompt_cache_min_tokens)
     }
   }
 
@@ -361,10 +692,14 @@ resource "aws_lambda_function" "rank_candidates_lambda" {
   runtime       = "python3.11"
   timeout       = 120
   memory_size   = 512
+  layers        = [aws_lambda_layer_version.common_layer.arn]
 
   environment {
     variables = {
-      DYNAMODB_TABLE = aws_dynamodb_table.candidate_table.name
+      DYNAMODB_TABLE = aws_dynamodb_table.candidate_table.name,
+      RANKING_STATE_TABLE = aws_dynamodb_table.ranking_state_table.name,
+      RANK_WRITE_CONCURRENCY = "8",
+      TOP_SUMMARY_SIZE = "10"
     }
   }
 
@@ -374,6 +709,27 @@ resource "aws_lambda_function" "rank_candidates_lambda" {
   ]
 }
 
+# Environment shared by the phone interview Lambda and the call dispatcher
+locals {
+  phone_interview_environment = {
+    CONNECT_INSTANCE_ID = var.connect_instance_id,
+    CONNECT_CONTACT_FLOW_ID = var.connect_contact_flow_id,
+    DYNAMODB_TABLE = aws_dynamodb_table.candidate_table.name,
+    JOB_TABLE_NAME = aws_dynamodb_table.job_table.name,
+    BEDROCK_MODEL_ID = "anthropic.claude-3-sonnet-20240229-v1:0",
+    RESUME_BUCKET = aws_s3_bucket.resume_bucket.bucket,
+    PHONE_INTERVIEW_CONTACTS_TABLE = aws_dynamodb_table.phone_interview_contacts_table.name,
+    PHONE_INTERVIEW_TIMEOUT_SECONDS = tostring(var.phone_interview_timeout_seconds),
+    PHONE_SCREEN_QUEUE_TABLE = aws_dynamodb_table.phone_screen_queue_table.name,
+    MAX_CONCURRENT_CALLS = tostring(var.max_concurrent_calls),
+    CALLS_PER_MINUTE = tostring(var.calls_per_minute),
+    CALLING_WINDOW_START_HOUR = tostring(var.calling_window_start_hour),
+    CALLING_WINDOW_END_HOUR = tostring(var.calling_window_end_hour),
+    DEFAULT_CANDIDATE_TIMEZONE = var.default_candidate_timezone,
+    SCRIPT_CACHE_TTL_SECONDS = "3600"
+  }
+}
+
 # Lambda function for phone interview
 resource "aws_lambda_function" "phone_interview_lambda" {
   filename      = data.archive_file.phone_interview_lambda_package.output_path
@@ -383,14 +739,10 @@ resource "aws_lambda_function" "phone_interview_lambda" {
   runtime       = "python3.11"
   timeout       = 60
   memory_size   = 512
+  layers        = [aws_lambda_layer_version.common_layer.arn]
 
   environment {
-    variables = {
-      CONNECT_INSTANCE_ID = var.connect_instance_id,
-      CONNECT_CONTACT_FLOW_ID = var.connect_contact_flow_id,
-      DYNAMODB_TABLE = aws_dynamodb_table.candidate_table.name,
-      BEDROCK_MODEL_ID = "anthropic.claude-3-sonnet-20240229-v1:0"
-    }
+    variables = local.phone_interview_environment
   }
 
   depends_on = [
@@ -399,6 +751,82 @@ resource "aws_lambda_function" "phone_interview_lambda" {
   ]
 }
 
+# The interview contact flow reads the script in segments from the phone interview Lambda
+resource "aws_connect_lambda_function_association" "phone_interview_script" {
+  instance_id  = var.connect_instance_id
+  function_arn = aws_lambda_function.phone_interview_lambda.arn
+}
+
+# Scheduled dispatcher placing queued phone screens; a single concurrent
+# execution so runs never overlap and overspend the call budget
+resource "aws_lambda_function" "phone_call_dispatcher_lambda" {
+  filename                       = data.archive_file.phone_interview_lambda_package.output_path
+  function_name                  = "PhoneCallDispatcher"
+  role                           = aws_iam_role.lambda_execution_role.arn
+  handler                        = "phone_interview.lambda_handler"
+  runtime                        = "python3.11"
+  timeout                        = 55
+  memory_size                    = 256
+  reserved_concurrent_executions = 1
+  layers                         = [aws_lambda_layer_version.common_layer.arn]
+
+  environment {
+    variables = local.phone_interview_environment
+  }
+
+  depends_on = [
+    aws_iam_role_policy_attachment.lambda_basic_execution,
+    aws_iam_role_policy_attachment.lambda_custom_policy_attachment
+  ]
+}
+
+resource "aws_cloudwatch_event_rule" "phone_call_dispatch_schedule" {
+  name                = "phone-call-dispatch-schedule"
+  description         = "Release queued phone screens every minute"
+  schedule_expression = "rate(1 minute)"
+}
+
+resource "aws_cloudwatch_event_target" "phone_call_dispatch_schedule" {
+  rule = aws_cloudwatch_event_rule.phone_call_dispatch_schedule.name
+  arn  = aws_lambda_function.phone_call_dispatcher_lambda.arn
+}
+
+resource "aws_lambda_permission" "allow_eventbridge_invoke_phone_call_dispatcher" {
+  statement_id  = "AllowExecutionFromEventBridge"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.phone_call_dispatcher_lambda.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.phone_call_dispatch_schedule.arn
+}
+
+# Contact completion events resume the workflow waiting on a phone interview
+resource "aws_cloudwatch_event_rule" "phone_interview_contact_disconnected" {
+  name        = "phone-interview-contact-disconnected"
+  description = "Amazon Connect contacts ending on the interview instance"
+  
+  event_pattern = jsonencode({
+    source      = ["aws.connect"],
+    "detail-type" = ["Amazon Connect Contact Event"],
+    detail      = {
+      eventType   = ["DISCONNECTED"],
+      instanceArn = [{ suffix = "instance/${var.connect_instance_id}" }]
+    }
+  })
+}
+
+resource "aws_cloudwatch_event_target" "phone_interview_contact_disconnected" {
+  rule = aws_cloudwatch_event_rule.phone_interview_contact_disconnected.name
+  arn  = aws_lambda_function.phone_interview_lambda.arn
+}
+
+resource "aws_lambda_permission" "allow_eventbridge_invoke_phone_interview" {
+  statement_id  = "AllowExecutionFromEventBridge"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.phone_interview_lambda.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.phone_interview_contact_disconnected.arn
+}
+
 # Lambda function for interview scheduling
 resource "aws_lambda_function" "schedule_interview_lambda" {
   filename      = data.archive_file.schedule_interview_lambda_package.output_path
@@ -406,13 +834,21 @@ resource "aws_lambda_function" "schedule_interview_lambda" {
   role          = aws_iam_role.lambda_execution_role.arn
   handler       = "schedule_interview.lambda_handler"
   runtime       = "python3.11"
-  timeout       = 60
+  timeout       = 300
   memory_size   = 512
+  layers        = [aws_lambda_layer_version.common_layer.arn]
 
   environment {
     variables = {
       GMAIL_CREDENTIALS_SECRET = var.gmail_credentials_secret_arn,
-      DYNAMODB_TABLE = aws_dynamodb_table.candidate_table.name
+      DYNAMODB_TABLE = aws_dynamodb_table.candidate_table.name,
+      SCHEDULING_LOCK_TABLE = aws_dynamodb_table.interview_scheduling_lock_table.name,
+      HIRING_MANAGER_EMAIL = var.hiring_manager_email,
+      TECHNICAL_STAFF_EMAIL = var.technical_staff_email,
+      CALENDAR_PROVIDER = var.calendar_provider,
+      INTERVIEW_TIMEZONE = var.interview_timezone,
+      INTERVIEW_DURATION_MINUTES = tostring(var.interview_duration_minutes),
+      INTERVIEW_BUFFER_MINUTES = tostring(var.interview_buffer_minutes)
     }
   }
 
@@ -455,6 +891,52 @@ data "archive_file" "schedule_interview_lambda_package" {
   output_path = "${path.module}/lambda/schedule_interview.zip"
 }
 
+#------------------------------------------------------------
+# Lambda Layer for Shared Modules
+#------------------------------------------------------------
+# archive_file only zips what is on disk, so the layer is assembled in a build
+# directory with the shared modules and the third-party packages they need
+# (pypdf for local PDF extraction), installed as Linux wheels for the runtime
+resource "terraform_data" "common_layer_build" {
+  triggers_replace = {
+    requirements = filesha1("${path.module}/lambda/common/requirements.txt")
+    sources = sha1(join("", [
+      for f in sort(fileset("${path.module}/lambda/common/python", "**/*.py")) :
+      filesha1("${path.module}/lambda/common/python/${f}")
+    ]))
+  }
+
+  provisioner "local-exec" {
+    working_dir = path.module
+    command     = <<-EOT
+      set -e
+      rm -rf lambda/build/common_layer
+      mkdir -p lambda/build/common_layer/python
+      cp -R lambda/common/python/. lambda/build/common_layer/python/
+      python3 -m pip install --quiet -r lambda/common/requirements.txt \
+        --target lambda/build/common_layer/python \
+        --platform manylinux2014_x86_64 --implementation cp --python-version 3.11 \
+        --only-binary=:all:
+      find lambda/build/common_layer -name __pycache__ -prune -exec rm -rf {} +
+    EOT
+  }
+}
+
+data "archive_file" "common_layer_package" {
+  type        = "zip"
+  source_dir  = "${path.module}/lambda/build/common_layer"
+  output_path = "${path.module}/lambda/common.zip"
+
+  depends_on = [terraform_data.common_layer_build]
+}
+
+resource "aws_lambda_layer_version" "common_layer" {
+  layer_name          = "ResumeScreeningCommon"
+  filename            = data.archive_file.common_layer_package.output_path
+  source_code_hash    = data.archive_file.common_layer_package.output_base64sha256
+  compatible_runtimes = ["python3.9", "python3.11"]
+}
+
 #------------------------------------------------------------
 # CloudWatch Log Groups
 #------------------------------------------------------------
@@ -478,6 +960,11 @@ resource "aws_cloudwatch_log_group" "phone_interview_logs" {
   retention_in_days = 30
 }
 
+resource "aws_cloudwatch_log_group" "phone_call_dispatcher_logs" {
+  name              = "/aws/lambda/${aws_lambda_function.phone_call_dispatcher_lambda.function_name}"
+  retention_in_days = 30
+}
+
 resource "aws_cloudwatch_log_group" "schedule_interview_logs" {
   name              = "/aws/lambda/${aws_lambda_function.schedule_interview_lambda.function_name}"
   retention_in_days = 30
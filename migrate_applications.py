@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Copy applications from the retired Applications table into the candidate table
+
+Applications used to be stored in their own table, with the pipeline's results
+in a separate item per candidate in the candidate table. The API now reads and
+writes the candidate record directly, so each application's fields are copied
+onto the candidate item with the same ID. Fields a pipeline stage already wrote
+are kept: every attribute is set with if_not_exists, so the migration can be
+re-run safely and never moves a status backwards.
+
+A second pass gives every candidate record without a statusVersion a starting
+version, which ranking's PartiQL update and the status long poll rely on.
+
+Run it once after `terraform apply`, then remove the Applications table from
+api_gateway.tf (it is protected with prevent_destroy until then).
+
+Usage:
+    python migrate_applications.py
+    python migrate_applications.py --applications-table Applications --table candidate-tracking
+"""
+import os
+import sys
+import json
+import argparse
+import logging
+from concurrent.futures import ThreadPoolExecutor
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+logger = logging.getLogger('migrate_applications')
+
+TERRAFORM_OUTPUT_FILE = 'terraform_output.json'
+
+# Attributes of the old application items copied onto candidate records
+APPLICATION_FIELDS = [
+    'jobId', 'fullName', 'email', 'phone', 'resumeKey', 'coverLetter', 'linkedIn',
+    'portfolio', 'additionalInfo', 'timeZone', 'submissionDate', 'updatedDate', 'status'
+]
+
+def load_terraform_outputs():
+    """
+    Resource names from the saved Terraform outputs, if present
+    """
+    if not os.path.exists(TERRAFORM_OUTPUT_FILE):
+        return {}
+    with open(TERRAFORM_OUTPUT_FILE) as f:
+        return {name: output['value'] for name, output in json.load(f).items()}
+
+def scan_items(table, projection=None):
+    """
+    Yield every item of a table, one page at a time
+    """
+    params = {}
+    if projection:
+        params['ProjectionExpression'] = projection
+    while True:
+        response = table.scan(**params)
+        yield from response.get('Items', [])
+        if 'LastEvaluatedKey' not in response:
+            return
+        params['ExclusiveStartKey'] = response['LastEvaluatedKey']
+
+def migrate_application(candidate_table, application):
+    """
+    Copy one application's fields onto its candidate record without overwriting any
+    """
+    names = {}
+    values = {}
+    assignments = []
+    for index, field in enumerate(APPLICATION_FIELDS):
+        if field not in application:
+            continue
+        names[f"#n{index}"] = field
+        values[f":v{index}"] = application[field]
+        assignments.append(f"#n{index} = if_not_exists(#n{index}, :v{index})")
+
+    names['#statusVersion'] = 'statusVersion'
+    values[':one'] = 1
+    assignments.append('#statusVersion = if_not_exists(#statusVersion, :one)')
+
+    candidate_table.update_item(
+        Key={'id': application['id']},
+        UpdateExpression=f"SET {', '.join(assignments)}",
+        ExpressionAttributeNames=names,
+        ExpressionAttributeValues=values
+    )
+
+def backfill_status_version(candidate_table, candidate_id):
+    """
+    Give a candidate record without a statusVersion its first version
+
+    Returns False if the record already had one.
+    """
+    try:
+        candidate_table.update_item(
+            Key={'id': candidate_id},
+            UpdateExpression='SET statusVersion = :one',
+            ConditionExpression='attribute_exists(id) AND attribute_not_exists(statusVersion)',
+            ExpressionAttributeValues={':one': 1}
+        )
+        return True
+    except ClientError as e:
+        if e.response.get('Error', {}).get('Code') == 'ConditionalCheckFailedException':
+            return False
+        raise
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Copy applications into the candidate table')
+    parser.add_argument('--applications-table', default='Applications', help='Retired applications table')
+    parser.add_argument('--table', help='Candidate table (default: from terraform_output.json)')
+    parser.add_argument('--concurrency', type=int, default=16, help='Concurrent item updates')
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    table_name = args.table or load_terraform_outputs().get('dynamodb_table_name')
+    if not table_name:
+        raise SystemExit("Candidate table is required (--table or terraform_output.json)")
+
+    config = Config(
+        max_pool_connections=args.concurrency + 2,
+        retries={'max_attempts': 10, 'mode': 'adaptive'}
+    )
+    dynamodb = boto3.resource('dynamodb', config=config)
+    applications_table = dynamodb.Table(args.applications_table)
+    candidate_table = dynamodb.Table(table_name)
+
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        migrated = sum(1 for _ in executor.map(
+            lambda application: migrate_application(candidate_table, application),
+            scan_items(applications_table)
+        ))
+        logger.info(f"Copied {migrated} applications from {args.applications_table} into {table_name}")
+
+        backfilled = sum(executor.map(
+            lambda item: backfill_status_version(candidate_table, item['id']),
+            (item for item in scan_items(candidate_table, projection='id, statusVersion') if 'statusVersion' not in item)
+        ))
+        logger.info(f"Backfilled statusVersion on {backfilled} candidate records")
+
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
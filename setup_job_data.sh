@@ -25,6 +25,13 @@ fi
 
 echo "Creating sample job data in DynamoDB table: $JOB_TABLE_NAME"
 
+# Stamp every write so cached job descriptions pick up edited postings
+UPDATED_DATE=$(date -u +"%Y-%m-%dT%H:%M:%SZ")
+
+# Jobs are listed from sparse indexes: every job needs "status" and
+# "posted_date" to be listed at all, and "category" to appear in its
+# category's listing
+
 # Sample job data - Software Engineer
 aws dynamodb put-item \
   --table-name "$JOB_TABLE_NAME" \
@@ -58,6 +65,7 @@ aws dynamodb put-item \
       {"S": "Health insurance"}
     ]},
     "posted_date": {"S": "2025-04-10T00:00:00Z"},
+    "updated_date": {"S": "'"$UPDATED_DATE"'"},
     "closing_date": {"S": "2025-05-10T00:00:00Z"},
     "status": {"S": "OPEN"}
   }'
@@ -82,7 +90,7 @@ aws dynamodb put-item \
       {"S": "Stay current with latest AI research and techniques"}
     ]},
     "requirements": {"L": [
-      {"S": "Master's or PhD in Computer Science, Statistics, or related field"},
+      {"S": "Master'\''s or PhD in Computer Science, Statistics, or related field"},
       {"S": "4+ years of experience in applied data science"}, 
       {"S": "Strong Python programming skills"}, 
       {"S": "Experience with ML frameworks like TensorFlow or PyTorch"}, 
@@ -95,6 +103,7 @@ aws dynamodb put-item \
       {"S": "Health insurance"}
     ]},
     "posted_date": {"S": "2025-04-12T00:00:00Z"},
+    "updated_date": {"S": "'"$UPDATED_DATE"'"},
     "closing_date": {"S": "2025-05-12T00:00:00Z"},
     "status": {"S": "OPEN"}
   }'
@@ -132,7 +141,35 @@ aws dynamodb put-item \
       {"S": "Health insurance"}
     ]},
     "posted_date": {"S": "2025-04-15T00:00:00Z"},
+    "updated_date": {"S": "'"$UPDATED_DATE"'"},
     "status": {"S": "OPEN"}
   }'
 
+# Backfill the listing attributes on jobs written without them
+echo "Backfilling listing attributes on existing jobs..."
+aws dynamodb scan \
+  --table-name "$JOB_TABLE_NAME" \
+  --filter-expression "attribute_not_exists(#status) OR attribute_not_exists(posted_date)" \
+  --expression-attribute-names '{"#status": "status"}' \
+  --projection-expression "id" \
+  --output json | jq -r '.Items[].id.S' | while read -r JOB_ID; do
+  aws dynamodb update-item \
+    --table-name "$JOB_TABLE_NAME" \
+    --key "{\"id\": {\"S\": \"$JOB_ID\"}}" \
+    --update-expression "SET #status = if_not_exists(#status, :open), posted_date = if_not_exists(posted_date, :now), updated_date = :now" \
+    --expression-attribute-names '{"#status": "status"}' \
+    --expression-attribute-values "{\":open\": {\"S\": \"OPEN\"}, \":now\": {\"S\": \"$UPDATED_DATE\"}}"
+  echo "Backfilled status/posted_date on job $JOB_ID"
+done
+
+UNCATEGORIZED_JOBS=$(aws dynamodb scan \
+  --table-name "$JOB_TABLE_NAME" \
+  --filter-expression "attribute_not_exists(category)" \
+  --select COUNT \
+  --query "Count" \
+  --output text)
+if [ "$UNCATEGORIZED_JOBS" != "0" ]; then
+  echo "Warning: $UNCATEGORIZED_JOBS jobs have no category and only appear in the unfiltered listing."
+fi
+
 echo "Sample job data created successfully!"
@@ -29,7 +29,83 @@ resource "aws_sfn_state_machine" "resume_screening_workflow" {
           "Next": "ExtractTextFailed"
         }
       ],
-      "Next": "ScreenResume"
+      "Next": "IsTextExtracted"
+    },
+    "IsTextExtracted": {
+      "Type": "Choice",
+      "Choices": [
+        {
+          "And": [
+            {
+              "Variable": "$.extractionResult.extractionPending",
+              "IsPresent": true
+            },
+            {
+              "Variable": "$.extractionResult.extractionPending",
+              "BooleanEquals": true
+            }
+          ],
+          "Next": "WaitForExtraction"
+        },
+        {
+          "And": [
+            {
+              "Variable": "$.extractionResult.statusCode",
+              "IsPresent": true
+            },
+            {
+              "Variable": "$.extractionResult.statusCode",
+              "NumericGreaterThanEquals": 400
+            }
+          ],
+          "Next": "ExtractionResultFailed"
+        }
+      ],
+      "Default": "ScreenResume"
+    },
+    "WaitForExtraction": {
+      "Type": "Wait",
+      "SecondsPath": "$.extractionResult.pollDelaySeconds",
+      "Next": "CheckExtraction"
+    },
+    "CheckExtraction": {
+      "Type": "Task",
+      "Resource": "${aws_lambda_function.extract_text_lambda.arn}",
+      "Parameters": {
+        "action": "check_extraction",
+        "candidateId.$": "$.candidateId",
+        "jobId.$": "$.jobId",
+        "resumePath.$": "$.extractionResult.resumePath",
+        "textractJobId.$": "$.extractionResult.textractJobId",
+        "contentDigest.$": "$.extractionResult.contentDigest",
+        "pollAttempt.$": "$.extractionResult.pollAttempt"
+      },
+      "ResultPath": "$.extractionResult",
+      "Retry": [
+        {
+          "ErrorEquals": ["Lambda.ServiceException", "Lambda.AWSLambdaException", "Lambda.SdkClientException"],
+          "IntervalSeconds": 2,
+          "MaxAttempts": 3,
+          "BackoffRate": 2
+        }
+      ],
+      "Catch": [
+        {
+          "ErrorEquals": ["States.ALL"],
+          "ResultPath": "$.error",
+          "Next": "ExtractTextFailed"
+        }
+      ],
+      "Next": "IsTextExtracted"
+    },
+    "ExtractionResultFailed": {
+      "Type": "Pass",
+      "ResultPath": "$.error",
+      "Parameters": {
+        "Error": "ExtractionFailed",
+        "Cause.$": "$.extractionResult.error"
+      },
+      "Next": "ExtractTextFailed"
     },
     "ExtractTextFailed": {
       "Type": "Pass",
@@ -75,12 +151,20 @@ resource "aws_sfn_state_machine" "resume_screening_workflow" {
     },
     "RankCandidates": {
       "Type": "Task",
-      "Resource": "${aws_lambda_function.rank_candidates_lambda.arn}",
-      "InputPath": "$",
+      "Resource": "arn:aws:states:::sqs:sendMessage.waitForTaskToken",
+      "Parameters": {
+        "QueueUrl": "${aws_sqs_queue.ranking_requests.url}",
+        "MessageBody": {
+          "jobId.$": "$.jobId",
+          "candidateId.$": "$.candidateId",
+          "taskToken.$": "$$.Task.Token"
+        }
+      },
       "ResultPath": "$.rankingResult",
+      "TimeoutSeconds": 900,
       "Retry": [
         {
-          "ErrorEquals": ["Lambda.ServiceException", "Lambda.AWSLambdaException", "Lambda.SdkClientException"],
+          "ErrorEquals": ["SQS.SdkClientException", "SQS.AmazonSQSException", "States.Timeout"],
           "IntervalSeconds": 2,
           "MaxAttempts": 3,
           "BackoffRate": 2
@@ -131,9 +215,17 @@ resource "aws_sfn_state_machine" "resume_screening_workflow" {
     },
     "PhoneInterview": {
       "Type": "Task",
-      "Resource": "${aws_lambda_function.phone_interview_lambda.arn}",
-      "InputPath": "$",
+      "Resource": "arn:aws:states:::lambda:invoke.waitForTaskToken",
+      "Parameters": {
+        "FunctionName": "${aws_lambda_function.phone_interview_lambda.arn}",
+        "Payload": {
+          "candidateId.$": "$.candidateId",
+          "jobId.$": "$.jobId",
+          "taskToken.$": "$$.Task.Token"
+        }
+      },
       "ResultPath": "$.interviewResult",
+      "TimeoutSeconds": ${var.phone_interview_timeout_seconds},
       "Retry": [
         {
           "ErrorEquals": ["Lambda.ServiceException", "Lambda.AWSLambdaException", "Lambda.SdkClientException"],
@@ -174,12 +266,21 @@ resource "aws_sfn_state_machine" "resume_screening_workflow" {
     },
     "ScheduleInterview": {
       "Type": "Task",
-      "Resource": "${aws_lambda_function.schedule_interview_lambda.arn}",
-      "InputPath": "$",
+      "Resource": "arn:aws:states:::sqs:sendMessage.waitForTaskToken",
+      "Parameters": {
+        "QueueUrl": "${aws_sqs_queue.scheduling_requests.url}",
+        "MessageGroupId.$": "$.jobId",
+        "MessageBody": {
+          "jobId.$": "$.jobId",
+          "candidateId.$": "$.candidateId",
+          "taskToken.$": "$$.Task.Token"
+        }
+      },
       "ResultPath": "$.schedulingResult",
+      "TimeoutSeconds": 3600,
       "Retry": [
         {
-          "ErrorEquals": ["Lambda.ServiceException", "Lambda.AWSLambdaException", "Lambda.SdkClientException"],
+          "ErrorEquals": ["SQS.SdkClientException", "SQS.AmazonSQSException", "States.Timeout"],
           "IntervalSeconds": 2,
           "MaxAttempts": 3,
           "BackoffRate": 2
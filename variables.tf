@@ -51,6 +51,66 @@ variable "bedrock_model_id" {
   default     = "anthropic.claude-3-sonnet-20240229-v1:0"
 }
 
+variable "screening_model_id" {
+  description = "Amazon Bedrock model or inference profile ID used to screen resumes; must support prompt caching when bedrock_prompt_caching is on (inference profile IDs are prefixed with the region group, e.g. apac. or us.)"
+  type        = string
+  default     = "apac.anthropic.claude-3-7-sonnet-20250219-v1:0"
+}
+
+variable "bedrock_prompt_caching" {
+  description = "Mark the per-job screening prompt prefix as a Bedrock prompt cache point when it reaches the model's minimum cacheable length"
+  type        = bool
+  default     = true
+}
+
+variable "prompt_cache_min_tokens" {
+  description = "Minimum cacheable prompt prefix length of the screening model, in tokens"
+  type        = number
+  default     = 1024
+}
+
+variable "ranking_debounce_seconds" {
+  description = "How long ranking requests for newly screened candidates are batched before one ranking pass per job runs"
+  type        = number
+  default     = 10
+}
+
+variable "phone_interview_timeout_seconds" {
+  description = "How long the workflow waits for a phone interview, including time queued for a calling window, before failing the interview"
+  type        = number
+  default     = 259200
+}
+
+variable "max_concurrent_calls" {
+  description = "Phone screens in progress at once; keep within the Connect instance's concurrent call quota"
+  type        = number
+  default     = 10
+}
+
+variable "calls_per_minute" {
+  description = "Phone screens the dispatcher places per minute at most"
+  type        = number
+  default     = 20
+}
+
+variable "calling_window_start_hour" {
+  description = "Earliest local hour (candidate's time zone, weekdays) at which phone screens are placed"
+  type        = number
+  default     = 9
+}
+
+variable "calling_window_end_hour" {
+  description = "Local hour (candidate's time zone) after which no more phone screens are placed"
+  type        = number
+  default     = 18
+}
+
+variable "default_candidate_timezone" {
+  description = "Time zone used for the calling window when an application does not give one"
+  type        = string
+  default     = "Australia/Sydney"
+}
+
 variable "gmail_credentials_secret_arn" {
   description = "ARN of the Secrets Manager secret containing Gmail API credentials"
   type        = string
@@ -66,6 +126,30 @@ variable "technical_staff_email" {
   type        = string
 }
 
+variable "calendar_provider" {
+  description = "Calendar used to find interviewer availability: google (free/busy via the Gmail credentials secret) or memory"
+  type        = string
+  default     = "google"
+}
+
+variable "interview_timezone" {
+  description = "Time zone of the interviewers' working hours"
+  type        = string
+  default     = "Australia/Sydney"
+}
+
+variable "interview_duration_minutes" {
+  description = "Length of an in-person interview"
+  type        = number
+  default     = 60
+}
+
+variable "interview_buffer_minutes" {
+  description = "Minimum gap between consecutive interviews"
+  type        = number
+  default     = 15
+}
+
 variable "company_name" {
   description = "Name of the company"
   type        = string